@@ -0,0 +1,75 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+from time import perf_counter, process_time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from gofilepy import GofileClient
+from gofilepy.download import download, DEFAULT_CHUNK_SIZE
+from tests.stand_in_server import StandInGofile
+
+#compares throughput and client cpu time of the old iter_content(1024) write loop with the readinto engine
+#the stand-in server runs in its own process so its cpu time isn't counted
+
+
+def serve(size: int, conn) -> None:
+    server = StandInGofile()
+    parent_id = server.state.accounts[next(iter(server.state.accounts))]["rootFolder"]
+    f = server.state.add_file(parent_id, "bench.bin", os.urandom(size))
+    link = server.state.add_direct_link(f["id"], server.url)
+    conn.send(link["directLink"])
+    server.serve_forever()
+
+def legacy_download(session, url: str, out_path: str) -> None:
+    resp = session.get(url, stream=True, allow_redirects=None)
+    with resp, open(out_path, "wb") as f:
+        for chunk in resp.iter_content(chunk_size=1024):
+            if chunk:
+                f.write(chunk)
+
+def measure(func, *args) -> tuple:
+    wall, cpu = perf_counter(), process_time()
+    func(*args)
+    return perf_counter() - wall, process_time() - cpu
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--out-dir", default=tempfile.gettempdir())
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+    recv, send = multiprocessing.Pipe(duplex=False)
+    proc = multiprocessing.Process(target=serve, args=(size, send), daemon=True)
+    proc.start()
+    url = recv.recv()
+
+    session = GofileClient.create_session()
+    out_path = os.path.join(args.out_dir, "gofilepy-bench.bin")
+    engines = {
+        "iter_content(1024)": lambda: legacy_download(session, url, out_path),
+        "readinto({})".format(args.chunk_size): lambda: download(
+            session.request, url, out_path, chunk_size=args.chunk_size, resume=False
+        )
+    }
+
+    try:
+        for name, func in engines.items():
+            func() #warm up
+            results = [measure(func) for _ in range(args.runs)]
+            wall = min(r[0] for r in results)
+            cpu = min(r[1] for r in results)
+            print("{:<24} {:8.1f} MB/s  {:6.3f} s wall  {:6.3f} s cpu".format(name, size / wall / 1e6, wall, cpu))
+    finally:
+        proc.terminate()
+        if os.path.exists(out_path):
+            os.remove(out_path)
+
+
+if __name__ == "__main__":
+    main()
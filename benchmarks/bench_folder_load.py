@@ -0,0 +1,67 @@
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+import uuid
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from gofilepy import GofileFolder
+
+#load time and peak memory of hydrating a large folder listing - lazy children vs building every child up front
+
+
+def folder_data(entries: int) -> dict:
+    folder_id = str(uuid.uuid4())
+    contents = {}
+    for i in range(entries):
+        content_id = str(uuid.uuid4())
+        contents[content_id] = {
+            "id": content_id, "type": "file", "name": "{}.bin".format(i), "parentFolder": folder_id,
+            "createTime": 1700000000, "size": i, "downloadCount": 0, "md5": "0" * 32,
+            "mimetype": "application/octet-stream", "serverChoosen": "store1",
+            "downloadPage": "https://gofile.io/d/" + content_id
+        }
+    return {
+        "id": folder_id, "type": "folder", "name": "bench", "childs": list(contents), "contents": contents,
+        "totalSize": sum(c["size"] for c in contents.values())
+    }
+
+def measure(func, data: dict) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    start = perf_counter()
+    result = func(data)
+    elapsed = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+def lazy_load(data: dict):
+    folder = GofileFolder._load_from_dict(data)
+    return folder, folder.total_size
+
+def eager_load(data: dict):
+    #what every load cost before children were lazy
+    folder = GofileFolder._load_from_dict(data)
+    return folder, list(folder.children)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    data = folder_data(args.entries)
+    for name, func in {"lazy (total_size only)": lazy_load, "all children built": eager_load}.items():
+        results = [measure(func, data) for _ in range(args.runs)]
+        elapsed = min(r[0] for r in results)
+        peak = min(r[1] for r in results)
+        print("{:<24} {:8.3f} s  {:8.1f} MB peak".format(name, elapsed, peak / 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import argparse
+import json
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from gofilepy import decoding
+from bench_folder_load import folder_data
+
+#decode time of a large folder listing - the old double json decode vs one decode with each available backend
+
+
+def best(func, runs: int) -> float:
+    results = []
+    for _ in range(runs):
+        start = perf_counter()
+        func()
+        results.append(perf_counter() - start)
+    return min(results)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    body = json.dumps({"status": "ok", "data": folder_data(args.entries)}).encode()
+    print("listing of {} entries - {:.1f} MB".format(args.entries, len(body) / 1e6))
+
+    results = {"json, decoded twice": best(lambda: (json.loads(body), json.loads(body)), args.runs)}
+    for name, loads in decoding.BACKENDS.items():
+        results["{}, decoded once".format(name)] = best(lambda: loads(body), args.runs)
+
+    for name, elapsed in results.items():
+        print("{:<24} {:8.1f} ms".format(name, elapsed * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from gofilepy import GofileClient
+from tests.stand_in_server import StandInGofile, STAND_IN_TOKEN
+
+#compares per-call latency of metadata requests with a pooled keep-alive session vs a new connection per call
+
+
+def time_calls(client: GofileClient, calls: int) -> float:
+    client.get_account() #warm up
+    start = perf_counter()
+    for _ in range(calls):
+        client.get_account()
+    #get_account() makes two api requests
+    return (perf_counter() - start) / (calls * 2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--api-url", default=None, help="benchmark against a real api instead of the stand-in")
+    parser.add_argument("--token", default=STAND_IN_TOKEN)
+    args = parser.parse_args()
+
+    server = None
+    api_url = args.api_url
+    if not api_url:
+        server = StandInGofile().start()
+        api_url = server.url
+
+    try:
+        results = {}
+        for name, keep_alive in (("new connection per call", False), ("pooled session", True)):
+            client = GofileClient(token=args.token, get_account=False, keep_alive=keep_alive, api_url=api_url)
+            results[name] = time_calls(client, args.calls)
+            client.session.close()
+    finally:
+        if server:
+            server.stop()
+
+    for name, latency in results.items():
+        print("{:<26} {:8.3f} ms/call".format(name, latency * 1000))
+
+    unpooled, pooled = results["new connection per call"], results["pooled session"]
+    print("saved {:.3f} ms/call ({:.1f}%)".format((unpooled - pooled) * 1000, (1 - pooled / unpooled) * 100))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from gofilepy import GofileClient, GofileFolder
+
+#memory held by a fully built synthetic tree (every child object materialized) with and without raw api data
+
+
+def folder_data(folder: int, files: int) -> dict:
+    folder_id = "folder-{}".format(folder)
+    contents = {}
+    for i in range(files):
+        content_id = "{}-file-{}".format(folder_id, i)
+        contents[content_id] = {
+            "id": content_id, "type": "file", "name": "{}.bin".format(i), "parentFolder": folder_id,
+            "createTime": 1700000000, "size": i, "downloadCount": 0, "md5": "{:032x}".format(i),
+            "mimetype": "application/octet-stream", "serverChoosen": "store1",
+            "downloadPage": "https://gofile.io/d/" + content_id
+        }
+    return {"id": folder_id, "type": "folder", "name": folder_id, "childs": list(contents), "contents": contents}
+
+def build_tree(client: GofileClient, folders: int, files: int) -> list:
+    tree = []
+    for n in range(folders):
+        folder = GofileFolder._load_from_dict(folder_data(n, files), client=client)
+        list(folder.children)
+        tree.append(folder)
+    return tree
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--folders", type=int, default=1000)
+    parser.add_argument("--files-per-folder", type=int, default=1000)
+    args = parser.parse_args()
+
+    total = args.folders * args.files_per_folder
+    for retain_raw in (True, False):
+        client = GofileClient(lazy=True, server_cache_ttl=0, retain_raw=retain_raw)
+        gc.collect()
+        tracemalloc.start()
+        start = perf_counter()
+        tree = build_tree(client, args.folders, args.files_per_folder)
+        elapsed = perf_counter() - start
+        held, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print("retain_raw={:<5}  {:,} files  {:7.1f} s  {:8.1f} MB held  {:6.0f} B/file  {:8.1f} MB peak".format(
+            str(retain_raw), total, elapsed, held / 1e6, held / total, peak / 1e6
+        ))
+        del tree
+
+
+if __name__ == "__main__":
+    main()
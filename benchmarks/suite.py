@@ -0,0 +1,211 @@
+import argparse
+import datetime
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from gofilepy import GofileClient
+from tests.stand_in_server import StandInGofile, STAND_IN_TOKEN
+
+#benchmark suite against the stand-in api - transfer throughput, metadata ops/sec and large folder hydration.
+#the stand-in runs in its own process so it doesn't compete with the client for the GIL.  results are saved as
+#json and can be compared with an earlier run to catch regressions
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def serve(args: dict, conn) -> None:
+    """Seeds a stand-in with a transfer payload and a large folder, then serves it"""
+    server = StandInGofile()
+    server.state.latency = args["latency"]
+    server.state.bandwidth = args["bandwidth"]
+
+    root_id = server.state.accounts[STAND_IN_TOKEN]["rootFolder"]
+    payload = os.urandom(args["size"])
+    f = server.state.add_file(root_id, "payload.bin", payload)
+    link = server.state.add_direct_link(f["id"], server.url)
+
+    small_id = server.state.add_folder(root_id, "small")["id"]
+    for i in range(10):
+        server.state.add_file(small_id, "{}.bin".format(i), b"x")
+
+    large_id = server.state.add_folder(root_id, "large")["id"]
+    for i in range(args["entries"]):
+        server.state.add_file(large_id, "{}.bin".format(i), b"")
+
+    conn.send({"url": server.url, "root_id": root_id, "link": link["directLink"], "small_id": small_id, "large_id": large_id})
+    server.serve_forever()
+
+
+def new_client(url: str) -> GofileClient:
+    return GofileClient(token=STAND_IN_TOKEN, api_url=url, store_url=url + "/{}", server_cache_ttl=0)
+
+def best(func, runs: int) -> float:
+    return min(func() for _ in range(runs))
+
+def bench_upload(client: GofileClient, seed: dict, args) -> dict:
+    payload = os.urandom(args.size)
+
+    def run():
+        start = perf_counter()
+        client.upload(file=payload, filename="upload.bin", parent_id=seed["root_id"])
+        return perf_counter() - start
+
+    return {"upload_throughput": (args.size / best(run, args.runs) / 1e6, "MB/s", "higher")}
+
+def bench_download(client: GofileClient, seed: dict, args) -> dict:
+    results = {}
+    for name, segments in (("download_throughput", 1), ("download_throughput_segmented", 4)):
+        def run():
+            out_dir = tempfile.mkdtemp()
+            try:
+                start = perf_counter()
+                client._download_file_from_direct_link(
+                    seed["link"], out_dir=out_dir, segments=segments, min_segment_size=1024 * 1024, resume=False
+                )
+                return perf_counter() - start
+            finally:
+                shutil.rmtree(out_dir)
+
+        results[name] = (args.size / best(run, args.runs) / 1e6, "MB/s", "higher")
+    return results
+
+def bench_metadata(client: GofileClient, seed: dict, args) -> dict:
+    def sequential():
+        start = perf_counter()
+        for _ in range(args.calls):
+            client.get(seed["small_id"], use_cache=False)
+        return perf_counter() - start
+
+    def concurrent():
+        start = perf_counter()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: client.get(seed["small_id"], use_cache=False), range(args.calls)))
+        return perf_counter() - start
+
+    return {
+        "metadata_ops": (args.calls / best(sequential, args.runs), "ops/s", "higher"),
+        "metadata_ops_concurrent": (args.calls / best(concurrent, args.runs), "ops/s", "higher"),
+    }
+
+def bench_hydration(client: GofileClient, seed: dict, args) -> dict:
+    def hydrate():
+        folder = client.get(seed["large_id"], use_cache=False)
+        return folder, list(folder.children)
+
+    def timed():
+        gc.collect()
+        start = perf_counter()
+        hydrate()
+        return perf_counter() - start
+
+    def peak():
+        gc.collect()
+        tracemalloc.start()
+        try:
+            hydrate()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "folder_hydration_time": (best(timed, args.runs), "s", "lower"),
+        "folder_hydration_peak_memory": (best(peak, args.runs) / 1e6, "MB", "lower"),
+    }
+
+BENCHMARKS = {
+    "upload": bench_upload,
+    "download": bench_download,
+    "metadata": bench_metadata,
+    "hydration": bench_hydration,
+}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Prints each metric next to the baseline, returns the names that got worse by more than tolerance"""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if not old or not old["value"]:
+            print("{:<32} {:>12.3f} {:<6} (new)".format(name, result["value"], result["unit"]))
+            continue
+
+        change = (result["value"] - old["value"]) / old["value"]
+        worse = -change if result["better"] == "higher" else change
+        flag = ""
+        if worse > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print("{:<32} {:>12.3f} {:<6} {:>+8.1f}% vs {:.3f}{}".format(
+            name, result["value"], result["unit"], change * 100, old["value"], flag
+        ))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="benchmarks to run (default all)")
+    parser.add_argument("--size", type=int, default=64 * 1024 * 1024, help="bytes per upload/download")
+    parser.add_argument("--calls", type=int, default=200, help="metadata requests per run")
+    parser.add_argument("--entries", type=int, default=20_000, help="children of the large folder")
+    parser.add_argument("--runs", type=int, default=3, help="runs per benchmark, the best is kept")
+    parser.add_argument("--latency", type=float, default=0.0, help="stand-in seconds per request")
+    parser.add_argument("--bandwidth", type=float, default=None, help="stand-in bytes/sec per connection")
+    parser.add_argument("--output", default=None, help="results json (default benchmarks/results/<time>.json)")
+    parser.add_argument("--compare", default=None, help="results json of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative slowdown before failing")
+    args = parser.parse_args()
+
+    parent_conn, child_conn = multiprocessing.Pipe()
+    process = multiprocessing.Process(
+        target=serve, daemon=True,
+        args=({"size": args.size, "entries": args.entries, "latency": args.latency, "bandwidth": args.bandwidth}, child_conn)
+    )
+    process.start()
+    try:
+        seed = parent_conn.recv()
+        client = new_client(seed["url"])
+        results = {}
+        for name in args.only or BENCHMARKS:
+            for metric, (value, unit, better) in BENCHMARKS[name](client, seed, args).items():
+                results[metric] = {"value": value, "unit": unit, "better": better}
+    finally:
+        process.terminate()
+
+    report = {
+        "meta": {
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "platform": platform.platform(),
+            "params": {k: getattr(args, k) for k in ("size", "calls", "entries", "runs", "latency", "bandwidth")}
+        },
+        "results": results
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    print("saved {}".format(output))
+
+    if regressions:
+        print("{} regression(s): {}".format(len(regressions), ", ".join(regressions)))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
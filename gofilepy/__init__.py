@@ -2,14 +2,23 @@ __pdoc__ = {
     "gofile": False
 }
 
+#aio needs the optional aiohttp so it isn't listed here - import gofilepy.aio directly
 __all__ = [
     "GofileClient",
     "GofileFolder",
     "GofileFile",
     "GofileContent",
     "GofileAccount",
+    "GofileChildren",
+    "GofileBatch",
     "options",
-    "exceptions"
+    "exceptions",
+    "sync",
+    "folder_download",
+    "scheduler",
+    "bandwidth",
+    "metrics"
 ]
 
-from .gofile import GofileClient, GofileFolder, GofileFile, GofileContent, GofileAccount 
+from .gofile import GofileClient, GofileFolder, GofileFile, GofileContent, GofileAccount, GofileChildren 
+from .batch import GofileBatch
@@ -0,0 +1,216 @@
+import os
+from io import BufferedReader
+from typing import AsyncIterable
+from .gofile import GofileClient, GofileContent, GofileFile, GofileFileDirectLink, GofileAccount
+from .options import ContentOption
+from . import decoding
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+#asyncio client - requires aiohttp (pip install gofilepy-api[async])
+
+
+class AsyncGofileClient (object):
+    """asyncio version of GofileClient.  Construction makes no requests - use `async with` or call connect()
+      before uploading.  Every request shares one aiohttp session, `limit` caps its open connections
+      (extra requests wait for a free connection instead of failing).
+
+      Contents returned by this client are the same GofileFile/GofileFolder models, but they are not bound to
+      a client: use the client's coroutines (delete, copy_content, ...) instead of their helper methods"""
+
+    def __init__(self, zone: str = "na", token: str = None, session: "aiohttp.ClientSession" = None,
+                 limit: int = 100, limit_per_host: int = 0, api_url: str = None, store_url: str = None):
+        if aiohttp is None:
+            raise ImportError("AsyncGofileClient requires aiohttp - pip install gofilepy-api[async]")
+
+        self.zone = zone
+        self.token = token
+        self.session = session
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.api_url = api_url or GofileClient._BASE_API_URL
+        self.store_url = store_url
+        self.server = None
+        self.account = None
+        self._servers = None
+        self._owns_session = session is None
+
+    async def __aenter__ (self):
+        await self.connect()
+        return self
+
+    async def __aexit__ (self, *exc):
+        await self.close()
+
+    async def connect(self, get_account: bool = True) -> None:
+        """Picks the upload server and (if a token is set and get_account) loads self.account"""
+        self._get_session()
+        self._servers = await self.get_best_server()
+        self.server = GofileClient.get_preferred_server(self.zone, self._servers)
+
+        if get_account and self.token:
+            await self.get_account()
+
+    async def close(self) -> None:
+        if self.session and self._owns_session:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if not self.session:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self.session = aiohttp.ClientSession(connector=connector)
+            self._owns_session = True
+        return self.session
+
+    def _get_token(self, token: str) -> str:
+        return token or self.token or ""
+
+    def _api_url(self, route: str, *args) -> str:
+        return self.api_url + route.format(*args)
+
+    async def _request(self, method: str, url: str, token: str = None, **kwargs):
+        """Sends request and returns the api response's 'data' field"""
+        headers = kwargs.pop("headers", {})
+        if token:
+            headers.update(GofileClient.create_authorization_header(token))
+
+        async with self._get_session().request(method, url, headers=headers, **kwargs) as resp:
+            data = await resp.json(content_type=None, loads=decoding.loads)
+            return GofileClient._handle_data(resp.status, data)
+
+    async def get_best_server(self) -> list:
+        got = await self._request("GET", self._api_url(GofileClient._API_ROUTE_GET_SERVER))
+        return got["servers"]
+
+    def get_best_upload_url(self) -> str:
+        if not self.server:
+            raise RuntimeError("AsyncGofileClient is not connected - call connect() or use 'async with'")
+
+        if self.store_url:
+            return self.store_url.format(self.server) + "/" + GofileClient._API_ROUTE_UPLOAD_CONTENT_PATH
+        return GofileClient._API_STORE_FORMAT.format(
+            self.server, GofileClient._BASE_DOMAIN, GofileClient._API_ROUTE_UPLOAD_CONTENT_PATH
+        )
+
+    async def get(self, content_id: str, token: str = None):
+        data = await self._request(
+            "GET", self._api_url(GofileClient._API_ROUTE_GET_CONTENT, content_id), token=self._get_token(token)
+        )
+        return GofileContent.__init_from_resp__({"data": data})
+
+    async def get_folder(self, *args, **kwargs):
+        """Retrieves folder using content_id"""
+        return await self.get(*args, **kwargs)
+
+    async def upload(self, path: str = None, file: BufferedReader | bytes | AsyncIterable[bytes] = None,
+                     parent_id: str = None, token: str = None, filename: str = None) -> GofileFile:
+        """Uploads a file from path, a BufferedReader, bytes or an async iterable of bytes.  The body is streamed
+          by aiohttp - files are read in a thread so the event loop isn't blocked"""
+        if file is None and not path:
+            raise ValueError("AsyncGofileClient.upload() requires a BufferedReader or file path")
+
+        form = aiohttp.FormData()
+        if parent_id:
+            form.add_field("folderId", parent_id)
+
+        owns_file = file is None
+        if owns_file:
+            file = open(path, "rb")
+            filename = filename or os.path.basename(path)
+        elif not filename:
+            name = getattr(file, "name", None)
+            filename = os.path.basename(name) if isinstance(name, str) else "file"
+
+        form.add_field("file", file, filename=filename, content_type="application/octet-stream")
+
+        try:
+            got = await self._request("POST", self.get_best_upload_url(), token=self._get_token(token), data=form)
+        finally:
+            if owns_file:
+                file.close()
+
+        #Needed because json returned from API has different key values at this endpoint
+        got["id"] = got.get("id", None)
+        got["name"] = got.get("name", None)
+
+        return GofileFile._load_from_dict(got)
+
+    async def delete(self, *content_ids: str, token: str = None) -> None:
+        """Calls Gofile API to delete provided content_ids."""
+        token = self._get_token(token)
+        data = {"contentsId": ",".join(content_ids), "token": token}
+        await self._request("DELETE", self._api_url(GofileClient._API_ROUTE_DELETE_CONTENT), token=token, data=data)
+
+    async def copy_content(self, *content_ids: str, parent_id: str = None, token: str = None) -> None:
+        """Copy provided content_ids to destination folder's content_id"""
+        if not parent_id:
+            raise ValueError("Must pass a parent folder id: parent_id=None")
+
+        token = self._get_token(token)
+        data = {
+            "contentsId": ",".join(content_ids),
+            "folderId": parent_id,
+            "token": token
+        }
+        await self._request("POST", self._api_url(GofileClient._API_ROUTE_COPY_CONTENT), token=token, data=data)
+
+    async def create_folder(self, name: str, parent_id: str, token: str = None):
+        """Creates folder in specified parent folder's content_id"""
+        data = {
+            "parentFolderId": parent_id,
+            "folderName": name
+        }
+        got = await self._request(
+            "POST", self._api_url(GofileClient._API_ROUTE_CREATE_FOLDER), token=self._get_token(token), data=data
+        )
+        return GofileContent.__init_from_resp__({"data": got}, _type="folder")
+
+    async def set_content_option(self, content_id: str, option: str, value, token: str = None) -> None:
+        """Sets content option like 'description', 'public', etc (more at gofile.io/api)"""
+        value = ContentOption._process_option_value(option, value) #checks file types and formats for api
+
+        data = {
+            "attribute": option,
+            "attributeValue": value
+        }
+        await self._request(
+            "PUT", self._api_url(GofileClient._API_ROUTE_SET_OPTION, content_id), token=self._get_token(token), data=data
+        )
+
+    async def get_account(self, token: str = None) -> GofileAccount:
+        """If token is provided returns specified account, otherwise token defaults to self.token.
+          If token is default self.account is updated"""
+        token = self._get_token(token)
+        got = await self._request("GET", self._api_url(GofileClient._API_ROUTE_GET_ACCOUNT_ID), token=token)
+        data = await self._request("GET", self._api_url(GofileClient._API_ROUTE_GET_ACCOUNT, got["id"]), token=token)
+
+        account = GofileAccount._load_from_dict(data)
+        if account.token == self.token:
+            self.account = account #update client's copy of account
+
+        return account
+
+    async def create_file_direct_link(self, content_id: str, token: str = None, expire: int = None,
+                                      ips_allowed: list = [], domains_allowed: list = [],
+                                      username: str = None, password: str = None, file: GofileFile = None):
+        data = []
+        if expire:
+            data.append(("expireTime", str(expire)))
+        for ip in ips_allowed:
+            data.append(("sourceIpsAllowed", ip))
+        for domain in domains_allowed:
+            data.append(("domainsAllowed", domain))
+        if username or password:
+            if not (username and password):
+                raise ValueError("username AND password both needed create direct link creation")
+            data += [("auth", username), ("auth", password)]
+
+        got = await self._request(
+            "POST", self._api_url(GofileClient._API_ROUTE_CREATE_FILE_DIRECT_LINK, content_id),
+            token=self._get_token(token), data=data
+        )
+        return GofileFileDirectLink._load_from_dict(got, file=file)
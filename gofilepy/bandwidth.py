@@ -0,0 +1,165 @@
+import threading
+from .scheduler import TokenBucket
+
+#shared bandwidth limits for uploads and downloads - every transfer registers with a BandwidthScheduler which
+#splits the global bytes/sec cap between the active transfers and paces each one with its own TokenBucket
+
+DEFAULT_BURST = 0.25
+"""Seconds worth of bytes a transfer may send at once"""
+MIN_SHARE = 0.01
+"""Fraction of the global rate a transfer always gets, so lower priorities are slowed down but never stalled"""
+
+
+class Transfer (object):
+    """One upload or download registered with a BandwidthScheduler.  consume(n) is called for every chunk
+      (from any number of threads - segments of a download share the transfer) and blocks to keep the
+      transfer within its share.  Closing it gives the share back to the others"""
+    max_rate: float
+    """Cap of this transfer in bytes/sec, None for no cap of its own"""
+    weight: float
+    """Relative share of the bandwidth among transfers of the same priority"""
+    priority: int
+    """Transfers with a higher priority are served first, the rest share what they leave"""
+    bytes: int
+    """Bytes transferred so far"""
+    waited: float
+    """Seconds spent waiting for bandwidth"""
+
+    def __init__(self, scheduler, max_rate: float = None, weight: float = 1, priority: int = 0):
+        if weight <= 0:
+            raise ValueError("weight must be greater than 0 - got {}".format(weight))
+
+        self.scheduler = scheduler
+        self.max_rate = max_rate
+        self.weight = weight
+        self.priority = priority
+        self.bytes = 0
+        self.waited = 0.0
+        self._bucket = TokenBucket(None)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def rate(self) -> float:
+        """Bytes/sec currently allocated to this transfer, None if unlimited"""
+        return self._bucket.rate
+
+    def _set_rate(self, rate: float) -> None:
+        self._bucket.set_rate(rate, capacity=rate * self.scheduler.burst if rate else None)
+
+    def consume(self, n: int) -> float:
+        """Accounts for n bytes, waiting until the transfer's share allows them.  Returns the seconds waited"""
+        waited = self._bucket.acquire(n)
+        with self._lock:
+            self.bytes += n
+            self.waited += waited
+        return waited
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self.scheduler._unregister(self)
+
+    def __enter__ (self):
+        return self
+
+    def __exit__ (self, *exc):
+        self.close()
+
+    def __repr__ (self) -> str:
+        return "<Transfer rate={} weight={} priority={} bytes={}>".format(self.rate, self.weight, self.priority, self.bytes)
+
+
+class BandwidthScheduler (object):
+    """Global bytes/sec cap (`rate`, None for none) shared by the transfers registered with transfer().
+
+      Every time a transfer starts or finishes the rate is reallocated: transfers are served by priority
+      (highest first) and within a priority get shares proportional to their weight.  A transfer's own
+      max_rate is respected and what it can't use goes to the others.  Without a global rate each transfer
+      only keeps to its own max_rate"""
+
+    def __init__(self, rate: float = None, burst: float = DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._transfers = []
+        self._bytes = 0
+        self._waited = 0.0
+        self._lock = threading.Lock()
+
+    def transfer(self, max_rate: float = None, weight: float = 1, priority: int = 0) -> Transfer:
+        """Registers a new transfer - close it (or use it as a context manager) once it is done"""
+        transfer = Transfer(self, max_rate=max_rate, weight=weight, priority=priority)
+        with self._lock:
+            self._transfers.append(transfer)
+            self._allocate()
+        return transfer
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self.rate = rate
+            self._allocate()
+
+    def _unregister(self, transfer: Transfer) -> None:
+        with self._lock:
+            self._transfers.remove(transfer)
+            self._bytes += transfer.bytes
+            self._waited += transfer.waited
+            self._allocate()
+
+    @staticmethod
+    def allocate(rate: float, transfers: list) -> dict:
+        """Shares of `rate` keyed by transfer (see class docstring), without the MIN_SHARE floor"""
+        shares = {}
+        remaining = rate
+        for priority in sorted({t.priority for t in transfers}, reverse=True):
+            pending = [t for t in transfers if t.priority == priority]
+
+            #water-filling - transfers capped below their fair share take their cap, the rest split what's left
+            while pending and remaining > 0:
+                total_weight = sum(t.weight for t in pending)
+                capped = [t for t in pending if t.max_rate and t.max_rate <= remaining * t.weight / total_weight]
+                if not capped:
+                    for t in pending:
+                        shares[t] = remaining * t.weight / total_weight
+                    remaining = 0
+                    pending = []
+                    break
+
+                for t in capped:
+                    shares[t] = t.max_rate
+                    remaining -= t.max_rate
+                    pending.remove(t)
+
+            for t in pending:
+                shares[t] = 0
+        return shares
+
+    def _allocate(self) -> None:
+        if not self.rate:
+            for t in self._transfers:
+                t._set_rate(t.max_rate)
+            return
+
+        floor = self.rate * MIN_SHARE
+        for t, share in self.allocate(self.rate, self._transfers).items():
+            share = max(share, floor)
+            t._set_rate(min(share, t.max_rate) if t.max_rate else share)
+
+    @property
+    def active(self) -> int:
+        """Number of open transfers"""
+        return len(self._transfers)
+
+    def stats(self) -> dict:
+        """Open transfers, bytes transferred and seconds spent waiting (including closed transfers)"""
+        with self._lock:
+            transfers = list(self._transfers)
+            return {
+                "rate": self.rate,
+                "active": len(transfers),
+                "bytes": self._bytes + sum(t.bytes for t in transfers),
+                "waited": self._waited + sum(t.waited for t in transfers),
+            }
+
+    def __repr__ (self) -> str:
+        return "<BandwidthScheduler rate={} active={}>".format(self.rate, self.active)
@@ -0,0 +1,75 @@
+from concurrent.futures import Future, as_completed
+from time import perf_counter
+from typing import Iterator
+
+#results of bulk operations - failures are collected per item instead of aborting the whole batch
+
+
+class GofileBatch (object):
+    """Results of a bulk operation.  Iterating yields each result as it finishes, items that raised are
+      recorded in `failed` instead of raising.  Call wait() to block until every item has finished"""
+    succeeded: dict
+    """Map of item key (path, content_id, etc.) to its result"""
+    failed: dict
+    """Map of item key to the exception it raised"""
+
+    def __init__(self):
+        self.succeeded = {}
+        self.failed = {}
+        self._pending = {}
+        self._started = perf_counter()
+        self._finished = None
+
+    def __repr__ (self) -> str:
+        return "<GofileBatch succeeded={} failed={} pending={}>".format(
+            len(self.succeeded), len(self.failed), len(self._pending)
+        )
+
+    def __len__ (self) -> int:
+        return len(self.succeeded) + len(self.failed) + len(self._pending)
+
+    def _add_future(self, key, future: Future) -> None:
+        self._pending[future] = key
+
+    def _add_result(self, key, result) -> None:
+        self.succeeded[key] = result
+
+    def _add_failure(self, key, error: Exception) -> None:
+        self.failed[key] = error
+
+    def __iter__ (self) -> Iterator:
+        while self._pending:
+            for future in as_completed(list(self._pending)):
+                key = self._pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self._add_failure(key, e)
+                    continue
+
+                self._add_result(key, result)
+                yield result
+
+        if self._finished is None:
+            self._finished = perf_counter()
+
+    def wait(self):
+        """Blocks until every item has finished, returns itself"""
+        for _ in self:
+            pass
+        return self
+
+    @property
+    def ok(self) -> bool:
+        """If every finished item succeeded"""
+        return not self.failed
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds from batch creation until the last item finished (or until now if still running)"""
+        return (self._finished or perf_counter()) - self._started
+
+    def raise_for_failures(self) -> None:
+        """Re-raises the first recorded failure, if any"""
+        for error in self.failed.values():
+            raise error
@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+
+#in-memory cache of /contents responses - bounded by entry count (lru) and ttl
+
+DEFAULT_CACHE_TTL = 30
+
+
+class ContentCache (object):
+    """LRU cache of /contents/{id} 'data' payloads.  Entries expire after `ttl` seconds and the least recently
+      used entry is evicted once there are more than `max_entries`.  Entries are only returned to the token
+      that fetched them.  Changes made through the client drop the affected contents and their parents,
+      changes made elsewhere may take up to ttl to show.
+
+      Cached dicts are shared with the contents built from them, treat them as read only"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = DEFAULT_CACHE_TTL):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than 0 - got {}".format(max_entries))
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict() #content_id -> (expires, token, data)
+        self._parents = {} #child content_id -> content_id of a cached folder listing it
+        self._lock = threading.Lock()
+
+    def __len__ (self) -> int:
+        return len(self._entries)
+
+    def __repr__ (self) -> str:
+        return "<ContentCache entries={} hits={} misses={}>".format(len(self._entries), self.hits, self.misses)
+
+    def get(self, content_id: str, token: str = None) -> dict:
+        """Cached data for content_id or None (counted as a miss)"""
+        with self._lock:
+            entry = self._entries.get(content_id)
+            if entry and entry[1] == token and entry[0] > time.monotonic():
+                self._entries.move_to_end(content_id)
+                self.hits += 1
+                return entry[2]
+
+            if entry:
+                self._remove(content_id)
+            self.misses += 1
+            return None
+
+    def set(self, content_id: str, data: dict, token: str = None) -> None:
+        with self._lock:
+            if content_id in self._entries:
+                self._remove(content_id)
+
+            self._entries[content_id] = (time.monotonic() + self.ttl, token, data)
+            for child_id in data.get("childs") or []:
+                self._parents[child_id] = content_id
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, content_id: str) -> None:
+        entry = self._entries.pop(content_id, None)
+        if not entry:
+            return
+
+        for child_id in entry[2].get("childs") or []:
+            if self._parents.get(child_id) == content_id:
+                del self._parents[child_id]
+
+    def parent_of(self, content_id: str) -> str:
+        """Parent folder id of content_id if it can be found in the cache"""
+        with self._lock:
+            entry = self._entries.get(content_id)
+            if entry and entry[2].get("parentFolder"):
+                return entry[2]["parentFolder"]
+            return self._parents.get(content_id)
+
+    def invalidate(self, *content_ids: str, parents: bool = True) -> None:
+        """Drops content_ids (and with parents, the folders that list them) from the cache"""
+        with self._lock:
+            for content_id in content_ids:
+                if not content_id:
+                    continue
+
+                drop = [content_id]
+                if parents:
+                    entry = self._entries.get(content_id)
+                    drop.append(entry[2].get("parentFolder") if entry else None)
+                    drop.append(self._parents.get(content_id))
+
+                for _id in drop:
+                    if _id in self._entries:
+                        self._remove(_id)
+                        self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._parents.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
@@ -0,0 +1,50 @@
+import json
+
+#json decoding of api responses - every body is decoded once (kept on the response) with the fastest backend
+#available: orjson, then msgspec, then the standard library.  pip install gofilepy-api[fast] for orjson
+
+BACKENDS = {}
+"""Map of backend name to its loads(bytes | str) function, for the backends that can be imported"""
+
+try:
+    import orjson
+    BACKENDS["orjson"] = orjson.loads
+except ImportError:
+    pass
+
+try:
+    import msgspec
+    BACKENDS["msgspec"] = msgspec.json.decode
+except ImportError:
+    pass
+
+BACKENDS["json"] = json.loads
+
+backend = next(iter(BACKENDS))
+"""Name of the backend in use"""
+loads = BACKENDS[backend]
+
+
+def set_backend(name: str = None) -> str:
+    """Switches to backend `name` (None picks the fastest available).  Returns the name in use"""
+    global backend, loads
+    if name is None:
+        name = next(iter(BACKENDS))
+    if name not in BACKENDS:
+        raise ValueError("json backend {!r} isn't available - choose from {}".format(name, list(BACKENDS)))
+
+    backend = name
+    loads = BACKENDS[name]
+    return backend
+
+def decode_response(resp):
+    """Decoded json body of a requests.Response.  The result is kept on the response, so later calls (and
+      handle_response) don't decode it again.  Bodies that aren't valid json raise the same error as resp.json()"""
+    data = getattr(resp, "_gofile_data", None)
+    if data is None:
+        try:
+            data = loads(resp.content)
+        except Exception:
+            data = resp.json() #raises requests' JSONDecodeError, or decodes what the fast backend couldn't
+        resp._gofile_data = data
+    return data
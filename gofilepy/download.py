@@ -0,0 +1,401 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from requests import Response
+from .exceptions import GofileAPIException, GofileIntegrityError
+
+#direct link download engine - single stream or concurrent byte range segments, resumable through a .part file.
+#bodies are read straight into one reusable buffer per stream instead of allocating a bytes object per chunk
+
+#ranges and content lengths only line up with the file on disk if the body isn't compressed
+_IDENTITY_HEADERS = {"Accept-Encoding": "identity"}
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+DEFAULT_CHECKPOINT_INTERVAL = 8 * 1024 * 1024
+
+PART_SUFFIX = ".part"
+CHECKPOINT_SUFFIX = ".part.json"
+
+
+class _RangeIgnored (Exception):
+    """Server answered a Range request with the whole file"""
+
+
+class _SizeChanged (Exception):
+    """The remote file's size no longer matches the size the download was started with"""
+    pass
+
+
+class DownloadCheckpoint (object):
+    """Completed byte ranges of a .part download, saved to a small json sidecar so an interrupted download
+      only requests the missing bytes when retried"""
+
+    def __init__(self, path: str, size: int, ranges: list = None, save_interval: int = DEFAULT_CHECKPOINT_INTERVAL):
+        self.path = path
+        self.size = size
+        self.ranges = ranges or []
+        self.save_interval = save_interval
+        self._unsaved = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, **kwargs):
+        """Returns the saved checkpoint or None if there isn't a readable one"""
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            return cls(path, int(data["size"]), [tuple(r) for r in data["ranges"]], **kwargs)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def add(self, start: int, end: int) -> None:
+        """Marks inclusive range start-end as written - saved once save_interval bytes are unsaved"""
+        with self._lock:
+            self.ranges.append((start, end))
+            self._merge()
+            self._unsaved += end - start + 1
+            if self._unsaved >= self.save_interval:
+                self._save()
+
+    def _merge(self) -> None:
+        merged = []
+        for start, end in sorted(self.ranges):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        self.ranges = merged
+
+    def missing(self) -> list:
+        """Inclusive byte ranges that haven't been written yet"""
+        with self._lock:
+            gaps, pos = [], 0
+            for start, end in self.ranges:
+                if start > pos:
+                    gaps.append((pos, start - 1))
+                pos = max(pos, end + 1)
+            if pos < self.size:
+                gaps.append((pos, self.size - 1))
+            return gaps
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.missing()
+
+    def save(self) -> None:
+        with self._lock:
+            self._save()
+
+    def _save(self) -> None:
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"size": self.size, "ranges": self.ranges}, f)
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _parse_content_range(value: str) -> tuple:
+    """Parses 'bytes start-end/total' into (start, end, total) - total is None if the server sent '*'"""
+    unit, _, spec = (value or "").partition(" ")
+    if unit.strip().lower() != "bytes" or "/" not in spec:
+        return None
+
+    span, total = spec.split("/", 1)
+    start, _, end = span.partition("-")
+    try:
+        return int(start), int(end), (None if total.strip() == "*" else int(total))
+    except ValueError:
+        return None
+
+def _get_readinto(resp: Response) -> Callable:
+    """readinto() of the response body.  Uncompressed bodies are read from the underlying http.client response,
+      which fills the buffer directly - urllib3's readinto() reads into a new bytes object and copies it"""
+    raw = resp.raw
+    fp = getattr(raw, "_fp", None)
+    if resp.headers.get("Content-Encoding", "identity").lower() == "identity" and hasattr(fp, "readinto"):
+        return fp.readinto
+    return raw.readinto
+
+def _write_stream(resp: Response, f, chunk_size: int, offset: int = 0, checkpoint: DownloadCheckpoint = None,
+                  hasher=None, throttle: Callable[[int], None] = None) -> int:
+    """Writes response body to f (already positioned at offset), recording progress in checkpoint and
+      feeding the bytes to hasher.  throttle(n) is called after every read and may block to pace the stream.
+      One chunk_size buffer is reused for the whole body"""
+    view = memoryview(bytearray(chunk_size))
+    readinto = _get_readinto(resp)
+    write = f.write
+
+    written = 0
+    recorded = 0
+    try:
+        while True:
+            n = readinto(view)
+            if not n:
+                break
+            write(view[:n])
+            if hasher:
+                hasher.update(view[:n])
+            written += n
+            if throttle:
+                throttle(n)
+
+            if checkpoint and written - recorded >= checkpoint.save_interval:
+                f.flush()
+                checkpoint.add(offset + recorded, offset + written - 1)
+                recorded = written
+    finally:
+        if checkpoint and written > recorded:
+            f.flush()
+            checkpoint.add(offset + recorded, offset + written - 1)
+
+    #body was read to the end so the connection can go back to the session's pool
+    resp.raw.release_conn()
+    return written
+
+def _download_range(request: Callable[..., Response], url: str, part_path: str, start: int, end: int,
+                    chunk_size: int, checkpoint: DownloadCheckpoint = None, throttle: Callable[[int], None] = None) -> int:
+    resp = request("GET", url, stream=True, headers=dict(_IDENTITY_HEADERS, Range="bytes={}-{}".format(start, end)))
+    with resp:
+        if resp.status_code == 200:
+            raise _RangeIgnored()
+        if resp.status_code == 416:
+            raise _SizeChanged()
+        if resp.status_code != 206:
+            raise GofileAPIException("Could not download segment {}-{}".format(start, end), code=resp.status_code)
+
+        content_range = _parse_content_range(resp.headers.get("Content-Range"))
+        if checkpoint and content_range and content_range[2] is not None and content_range[2] != checkpoint.size:
+            raise _SizeChanged()
+
+        with open(part_path, "r+b") as f:
+            f.seek(start)
+            written = _write_stream(resp, f, chunk_size, offset=start, checkpoint=checkpoint, throttle=throttle)
+
+    if written != end - start + 1:
+        raise GofileAPIException(
+            "Segment {}-{} ended early - got {} bytes".format(start, end, written), code=resp.status_code
+        )
+    return written
+
+def _download_ranges(request: Callable[..., Response], url: str, part_path: str, ranges: list, workers: int,
+                     chunk_size: int, checkpoint: DownloadCheckpoint = None, throttle: Callable[[int], None] = None) -> None:
+    if workers <= 1 or len(ranges) == 1:
+        for start, end in ranges:
+            _download_range(request, url, part_path, start, end, chunk_size, checkpoint, throttle)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+        futures = [
+            executor.submit(_download_range, request, url, part_path, start, end, chunk_size, checkpoint, throttle)
+            for start, end in ranges
+        ]
+        for future in futures:
+            future.result()
+
+class ConnectionLimiter (object):
+    """Wraps a request callable so at most `limit` responses are open at once across every thread using it.
+      A slot is taken before the request is sent and given back when the response is closed"""
+
+    def __init__(self, request: Callable[..., Response], limit: int):
+        self.request = request
+        self.limit = limit
+        self._slots = threading.BoundedSemaphore(limit)
+
+    def __call__(self, method: str, url: str, **kwargs) -> Response:
+        self._slots.acquire()
+        try:
+            resp = self.request(method, url, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        close = resp.close
+        released = []
+        def release():
+            try:
+                close()
+            finally:
+                if not released:
+                    released.append(True)
+                    self._slots.release()
+        resp.close = release
+        return resp
+
+def split_segments(size: int, segments: int, min_segment_size: int, offset: int = 0) -> list:
+    """Splits size bytes into at most `segments` inclusive (start, end) ranges of at least min_segment_size"""
+    count = max(1, min(segments, size // max(1, min_segment_size)))
+    step = -(-size // count)
+    return [(offset + start, offset + min(start + step, size) - 1) for start in range(0, size, step)]
+
+def _md5_file(path: str, chunk_size: int) -> str:
+    hasher = hashlib.md5()
+    view = memoryview(bytearray(chunk_size))
+    with open(path, "rb") as f:
+        while n := f.readinto(view):
+            hasher.update(view[:n])
+    return hasher.hexdigest()
+
+def _verify(part_path: str, out_path: str, expected_md5: str, actual_md5: str, checkpoint: DownloadCheckpoint = None) -> None:
+    if actual_md5 == expected_md5:
+        return
+
+    #the data is corrupt so it can't be resumed from either
+    os.remove(part_path)
+    if checkpoint:
+        checkpoint.remove()
+    raise GofileIntegrityError("Downloaded file is corrupt", expected_md5, actual_md5, path=out_path)
+
+def _finish(part_path: str, out_path: str, checkpoint: DownloadCheckpoint = None, expected_md5: str = None,
+            actual_md5: str = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    if expected_md5:
+        if not actual_md5:
+            actual_md5 = _md5_file(part_path, chunk_size)
+        _verify(part_path, out_path, expected_md5, actual_md5, checkpoint)
+
+    os.replace(part_path, out_path)
+    if checkpoint:
+        checkpoint.remove()
+    return out_path
+
+def _resume(request: Callable[..., Response], url: str, part_path: str, checkpoint: DownloadCheckpoint,
+            segments: int, min_segment_size: int, chunk_size: int, throttle: Callable[[int], None] = None) -> bool:
+    """Requests only the missing ranges of an interrupted download.  False if the server ignores Range or the
+      remote file's size changed since the .part file was started - the stale .part and sidecar are removed then"""
+    ranges = []
+    for start, end in checkpoint.missing():
+        ranges += split_segments(end - start + 1, segments, min_segment_size, offset=start)
+
+    try:
+        try:
+            _download_ranges(request, url, part_path, ranges, segments, chunk_size, checkpoint, throttle)
+        finally:
+            checkpoint.save()
+    except _RangeIgnored:
+        return False
+    except _SizeChanged:
+        _discard(part_path, checkpoint)
+        return False
+
+    return True
+
+def _discard(part_path: str, checkpoint: DownloadCheckpoint = None) -> None:
+    try:
+        os.remove(part_path)
+    except FileNotFoundError:
+        pass
+    if checkpoint:
+        checkpoint.remove()
+
+def _write_whole(resp: Response, part_path: str, out_path: str, checkpoint_path: str, chunk_size: int, resume: bool,
+                 expected_md5: str, throttle: Callable[[int], None]) -> str:
+    """Writes a 200 response holding the whole file"""
+    size = resp.headers.get("Content-Length")
+    size = int(size) if size and size.isdigit() else None
+    checkpoint = None
+    if resume and size is not None:
+        checkpoint = DownloadCheckpoint(checkpoint_path, size)
+
+    hasher = hashlib.md5() if expected_md5 else None
+    with open(part_path, "wb") as f:
+        if checkpoint:
+            f.truncate(checkpoint.size)
+            checkpoint.save()
+        try:
+            written = _write_stream(resp, f, chunk_size, checkpoint=checkpoint, hasher=hasher, throttle=throttle)
+        finally:
+            if checkpoint:
+                checkpoint.save()
+
+    if size is not None and written != size:
+        raise GofileAPIException("Download ended early - got {} of {} bytes".format(written, size), code=resp.status_code)
+    return _finish(
+        part_path, out_path, checkpoint, expected_md5=expected_md5, actual_md5=hasher.hexdigest() if hasher else None
+    )
+
+def download(request: Callable[..., Response], url: str, out_path: str, segments: int = 1,
+             min_segment_size: int = DEFAULT_MIN_SEGMENT_SIZE, chunk_size: int = DEFAULT_CHUNK_SIZE,
+             resume: bool = True, expected_md5: str = None, throttle: Callable[[int], None] = None) -> str:
+    """Downloads url to out_path.  `request(method, url, **kwargs)` sends the requests (GofileClient._request).
+
+      With segments > 1 the first request asks for byte 0 only to learn the size - if the server honors Range
+      the file is preallocated and up to `segments` ranges (each at least min_segment_size) are fetched
+      concurrently and written at their offsets.  Otherwise the response is used as a single stream.
+
+      Bytes are written to out_path + '.part' and completed ranges are recorded in out_path + '.part.json'.
+      If resume and both exist, only the missing ranges are requested.  The .part file is renamed to out_path
+      once complete.  If the server reports a different size than the .part file was started with (or answers
+      416) the stale .part is discarded and the download restarts.  Each stream reads into a single reusable
+      buffer of chunk_size bytes.
+
+      If expected_md5 is passed it is compared to the md5 of the file before it is renamed, GofileIntegrityError
+      is raised (and the .part file removed) on mismatch.  Single streams are hashed as they are written,
+      segmented or resumed downloads arrive out of order so the finished .part file is hashed instead.
+
+      `throttle(n)` is called for every n bytes read by any of the streams (Transfer.consume)"""
+    part_path = out_path + PART_SUFFIX
+    checkpoint_path = out_path + CHECKPOINT_SUFFIX
+
+    if resume and os.path.exists(part_path):
+        checkpoint = DownloadCheckpoint.load(checkpoint_path)
+        if checkpoint and os.path.getsize(part_path) == checkpoint.size:
+            if _resume(request, url, part_path, checkpoint, segments, min_segment_size, chunk_size, throttle):
+                return _finish(part_path, out_path, checkpoint, expected_md5=expected_md5, chunk_size=chunk_size)
+
+    if segments <= 1:
+        resp = request("GET", url, stream=True, allow_redirects=None, headers=_IDENTITY_HEADERS)
+    else:
+        resp = request("GET", url, stream=True, allow_redirects=None, headers=dict(_IDENTITY_HEADERS, Range="bytes=0-0"))
+
+    with resp:
+        if resp.status_code not in (200, 206):
+            raise GofileAPIException("Could not download file", code=resp.status_code)
+
+        if resp.status_code == 200:
+            return _write_whole(
+                resp, part_path, out_path, checkpoint_path, chunk_size, resume, expected_md5, throttle
+            )
+        content_range = _parse_content_range(resp.headers.get("Content-Range"))
+
+    if not content_range or content_range[2] is None:
+        #a partial response that doesn't say how big the file is - fall back to a single plain request
+        with request("GET", url, stream=True, allow_redirects=None, headers=_IDENTITY_HEADERS) as resp:
+            if resp.status_code != 200:
+                raise GofileAPIException("Could not download file", code=resp.status_code)
+            return _write_whole(
+                resp, part_path, out_path, checkpoint_path, chunk_size, resume, expected_md5, throttle
+            )
+
+    size = content_range[2]
+    checkpoint = DownloadCheckpoint(checkpoint_path, size) if resume else None
+
+    with open(part_path, "wb") as f:
+        f.truncate(size)
+    if checkpoint:
+        checkpoint.save()
+
+    if size:
+        try:
+            _download_ranges(
+                request, url, part_path, split_segments(size, segments, min_segment_size), segments, chunk_size,
+                checkpoint, throttle
+            )
+        except _RangeIgnored:
+            raise GofileAPIException("Server stopped honoring Range requests", code=200)
+        except _SizeChanged:
+            _discard(part_path, checkpoint)
+            raise GofileAPIException("Remote file changed size during the download", code=206)
+        finally:
+            if checkpoint and os.path.exists(part_path):
+                checkpoint.save()
+
+    return _finish(part_path, out_path, checkpoint, expected_md5=expected_md5, chunk_size=chunk_size)
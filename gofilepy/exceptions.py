@@ -1,4 +1,5 @@
 from requests.models import Response
+from .decoding import decode_response
 class GofileAPIException (Exception):
     """Gofile API throws an unspecified error - create an issue if on github if thrown"""
     def __init__(self, msg, code):
@@ -7,9 +8,11 @@ class GofileAPIException (Exception):
 
     @classmethod
     def __init_from_resp__ (cls, resp: Response):
-        code = resp.status_code
-        resp = resp.json()
-        status = resp['status']
+        return cls.__init_from_data__(decode_response(resp), resp.status_code)
+
+    @classmethod
+    def __init_from_data__ (cls, data: dict, code: int):
+        status = data['status']
 
         if status == "error-auth":
             return GofileAPIAuthenticationError(status, code=code)
@@ -51,3 +54,19 @@ class GofileAPINotPremiumAccountError (GofileAPIException):
     """Gofile API throws not premium account error - upgrade at gofile.io/premium"""
     def __init__(self, msg: str, code: int = 403):
         super().__init__(msg, code)
+
+
+class GofileIntegrityError (Exception):
+    """MD5 of the bytes that were uploaded or downloaded doesn't match the md5 reported by Gofile API"""
+    def __init__(self, msg: str, expected_md5: str, actual_md5: str, content_id: str = None, path: str = None):
+        self.msg = msg
+        self.expected_md5 = expected_md5
+        self.actual_md5 = actual_md5
+        self.content_id = content_id
+        self.path = path
+
+    def __repr__ (self):
+        return "{} {} expected md5 {} got {}".format(self.__class__, self.msg, self.expected_md5, self.actual_md5)
+
+    def __str__ (self):
+        return self.__repr__()
@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from .batch import GofileBatch
+from .download import download, _md5_file, ConnectionLimiter, DEFAULT_CHUNK_SIZE, DEFAULT_MIN_SEGMENT_SIZE
+
+#recursive download of a gofile folder into a local directory - files that already match locally are skipped
+
+
+def check_name(name: str) -> str:
+    """Returns a remote file or folder name if it is safe to use as a single local path component,
+      raises ValueError otherwise"""
+    if not isinstance(name, str) or name in ("", ".", "..") or "/" in name or os.sep in name or (os.altsep and os.altsep in name) or "\0" in name:
+        raise ValueError("Remote name {!r} can't be used locally".format(name))
+    return name
+
+
+class DownloadReport (object):
+    """Outcome of a FolderDownload.  Paths are relative and '/' separated"""
+    downloaded: list
+    """Files that were downloaded"""
+    skipped: list
+    """Files whose local copy already matched"""
+    bytes: int
+    """Bytes transferred by this download (resumed files only count the part that was missing)"""
+    elapsed: float
+    """Seconds the download took"""
+    batch: GofileBatch
+    """Local paths (or errors) keyed by relative path"""
+
+    def __init__(self):
+        self.downloaded = []
+        self.skipped = []
+        self.bytes = 0
+        self.elapsed = 0.0
+        self.batch = GofileBatch()
+        self._lock = threading.Lock()
+
+    @property
+    def throughput(self) -> float:
+        """Aggregate bytes/sec over the whole download"""
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+    def __repr__ (self) -> str:
+        return "<DownloadReport downloaded={} skipped={} failed={} bytes={} throughput={:.1f} MB/s>".format(
+            len(self.downloaded), len(self.skipped), len(self.batch.failed), self.bytes, self.throughput / 1e6
+        )
+
+
+class FolderDownload (object):
+    """Recreates the remote folder `folder_id` under local_dir, downloading files through their direct links
+      (existing unexpired links are reused, missing ones created - Premium).
+
+      `max_workers` files are downloaded at once, each in up to `segments` byte ranges, and no more than
+      `max_connections` (default max_workers * segments) download connections are open at a time.  A file is
+      skipped if a local file with the same size exists and (with use_md5, when the api reports one) the same md5.
+      Each file registers with client.bandwidth as a transfer capped at `max_rate` with `priority`"""
+
+    def __init__(self, client, folder_id: str, local_dir: str, max_workers: int = 4, max_connections: int = None,
+                 segments: int = 1, min_segment_size: int = DEFAULT_MIN_SEGMENT_SIZE, use_md5: bool = True,
+                 verify_md5: bool = None, resume: bool = True, max_rate: float = None, priority: int = 0):
+        self.client = client
+        self.folder_id = folder_id
+        self.local_dir = os.path.abspath(local_dir)
+        self.max_workers = max_workers
+        self.max_connections = max_connections or max_workers * max(1, segments)
+        self.segments = segments
+        self.min_segment_size = min_segment_size
+        self.use_md5 = use_md5
+        self.verify_md5 = client.verify_md5 if verify_md5 is None else verify_md5
+        self.resume = resume
+        self.max_rate = max_rate
+        self.priority = priority
+
+    def run(self) -> DownloadReport:
+        """Walks the remote tree and downloads it, blocking until every file is done"""
+        report = DownloadReport()
+        request = ConnectionLimiter(self.client._store_request, self.max_connections)
+        start = time.perf_counter()
+
+        relpaths = {self.folder_id: ""}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            for folder, subfolders, files in self.client.walk(self.folder_id, max_workers=self.max_workers):
+                base = relpaths[folder.content_id]
+                os.makedirs(self._local_path(base), exist_ok=True)
+
+                #folders with unusable names are recorded as failed and not walked into
+                for subfolder in list(subfolders):
+                    relpath = base + subfolder.name + "/"
+                    try:
+                        self._local_path(base + check_name(subfolder.name))
+                    except ValueError as e:
+                        report.batch._add_failure(relpath, e)
+                        subfolders.remove(subfolder)
+                        continue
+                    relpaths[subfolder.content_id] = relpath
+
+                for file in files:
+                    relpath = base + file.name
+                    report.batch._add_future(relpath, executor.submit(self._download, report, request, relpath, file))
+        finally:
+            executor.shutdown(wait=False)
+
+        report.batch.wait()
+        report.elapsed = time.perf_counter() - start
+        if self.client.link_registry is not None:
+            self.client.link_registry.save()
+        return report
+
+    def _local_path(self, relpath: str) -> str:
+        """Local path of relpath, raises ValueError if it would resolve outside local_dir"""
+        path = os.path.realpath(os.path.join(self.local_dir, *relpath.split("/")))
+        if os.path.commonpath([path, os.path.realpath(self.local_dir)]) != os.path.realpath(self.local_dir):
+            raise ValueError("{!r} resolves outside {}".format(relpath, self.local_dir))
+        return path
+
+    def _matches(self, path: str, file) -> bool:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return False
+        if size != file.size:
+            return False
+        return not self.use_md5 or not file.md5 or _md5_file(path, DEFAULT_CHUNK_SIZE) == file.md5
+
+    def _download(self, report: DownloadReport, request: ConnectionLimiter, relpath: str, file) -> str:
+        check_name(file.name)
+        path = self._local_path(relpath)
+        if self._matches(path, file):
+            with report._lock:
+                report.skipped.append(relpath)
+            return path
+
+        link = file.get_direct_link(save_registry=False)
+        with self.client.bandwidth.transfer(max_rate=self.max_rate, priority=self.priority) as transfer:
+            try:
+                download(
+                    partial(request, name="download", content_id=file.content_id), link.link, path,
+                    segments=self.segments, min_segment_size=self.min_segment_size, resume=self.resume,
+                    expected_md5=file.md5 if self.verify_md5 else None, throttle=transfer.consume
+                )
+            finally:
+                #only what was fetched this run - a resumed file already had part of its bytes
+                with report._lock:
+                    report.bytes += transfer.bytes
+        with report._lock:
+            report.downloaded.append(relpath)
+        return path
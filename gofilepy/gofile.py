@@ -1,59 +1,272 @@
 import requests
 import os
+import threading
+import time
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from io import BufferedReader
-from .exceptions import GofileAPIException
+from collections.abc import Sequence
+from typing import Callable, Iterable, Iterator
+from requests.adapters import HTTPAdapter
+from .batch import GofileBatch
+from .cache import ContentCache, DEFAULT_CACHE_TTL
+from .download import download, DEFAULT_MIN_SEGMENT_SIZE, DEFAULT_CHUNK_SIZE as DEFAULT_DOWNLOAD_CHUNK_SIZE
+from .links import DirectLinkRegistry, link_expired
+from .metrics import Metrics, RequestEvent
+from .decoding import decode_response
+from .exceptions import GofileAPIException, GofileAPIAuthenticationError, GofileIntegrityError
+from .multipart import MultipartEncoder, DEFAULT_CHUNK_SIZE
+from .sync import FolderSync
+from .folder_download import FolderDownload, DownloadReport, check_name
+from .bandwidth import BandwidthScheduler
+from .scheduler import RequestScheduler, METADATA, STORE, DEFAULT_MAX_RETRIES
+from .servers import ServerCache, ServerSelector, DEFAULT_CACHE_PATH, DEFAULT_SERVER_TTL, DEFAULT_PROBE_INTERVAL
 from .options import FileOption, FolderOption, ContentOption
 
+DEFAULT_BATCH_SIZE = 100
+"""Content ids sent per request by GofileClient.delete() and copy_content()"""
 
 GofileFile = None
 GofileFolder = None
 GofileAccount = None
+GofileContent = None
 
 class GofileClient (object):
-    server = None
     _BASE_DOMAIN = 'gofile.io'
     _API_SUBDOMAIN = 'api'
     _BASE_API_URL = 'https://'+_API_SUBDOMAIN+'.'+_BASE_DOMAIN
 
-    _API_ROUTE_GET_SERVER_URL = _BASE_API_URL + '/servers'
+    _API_ROUTE_GET_SERVER = '/servers'
 
-    _API_ROUTE_GET_ACCOUNT_URL = _BASE_API_URL + "/accounts/{}"
-    _API_ROUTE_GET_ACCOUNT_ID_URL = _BASE_API_URL + "/accounts/getid"
+    _API_ROUTE_GET_ACCOUNT = "/accounts/{}"
+    _API_ROUTE_GET_ACCOUNT_ID = "/accounts/getid"
 
-    _API_ROUTE_GET_CONTENT_URL = _BASE_API_URL + "/contents/{}"
-    _API_ROUTE_DELETE_CONTENT_URL = _BASE_API_URL + "/contents"
-    _API_ROUTE_COPY_CONTENT_URL = _BASE_API_URL + "/contents/copy"
+    _API_ROUTE_GET_CONTENT = "/contents/{}"
+    _API_ROUTE_DELETE_CONTENT = "/contents"
+    _API_ROUTE_COPY_CONTENT = "/contents/copy"
 
-    _API_ROUTE_CREATE_FOLDER_URL = _BASE_API_URL + "/contents/createFolder"
-    _API_ROUTE_SET_OPTION_URL = _BASE_API_URL +  "/contents/{}/update"
+    _API_ROUTE_CREATE_FOLDER = "/contents/createFolder"
+    _API_ROUTE_SET_OPTION = "/contents/{}/update"
 
-    _API_ROUTE_CREATE_FILE_DIRECT_LINK_URL = _BASE_API_URL + "/contents/{}/directlinks"
+    _API_ROUTE_CREATE_FILE_DIRECT_LINK = "/contents/{}/directlinks"
 
     _API_ROUTE_DOWNLOAD_PATH = "download"
     _API_ROUTE_UPLOAD_CONTENT_PATH = "uploadFile"
 
     _API_STORE_FORMAT = "https://{}.{}/{}"
 
-    def __init__(self, zone: str = "na", token: str = None, get_account: bool = True, verbose: bool = False):
+    session: requests.Session
+    """Sends every request of the client and the contents it returns - see create_session() for
+      `pool_connections`, `pool_maxsize` and `keep_alive`"""
+    scheduler: RequestScheduler
+    """Rate limits and retries every api request - built from `rate_limits` and `max_retries`"""
+    bandwidth: BandwidthScheduler
+    """Shares `max_bandwidth` bytes/sec between uploads and downloads"""
+    metrics: Metrics
+    """Reports every api and transfer request to `hooks`"""
+    api_url: str
+    """Base url of the api"""
+    store_url: str
+    """Format string of the upload host (receives the server name), None for gofile's"""
+    server_cache: ServerCache
+    """/servers list cached at `server_cache_path` for `server_cache_ttl` seconds, None if the ttl is 0"""
+    server_selector: ServerSelector
+    """Ranks the upload servers - by zone, or by probed rtt and upload throughput with `probe_servers`
+      (re-probed every `probe_interval` seconds on a background thread)"""
+    cache: ContentCache
+    """Up to `cache_size` /contents responses kept for `cache_ttl` seconds, None if cache_size is 0"""
+    link_registry: DirectLinkRegistry
+    """Direct links saved at `link_registry_path`, None without a path"""
+    verify_md5: bool
+    """Default for checking uploads and downloads against the md5 reported by the api"""
+    retain_raw: bool
+    """If contents keep the api data they were built from (content._raw) and folders their listing"""
+
+    _default_session = None
+    _default_session_lock = threading.Lock()
+
+    def __init__(self, zone: str = "na", token: str = None, get_account: bool = True, verbose: bool = False,
+                 session: requests.Session = None, pool_connections: int = 10, pool_maxsize: int = 10,
+                 keep_alive: bool = True, api_url: str = None, store_url: str = None, verify_md5: bool = True,
+                 server_cache_ttl: float = DEFAULT_SERVER_TTL, server_cache_path: str = DEFAULT_CACHE_PATH,
+                 probe_servers: bool = False, probe_interval: float = DEFAULT_PROBE_INTERVAL, lazy: bool = False,
+                 cache_size: int = 0, cache_ttl: float = DEFAULT_CACHE_TTL, retain_raw: bool = True,
+                 rate_limits: dict = None, max_retries: int = DEFAULT_MAX_RETRIES, scheduler: RequestScheduler = None,
+                 link_registry_path: str = None, max_bandwidth: float = None, bandwidth: BandwidthScheduler = None,
+                 hooks: list = None, metrics: Metrics = None):
+        """Keyword arguments set up the attributes documented on the class - session, scheduler, bandwidth and metrics
+          can be passed to share them between clients.  With `lazy` construction makes no requests"""
         self.token = token
         if token:
             self.headers = GofileClient.create_authorization_header(token)
 
-        self._servers = GofileClient.get_best_server()
-        self.server = GofileClient.get_preferred_server(zone, self._servers) 
+        if not session:
+            session = GofileClient.create_session(
+                pool_connections=pool_connections, pool_maxsize=pool_maxsize, keep_alive=keep_alive
+            )
+        self.session = session
+        self.scheduler = scheduler or RequestScheduler(limits=rate_limits, max_retries=max_retries)
+        self.bandwidth = bandwidth or BandwidthScheduler(max_bandwidth)
+        self.metrics = metrics or Metrics(hooks)
+        self.api_url = api_url or self._BASE_API_URL
+        self.store_url = store_url
+
+        self.server_cache = ServerCache(server_cache_path, ttl=server_cache_ttl) if server_cache_ttl else None
+        self.server_selector = None
+        self.zone = zone
+        self.probe_servers = probe_servers
+        self.probe_interval = probe_interval
+        self._servers = None
+        self._server = None
+        self._account = None
+        self._resolve_lock = threading.RLock()
+
+        self.cache = ContentCache(max_entries=cache_size, ttl=cache_ttl) if cache_size > 0 else None
+
         self.verbose = verbose
+        self.verify_md5 = verify_md5
+        self.retain_raw = retain_raw
+        self.link_registry = DirectLinkRegistry(link_registry_path) if link_registry_path else None
+
+        if not lazy:
+            self._resolve_server()
+            if get_account and token:
+                self.get_account()
+
+    @property
+    def server(self) -> str:
+        """Name of the store server used for uploads - resolved on first access if the client is lazy"""
+        if self._server is None:
+            self._resolve_server()
+        return self._server
+
+    @server.setter
+    def server(self, value: str) -> None:
+        self._server = value
+
+    @property
+    def account(self) -> GofileAccount:
+        """Account of client.token - loaded on first access if it hasn't been yet (None without a token)"""
+        if self._account is None and self.token:
+            with self._resolve_lock:
+                if self._account is None:
+                    self.get_account()
+        return self._account
+
+    @account.setter
+    def account(self, value: GofileAccount) -> None:
+        self._account = value
+
+    def _resolve_server(self) -> str:
+        """Loads the server list and picks the upload server, only done once"""
+        with self._resolve_lock:
+            if self._server is None:
+                self._servers = GofileClient.get_best_server(
+                    api_url=self.api_url, cache=self.server_cache, request=partial(self._request, name="servers")
+                )
+                self.server_selector = ServerSelector(self._servers, zone=self.zone)
+                self._server = self.server_selector.best()
 
-        if get_account and token:
-            self.get_account()
+                if self.probe_servers:
+                    self.server_selector.start_background_refresh(self.refresh_servers, interval=self.probe_interval)
+        return self._server
 
     @staticmethod
     def create_authorization_header(token):
         return {"Authorization": f"Bearer {token}"}
 
+    @staticmethod
+    def create_session(pool_connections: int = 10, pool_maxsize: int = 10, keep_alive: bool = True) -> requests.Session:
+        """Creates a requests.Session with a pooled HTTPAdapter mounted for http and https - `pool_connections`
+          hosts are kept with up to `pool_maxsize` connections each, without keep_alive connections are closed
+          after every request"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+
+        return session
+
+    @classmethod
+    def get_default_session(cls) -> requests.Session:
+        """Session shared by static helpers when they are called without a client"""
+        with cls._default_session_lock:
+            if not GofileClient._default_session:
+                GofileClient._default_session = cls.create_session()
+        return GofileClient._default_session
+
+    def _request(self, method: str, url: str, endpoint: str = METADATA, name: str = None, content_id: str = None,
+                 scheduled: bool = True, **kwargs) -> requests.Response:
+        """Sends a request with self.session through self.scheduler - endpoint is the rate limit class, with
+          scheduled=False the scheduler is skipped (no rate limits or retries).  If self.metrics has hooks a
+          RequestEvent named `name` (default endpoint) about content_id is emitted once the response is complete -
+          json bodies are decoded here (once, see decoding.decode_response)"""
+        if scheduled:
+            send = partial(self.scheduler.request, self.session.request, method, url, endpoint=endpoint)
+        else:
+            def send(event: RequestEvent = None, **kwargs):
+                return self.session.request(method, url, **kwargs)
+
+        if not self.metrics.active:
+            return send(**kwargs)
+
+        event = RequestEvent(name or endpoint, endpoint, method, url, content_id=content_id)
+        start = time.perf_counter()
+        try:
+            resp = send(event=event, **kwargs)
+        except Exception as e:
+            event.error = type(e).__name__
+            event.latency = time.perf_counter() - start
+            self.metrics.emit(event)
+            raise
+
+        event.status = resp.status_code
+        event.elapsed = resp.elapsed.total_seconds()
+        sent = resp.request.headers.get("Content-Length") if resp.request is not None else None
+        event.bytes_sent = int(sent) if sent else getattr(kwargs.get("data"), "bytes_sent", 0)
+
+        if kwargs.get("stream"):
+            #complete once the body has been read, reported when the response is closed
+            received = resp.headers.get("Content-Length")
+            event.bytes_received = int(received) if received and received.isdigit() else 0
+            close = resp.close
+            def finish():
+                close()
+                if event.latency == 0.0:
+                    event.latency = time.perf_counter() - start
+                    self.metrics.emit(event)
+            resp.close = finish
+            return resp
+
+        event.bytes_received = len(resp.content)
+        if resp.content and "json" in resp.headers.get("Content-Type", ""):
+            try:
+                data = decode_response(resp)
+            except ValueError:
+                pass
+            else:
+                if isinstance(data, dict):
+                    event.api_status = data.get("status")
+        event.latency = time.perf_counter() - start
+        self.metrics.emit(event)
+        return resp
+
+    def _store_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self._request(method, url, endpoint=STORE, **kwargs)
+
+    def _api_url(self, route: str, *args) -> str:
+        return self.api_url + route.format(*args)
+
     @staticmethod
     def handle_response(resp: requests.Response):
-        code = resp.status_code
-        data = resp.json()
+        return GofileClient._handle_data(resp.status_code, decode_response(resp))
+
+    @staticmethod
+    def _handle_data(code: int, data: dict):
+        """Returns the 'data' field of a decoded api response, raises GofileAPIException if the call failed"""
         got = None
         api_status = ''
 
@@ -63,18 +276,57 @@ class GofileClient (object):
 
 
         if api_status != 'ok' or code != 200:
-            raise GofileAPIException.__init_from_resp__(resp)
+            raise GofileAPIException.__init_from_data__(data, code)
         return got
 
     def get_best_upload_url(self):
-        return self._API_STORE_FORMAT.format(self.server, self._BASE_DOMAIN, self._API_ROUTE_UPLOAD_CONTENT_PATH)
+        return self._get_store_url(self.server) + "/" + self._API_ROUTE_UPLOAD_CONTENT_PATH
+
+    def _get_store_url(self, server: str) -> str:
+        if self.store_url:
+            return self.store_url.format(server)
+        return self._API_STORE_FORMAT.format(server, self._BASE_DOMAIN, "").rstrip("/")
+
+    def refresh_servers(self, probe: bool = True) -> str:
+        """Reloads the server list (from cache if still fresh), probes every server's rtt and switches
+          self.server to the best ranked one.  Returns the chosen server name"""
+        if not self.server_selector:
+            self._resolve_server()
+
+        self._servers = GofileClient.get_best_server(
+            api_url=self.api_url, cache=self.server_cache, request=partial(self._request, name="servers")
+        )
+        self.server_selector.servers = self._servers
+        if probe:
+            #sent past the scheduler so bucket waits and retry backoff aren't measured as rtt
+            self.server_selector.probe(
+                partial(self._store_request, name="probe", scheduled=False), lambda name: self._get_store_url(name) + "/"
+            )
+
+        self.server = self.server_selector.best()
+        return self.server
 
 
 
     @staticmethod
-    def get_best_server(throw_if_not_200=False):
-        resp = requests.get(GofileClient._API_ROUTE_GET_SERVER_URL)
-        return GofileClient.handle_response(resp)['servers']
+    def get_best_server(throw_if_not_200=False, session: requests.Session = None, api_url: str = None,
+                        cache: ServerCache = None, request: Callable[..., requests.Response] = None):
+        """/servers list - `request(method, url)` sends it if passed, otherwise session (or the default session)"""
+        api_url = api_url or GofileClient._BASE_API_URL
+        if request is None:
+            request = (session or GofileClient.get_default_session()).request
+
+        if cache:
+            servers = cache.get(api_url)
+            if servers:
+                return servers
+
+        resp = request("GET", api_url + GofileClient._API_ROUTE_GET_SERVER)
+        servers = GofileClient.handle_response(resp)['servers']
+
+        if cache:
+            cache.set(api_url, servers)
+        return servers
     
     @staticmethod
     def get_preferred_server(zone: str, servers: list, strict: bool = False):
@@ -87,7 +339,9 @@ class GofileClient (object):
 
 
 
-    def create_file_direct_link(self, content_id, token=None, expire=None, ips_allowed=[], domains_allowed=[], username=None, password=None, file=None):
+    def create_file_direct_link(self, content_id, token=None, expire=None, ips_allowed=[], domains_allowed=[], username=None, password=None, file=None, save_registry: bool = True):
+        """Creates a direct link (Premium).  The link is added to client.link_registry if there is one -
+          save_registry=False leaves writing it to disk to the caller"""
         token = self._get_token(token)
         headers = self.create_authorization_header(token)
 
@@ -103,26 +357,59 @@ class GofileClient (object):
                 raise ValueError("username AND password both needed create direct link creation")
             data["auth"] = [username, password]
 
-        resp = requests.post(
-                GofileClient._API_ROUTE_CREATE_FILE_DIRECT_LINK_URL.format(content_id),
+        resp = self._request(
+                "POST",
+                self._api_url(GofileClient._API_ROUTE_CREATE_FILE_DIRECT_LINK, content_id),
                 data=data,
-                headers=headers
+                headers=headers,
+                name="contents.directlinks",
+                content_id=content_id
                 )
 
-        return GofileFileDirectLink._load_from_dict(GofileClient.handle_response(resp), file=file)
-
-    def _download_file_from_direct_link(self, direct_link, out_dir="./"):
+        got = GofileClient.handle_response(resp)
+        if self.link_registry is not None:
+            self.link_registry.add(content_id, got, save=save_registry)
+
+        return GofileFileDirectLink._load_from_dict(got, file=file)
+
+    def create_direct_links(self, files: Iterable[GofileFile], max_workers: int = 4, **kwargs) -> GofileBatch:
+        """Makes sure every file has a usable direct link - existing unexpired ones (see GofileFile.get_direct_link)
+          are reused, missing ones are created concurrently by `max_workers` threads with create_file_direct_link
+          kwargs.  Blocks until done and returns a GofileBatch keyed by content_id"""
+        def get_link(file):
+            try:
+                return file.content_id, file.get_direct_link(save_registry=False, **kwargs), None
+            except Exception as e:
+                return file.content_id, None, e
+
+        files = list(files)
+        batch = GofileBatch()
+        if files:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(files))) as executor:
+                for content_id, link, error in executor.map(get_link, files):
+                    if error is None:
+                        batch._add_result(content_id, link)
+                    else:
+                        batch._add_failure(content_id, error)
+        batch.wait()
+
+        if self.link_registry is not None:
+            self.link_registry.save()
+        return batch
+
+    def _download_file_from_direct_link(self, direct_link, out_dir="./", segments: int = 1,
+                                        min_segment_size: int = DEFAULT_MIN_SEGMENT_SIZE, resume: bool = True,
+                                        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE, expected_md5: str = None,
+                                        max_rate: float = None, weight: float = 1, priority: int = 0,
+                                        content_id: str = None):
         fn = direct_link.rsplit('/', 1)[1]
-        resp = requests.get(direct_link, stream=True, allow_redirects=None)
-        if resp.status_code != 200:
-            raise GofileAPIException("Could not download file", code=resp.status_code)
-
         out_path = os.path.join(out_dir, fn)
-        with open(out_path, 'wb') as f:
-            for chunk in resp.iter_content(chunk_size=1024):
-                if chunk:
-                    f.write(chunk)
-        return out_path
+        request = partial(self._store_request, name="download", content_id=content_id)
+        with self.bandwidth.transfer(max_rate=max_rate, weight=weight, priority=priority) as transfer:
+            return download(
+                request, direct_link, out_path, segments=segments, min_segment_size=min_segment_size,
+                resume=resume, chunk_size=chunk_size, expected_md5=expected_md5, throttle=transfer.consume
+            )
 
 
     def _get_token(self, token):
@@ -132,10 +419,21 @@ class GofileClient (object):
                 token = ""
         return token
 
-    def upload(self, path: str=None, file: BufferedReader=None, parent_id: str=None, token: str=None) -> GofileFile:
-        if not file and not path:
+    def upload(self, path: str=None, file: BufferedReader | Iterable[bytes]=None, parent_id: str=None, token: str=None,
+               filename: str = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+               callback: Callable[[int, int], None] = None, verify_md5: bool = None,
+               max_rate: float = None, weight: float = 1, priority: int = 0) -> GofileFile:
+        """Uploads a file from path, a BufferedReader or any iterable of bytes (pipes, generators).
+          The request body is streamed `chunk_size` bytes at a time so memory use stays flat.
+          `callback(bytes_sent, total)` reports progress - total is None if the size is unknown.
+          If verify_md5 (defaults to client.verify_md5) the file is hashed while it is sent and
+          GofileIntegrityError is raised if it doesn't match the md5 returned by the api.
+          The upload is paced by client.bandwidth - `max_rate` caps it in bytes/sec, `weight` and `priority`
+          set its share of the global cap (see BandwidthScheduler)"""
+        if file is None and not path:
             raise ValueError("GofileClient.upload() requires a BufferedReader or file path")
 
+        server = self.server
         upload_url = self.get_best_upload_url()
         token = self._get_token(token)
         headers = {}
@@ -146,51 +444,239 @@ class GofileClient (object):
         if parent_id:
             data["folderId"] = parent_id
 
-        files = {}
-        if file:
-            files["file"] = file
-        elif path:
-            files["file"] = open(path, "rb")
+        if verify_md5 is None:
+            verify_md5 = self.verify_md5
 
-        resp = requests.post(upload_url, files=files, data=data, headers=headers)
+        body = MultipartEncoder(
+            data, file if file is not None else path, filename=filename,
+            chunk_size=chunk_size, callback=callback, hash_md5=verify_md5
+        )
+        headers["Content-Type"] = body.content_type
+
+        try:
+            with self.bandwidth.transfer(max_rate=max_rate, weight=weight, priority=priority) as transfer:
+                body.throttle = transfer.consume
+                resp = self._store_request(
+                    "POST", upload_url, data=body, headers=headers, name="upload", content_id=parent_id
+                )
+        finally:
+            body.close()
+        self._invalidate(parent_id)
         got = GofileClient.handle_response(resp)
+        self._invalidate(got.get("parentFolder"))
+
+        #resp.elapsed covers sending the body and the server's reply but not rate limit waits - our own
+        #bandwidth throttling happens while the body is sent so it is taken out too.  There is no selector if
+        #the server was set by hand on a lazy client
+        if self.server_selector is not None:
+            self.server_selector.record_upload(server, body.bytes_sent, resp.elapsed.total_seconds() - transfer.waited)
+            if self.probe_servers:
+                self.server = self.server_selector.best()
 
         #Needed because json returned from API has different key values at this endpoint
         got["id"] = got.get("id", None)
         got["name"] = got.get("name", None)
 
+        if verify_md5 and got.get("md5") and got["md5"] != body.md5:
+            raise GofileIntegrityError(
+                "Uploaded file is corrupt", got["md5"], body.md5, content_id=got["id"], path=path
+            )
+
         return  GofileFile._load_from_dict(got, client=self)
+
+    def upload_many(self, paths: Iterable[str], parent_id: str = None, max_workers: int = 4, token: str = None,
+                    **kwargs) -> GofileBatch:
+        """Uploads paths concurrently with a pool of `max_workers` threads.  Returns a GofileBatch
+          that yields GofileFiles as they finish - failed uploads are collected in batch.failed by path.
+          Keep max_workers <= pool_maxsize so every worker gets a pooled connection"""
+        batch = GofileBatch()
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            for path in paths:
+                batch._add_future(
+                    path, executor.submit(self.upload, path, parent_id=parent_id, token=token, **kwargs)
+                )
+        finally:
+            executor.shutdown(wait=False) #queued uploads keep running, batch yields them as they finish
+        return batch
     
 
-    def _get_content_raw_resp(self, content_id: str, token: str = None):
+    def _get_content_raw_resp(self, content_id: str, token: str = None, use_cache: bool = True):
+        """Returns (resp, data) - resp is None when data came from client.cache"""
         token = self._get_token(token)
+        if self.cache is not None and use_cache:
+            data = self.cache.get(content_id, token)
+            if data is not None:
+                return None, data
+
         headers = GofileClient.create_authorization_header(token)
 
-        resp = requests.get(self._API_ROUTE_GET_CONTENT_URL.format(content_id), headers=headers)
+        resp = self._request(
+            "GET", self._api_url(self._API_ROUTE_GET_CONTENT, content_id), headers=headers,
+            name="contents.get", content_id=content_id
+        )
         data = GofileClient.handle_response(resp)
+        if self.cache is not None:
+            self.cache.set(content_id, data, token)
         return resp, data
 
+    def _invalidate(self, *content_ids: str) -> None:
+        """Drops content_ids and their parent folders from client.cache"""
+        if self.cache is not None:
+            self.cache.invalidate(*content_ids)
 
-    def get(self, content_id: str, token: str = None):
-        resp,data = self._get_content_raw_resp(content_id, token=token)
-        return GofileContent.__init_from_resp__(resp, client=self)
+
+    def get(self, content_id: str, token: str = None, use_cache: bool = True):
+        """Retrieves content using content_id.  With use_cache=False client.cache is skipped (and refreshed)"""
+        resp,data = self._get_content_raw_resp(content_id, token=token, use_cache=use_cache)
+        return GofileContent.__init_from_resp__({"data": data}, client=self)
 
     def get_folder(self, *args, **kwargs):
         """Retrieves folder using content_id"""
         return self.get(*args, **kwargs)
 
-    def delete(self, *content_ids: str, token: str = None):
-        """Calls Gofile API to delete provided content_ids."""
-        token = self._get_token(token)
-        headers = GofileClient.create_authorization_header(token)
-        data = {"contentsId": ",".join(content_ids), "token": token}
-        resp = requests.delete(GofileClient._API_ROUTE_DELETE_CONTENT_URL, data=data, headers=headers)
-        got = GofileClient.handle_response(resp)
+    def reload_many(self, contents: Iterable[GofileContent], max_workers: int = 4, token: str = None) -> list:
+        """Reloads contents with one request per folder listing instead of one per content - files and unknown
+          contents are updated from their parent's listing (fetched once per parent), folders from their own.
+          Same result as calling reload() on each.  Listings are fetched concurrently by `max_workers` threads.
+          Returns the contents"""
+        contents = list(contents)
+        members = {} #listing content_id -> [(content, is listed in it)]
+        for content in contents:
+            if content.is_folder_type or not content.parent_id:
+                members.setdefault(content.content_id, []).append((content, False))
+            else:
+                members.setdefault(content.parent_id, []).append((content, True))
+
+        if not members:
+            return contents
+
+        def fetch(listing_id):
+            resp, data = self._get_content_raw_resp(listing_id, token=token)
+            return data
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(members))) as executor:
+            listings = dict(zip(members, executor.map(fetch, members)))
+
+        for listing_id, listed in members.items():
+            data = listings[listing_id]
+            for content, is_child in listed:
+                if not is_child:
+                    content._hydrate(data)
+                elif data.get("contents", {}).get(content.content_id):
+                    content._hydrate(data["contents"][content.content_id])
+
+        return contents
+
+    def walk(self, content_id: str = None, max_workers: int = 4, max_depth: int = None,
+             predicate: Callable[[GofileFolder], bool] = None, onerror: Callable[[Exception], None] = None,
+             token: str = None) -> Iterator[tuple]:
+        """os.walk() for a folder tree, starting at content_id (defaults to the account's root folder).
+          Yields (folder, subfolders, files) as each folder's listing arrives - listings are fetched
+          concurrently by `max_workers` threads, so folders come out in no particular order.
+
+          Subfolders deeper than `max_depth` (the start folder is depth 0) aren't fetched.  Subfolders
+          for which `predicate(folder)` is False are left out of subfolders and not descended into, removing
+          folders from the yielded subfolders list prunes them the same way.  A listing that fails to load
+          raises, or is passed to `onerror` and skipped"""
+        content_id = content_id or self.account.root_id
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {executor.submit(self.get, content_id, token=token): 0}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    depth = pending.pop(future)
+                    try:
+                        folder = future.result()
+                    except Exception as e:
+                        if onerror is None:
+                            raise
+                        onerror(e)
+                        continue
+
+                    subfolders = [
+                        child for child in folder.children
+                        if child.is_folder_type and (predicate is None or predicate(child))
+                    ]
+                    files = [child for child in folder.children if child.is_file_type]
+                    yield folder, subfolders, files
+
+                    if max_depth is None or depth < max_depth:
+                        for subfolder in subfolders:
+                            pending[executor.submit(self.get, subfolder.content_id, token=token)] = depth + 1
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def delete(self, *content_ids: str, token: str = None, batch_size: int = DEFAULT_BATCH_SIZE,
+               max_workers: int = 4, raise_errors: bool = True) -> GofileBatch:
+        """Calls Gofile API to delete provided content_ids.  Ids are sent `batch_size` at a time by a pool of
+          `max_workers` threads.  Returns a GofileBatch keyed by content_id (see _run_batches for how failures
+          are isolated) - with raise_errors the first failure is raised once every batch has finished"""
+        def send(ids):
+            _token = self._get_token(token)
+            headers = GofileClient.create_authorization_header(_token)
+            data = {"contentsId": ",".join(ids), "token": _token}
+            resp = self._request(
+                "DELETE", self._api_url(GofileClient._API_ROUTE_DELETE_CONTENT), data=data, headers=headers,
+                name="contents.delete", content_id=ids[0] if len(ids) == 1 else None
+            )
+            self._invalidate(*ids)
+            got = GofileClient.handle_response(resp)
+
+            #a partly accepted batch is answered per content - {content_id: {"status": ...}}
+            return {
+                content_id: GofileAPIException.__init_from_data__(result, resp.status_code)
+                for content_id, result in (got or {}).items()
+                if isinstance(result, dict) and result.get("status", "ok") != "ok"
+            }
+
+        return self._run_batches(send, content_ids, batch_size, max_workers, raise_errors, bisect=True)
+
+    @staticmethod
+    def _run_batches(send: Callable[[list], dict], content_ids: Iterable[str], batch_size: int, max_workers: int,
+                     raise_errors: bool, bisect: bool = False) -> GofileBatch:
+        """Calls send(ids) for every batch_size slice of content_ids concurrently, blocking until all are done.
+          send may return {content_id: exception} for the ids of an accepted batch that failed.  A rejected batch
+          fails all of its ids - with bisect it is split in half and each half resent until the failing ids are
+          isolated, only for sends the api rejects without changing anything (delete)"""
+        def run(ids):
+            try:
+                failures = send(ids) or {}
+            except GofileAPIAuthenticationError as e:
+                return [(content_id, e) for content_id in ids]
+            except GofileAPIException as e:
+                if not bisect or len(ids) == 1:
+                    return [(content_id, e) for content_id in ids]
+                mid = len(ids) // 2
+                return run(ids[:mid]) + run(ids[mid:])
+            except Exception as e:
+                return [(content_id, e) for content_id in ids]
+            return [(content_id, failures.get(content_id)) for content_id in ids]
+
+        content_ids = list(dict.fromkeys(content_ids)) #drop duplicates, keep order
+        batches = [content_ids[i:i + batch_size] for i in range(0, len(content_ids), batch_size)]
+
+        batch = GofileBatch()
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+                for results in executor.map(run, batches):
+                    for content_id, error in results:
+                        if error is None:
+                            batch._add_result(content_id, True)
+                        else:
+                            batch._add_failure(content_id, error)
+        batch.wait()
+
+        if raise_errors:
+            batch.raise_for_failures()
+        return batch
 
     def _get_account_raw_resp(self, token: str = None):
         token = self._get_token(token)
         headers = GofileClient.create_authorization_header(token) 
-        resp = requests.get(GofileClient._API_ROUTE_GET_ACCOUNT_ID_URL, headers=headers)
+        resp = self._request("GET", self._api_url(GofileClient._API_ROUTE_GET_ACCOUNT_ID), headers=headers, name="accounts.getid")
         data = GofileClient.handle_response(resp)
         return resp, data
 
@@ -204,7 +690,7 @@ class GofileClient (object):
           \If token is default self.account is updated"""
         token = self._get_token(token)
         resp, data = self._get_account_raw_resp(token=token)
-        account = GofileAccount._load_from_account_id(data["id"], token)
+        account = GofileAccount._load_from_account_id(data["id"], token, client=self)
         account._client = self
         account._raw = data
 
@@ -215,42 +701,83 @@ class GofileClient (object):
 
     def set_content_option(self, content_id: str, option: str, value, token: str = None):
         """Sets content option like 'description', 'public', etc (more at gofile.io/api).  Note that folder and file content have different options"""
+        value = ContentOption._process_option_value(option, value) #checks file types and formats for api
+        self._put_content_option(content_id, option, value, token=token)
+
+    def _put_content_option(self, content_id: str, option: str, value, token: str = None) -> None:
+        """Sends an already processed option value"""
         token = self._get_token(token)
         headers = self.create_authorization_header(token)
 
-        value = ContentOption._process_option_value(option, value) #checks file types and formats for api
-
         data = {
             "attribute": option,
             "attributeValue": value
         }
 
-        resp = requests.put(GofileClient._API_ROUTE_SET_OPTION_URL.format(content_id), data=data, headers=headers)
+        resp = self._request(
+            "PUT", self._api_url(GofileClient._API_ROUTE_SET_OPTION, content_id), data=data, headers=headers,
+            name="contents.update", content_id=content_id
+        )
+        self._invalidate(content_id)
         got = GofileClient.handle_response(resp)
 
-
-    def copy_content(self, *content_ids: str, parent_id: str = None, token: str = None):
-        """Copy provided content_ids to destination folder's content_id.  Currently returns None because api doesn't return any information.  Will have to query parent folder"""
+    def set_options_many(self, options: dict, max_workers: int = 4, token: str = None) -> GofileBatch:
+        """Sets options on many contents - `options` maps content_id to {option: value}.  Every value is checked
+          before anything is sent (ValueError lists all invalid ones).  One PUT per option is sent by a pool of
+          `max_workers` threads, contents aren't reloaded.  Returns a GofileBatch keyed by (content_id, option)
+          that yields the values sent"""
+        processed, errors = [], []
+        for content_id, content_options in options.items():
+            for option, value in content_options.items():
+                try:
+                    processed.append((content_id, option, ContentOption._process_option_value(option, value)))
+                except KeyError:
+                    errors.append("{} '{}': unknown option".format(content_id, option))
+                except ValueError as e:
+                    errors.append("{} '{}': {}".format(content_id, option, e))
+
+        if errors:
+            raise ValueError("Invalid content options - " + "; ".join(errors))
+
+        def put(content_id, option, value):
+            self._put_content_option(content_id, option, value, token=token)
+            return value
+
+        batch = GofileBatch()
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            for content_id, option, value in processed:
+                batch._add_future((content_id, option), executor.submit(put, content_id, option, value))
+        finally:
+            executor.shutdown(wait=False)
+        return batch
+
+
+    def copy_content(self, *content_ids: str, parent_id: str = None, token: str = None,
+                     batch_size: int = DEFAULT_BATCH_SIZE, max_workers: int = 4, raise_errors: bool = True) -> GofileBatch:
+        """Copy provided content_ids to destination folder's content_id.  Batched like delete() - returns a
+          GofileBatch keyed by content_id, a failed batch isn't resent (the api may have copied part of it) so all of
+          its ids are reported failed.  The api doesn't return the new contents, query the parent folder for them"""
         if not parent_id:
             raise ValueError("Must pass a parent folder id: parent_id=None")
 
-        token = self._get_token(token)
-        headers = self.create_authorization_header(token)
-        data = {
-            "contentsId": ",".join(content_ids),
-            "folderId": parent_id,
-            "token": token
-        }
+        def send(ids):
+            _token = self._get_token(token)
+            headers = self.create_authorization_header(_token)
+            data = {
+                "contentsId": ",".join(ids),
+                "folderId": parent_id,
+                "token": _token
+            }
 
-        resp = requests.post(GofileClient._API_ROUTE_COPY_CONTENT_URL, data=data, headers=headers)
-        got = GofileClient.handle_response(resp)
-        
-        """
-        As of right now /copyContent does not return information about newly created content
-        For this reason copy_content will just return None
+            resp = self._request(
+                "POST", self._api_url(GofileClient._API_ROUTE_COPY_CONTENT), data=data, headers=headers,
+                name="contents.copy", content_id=parent_id
+            )
+            self._invalidate(parent_id)
+            got = GofileClient.handle_response(resp)
 
-        return GofileContent.__init_from_resp__(resp, client=self)
-        """
+        return self._run_batches(send, content_ids, batch_size, max_workers, raise_errors)
 
     def create_folder(self, name: str, parent_id: str, token: str = None):
         """Creates folder in specified parent folder's content_id"""
@@ -262,12 +789,21 @@ class GofileClient (object):
             "folderName": name
         }
 
-        resp = requests.post(GofileClient._API_ROUTE_CREATE_FOLDER_URL, data=data, headers=headers)
+        resp = self._request(
+            "POST", self._api_url(GofileClient._API_ROUTE_CREATE_FOLDER), data=data, headers=headers,
+            name="contents.createFolder", content_id=parent_id
+        )
+        self._invalidate(parent_id)
         got = GofileClient.handle_response(resp)
 
-        return GofileContent.__init_from_resp__(resp, client=self) 
+        return GofileContent.__init_from_resp__({"data": got}, client=self)
 
 class GofileAccount (object):
+    __slots__ = (
+        "token", "email", "tier", "root_id", "folder_cnt", "file_cnt", "total_size", "total_download_cnt",
+        "_raw", "_client"
+    )
+
     token: str
     """Token of account, found on Gofile.io"""
     email: str
@@ -295,6 +831,7 @@ class GofileAccount (object):
         self.total_size = None
         self.total_download_cnt = None
         self._raw = {}
+        self._client = None
 
     def _override_from_dict(self, data: dict) -> None:
         self.token = data.get("token", self.token)
@@ -309,12 +846,20 @@ class GofileAccount (object):
         self._raw = data
 
     @staticmethod
-    def _load_from_account_id(account_id: str, token: str):
+    def _load_from_account_id(account_id: str, token: str, client: GofileClient = None):
         headers = GofileClient.create_authorization_header(token) 
-        resp = requests.get(
-            GofileClient._API_ROUTE_GET_ACCOUNT_URL.format(account_id),
-            headers=headers
-        )
+        if client:
+            resp = client._request(
+                "GET",
+                client._api_url(GofileClient._API_ROUTE_GET_ACCOUNT, account_id),
+                headers=headers,
+                name="accounts.get"
+            )
+        else:
+            resp = GofileClient.get_default_session().get(
+                GofileClient._BASE_API_URL + GofileClient._API_ROUTE_GET_ACCOUNT.format(account_id),
+                headers=headers
+            )
         data = GofileClient.handle_response(resp)
         return GofileAccount._load_from_dict(data)
 
@@ -339,25 +884,29 @@ class GofileContent (object):
     """Content_id of parent folder"""
     _type: str
     """GofileContent subtypes, either 'file', 'folder' or 'unknown'."""
-    is_file_type: bool
-    """If GofileContent is a file"""
-    is_folder_type: bool
-    """If GofileContent is a folder"""
-    is_unknown_type: bool
-    """If GofileContent is unknown (call reload() to update)"""
     is_deleted: bool
     """If content is deleted (will only register if called by it's own method delete())"""
 
+    #every subclass attribute is declared here (subclasses add none) so reload() can switch an instance's
+    #__class__ between GofileContent, GofileFile and GofileFolder
+    __slots__ = (
+        "content_id", "parent_id", "_type", "_client", "_raw_data", "_guest_token", "name", "time_created",
+        "is_deleted",
+        #GofileFile
+        "size", "download_cnt", "mimetype", "server", "page_link", "md5", "direct_links",
+        #GofileFolder
+        "children", "children_ids", "total_size", "total_download_cnt", "tags", "is_public", "is_owner",
+        "is_root", "description", "has_password", "code"
+    )
+
     def __init__(self, content_id: str, parent_id: str, _type: str = None, client: GofileClient = None):
         self.content_id = content_id
         self.parent_id = parent_id
         self._type = _type
         self._client = client
         self._raw = {}
+        self._guest_token = None
 
-        self.is_file_type = _type == "file"
-        self.is_folder_type = _type == "folder"
-        self.is_unknown_type = _type == None
         self.name = None
         self.time_created = None
         self.is_deleted = False
@@ -369,10 +918,41 @@ class GofileContent (object):
 
         return "<Gofile {}: content_id={} name={}>".format(_type.upper(), self.content_id, self.name)
 
+    @property
+    def is_file_type(self) -> bool:
+        """If GofileContent is a file"""
+        return self._type == "file"
+
+    @property
+    def is_folder_type(self) -> bool:
+        """If GofileContent is a folder"""
+        return self._type == "folder"
+
+    @property
+    def is_unknown_type(self) -> bool:
+        """If GofileContent is unknown (call reload() to update)"""
+        return self._type == None
+
+    @property
+    def _raw(self) -> dict:
+        """Api data the content was built from - rebuilt from attributes if the client doesn't retain it"""
+        if self._raw_data is None:
+            return {key: value for key, value in self._to_dict().items() if value is not None}
+        return self._raw_data
+
+    @_raw.setter
+    def _raw(self, data: dict) -> None:
+        if self._client is None or self._client.retain_raw:
+            self._raw_data = data
+        else:
+            self._raw_data = None
+
+    def _to_dict(self) -> dict:
+        return {"id": self.content_id, "parentFolder": self.parent_id, "name": self.name}
+
     def delete (self) -> None:
         """Deletes itself.  When called successfully is_deleted = True"""
-        guest_token = self._raw.get("guestToken")
-        self._client.delete(self.content_id, token=guest_token)
+        self._client.delete(self.content_id, token=self._guest_token)
         self.is_deleted = True
 
     def copy_to (self, dest_id: str) -> None:
@@ -392,50 +972,49 @@ class GofileContent (object):
         """Reloads any new updates to content.  If is_unknown_type must call reload() before fully usable"""
         if self.is_folder_type or (self.is_unknown_type and self.parent_id == None):
             resp, data = self._client._get_content_raw_resp(self.content_id)
-
-            if self.is_unknown_type:
-                content = GofileContent.__init_from_resp__(resp, client=self._client)
-
-            elif self.is_folder_type:
-                self._override_from_dict(data)
-                return self
+            self._hydrate(data)
+            return self
         
         elif (self.is_unknown_type or self.is_file_type) and self.parent_id:
             resp, data = self._client._get_content_raw_resp(self.parent_id)
             content_data = data["contents"].get(self.content_id, None)
 
             if content_data:
-                if self.is_unknown_type:
-                    #re-init instance as sub class (GofileFile or GofileFolder) of GofileContent
-                    match content_data['type']:
-                        case "folder":
-                            self.__class__ = GofileFolder
-                            self.__init__(
-                                content_data["name"], content_data["id"],
-                                content_data["parentFolder"], client=self._client
-                            )
-                        
-                        case "file":
-                            self.__class__ = GofileFile
-                            self.__init__(
-                                content_data["id"], content_data["parentFolder"],
-                                client=self._client
-                            )
-
-                        case _:
-                            raise TypeError("Type '{}' is not a valid option".format(content_data['type']))
-
-                self._override_from_dict(content_data)
+                self._hydrate(content_data)
 
             return self 
 
         else:
             raise NotImplemented
 
+    def _hydrate (self, data: dict) -> None:
+        """Updates content from api data.  Unknown contents are re-initialized as GofileFile or GofileFolder"""
+        if self.is_unknown_type:
+            #re-init instance as sub class (GofileFile or GofileFolder) of GofileContent
+            match data['type']:
+                case "folder":
+                    self.__class__ = GofileFolder
+                    self.__init__(
+                        data["name"], data["id"],
+                        data.get("parentFolder", self.parent_id), client=self._client
+                    )
+                
+                case "file":
+                    self.__class__ = GofileFile
+                    self.__init__(
+                        data["id"], data.get("parentFolder", self.parent_id),
+                        client=self._client
+                    )
+
+                case _:
+                    raise TypeError("Type '{}' is not a valid option".format(data['type']))
+
+        self._override_from_dict(data)
+
     @staticmethod
     def __init_from_resp__ (resp: requests.Response, _type: str = None, client: GofileClient = None):
         if type(resp) == requests.models.Response:
-            resp = resp.json()
+            resp = decode_response(resp)
             
         got = resp["data"] 
         _type = got.get("type", _type)
@@ -452,6 +1031,10 @@ class GofileContent (object):
 
 
 class GofileFileDirectLink (object):
+    __slots__ = (
+        "direct_link_id", "link", "expire", "ips_allowed", "domains_allowed", "username", "password", "file", "_raw"
+    )
+
     direct_link_id: str
     """Direct link id - used to modify direct link"""
     expire: int
@@ -474,6 +1057,7 @@ class GofileFileDirectLink (object):
         self.username = username
         self.password = password
         self.file = file
+        self._raw = {}
 
     @classmethod
     def _load_from_dict (cls, data: dict, file=None):
@@ -494,7 +1078,14 @@ class GofileFileDirectLink (object):
 
         return link
 
+    @property
+    def is_expired(self) -> bool:
+        """If the link has expired (or is about to)"""
+        return link_expired({"expireTime": self.expire})
+
 class GofileFile (GofileContent):
+    __slots__ = ()
+
     time_created: int
     """Time that file was uploaded"""
     size: int
@@ -535,14 +1126,28 @@ class GofileFile (GofileContent):
         self.mimetype = data.get("mimetype", self.mimetype)
         self.md5 = data.get("md5", self.md5)
         self.server = data.get("serverChoosen", None)
-        direct_links = data.get("directLinks", [])
-        for link_data in direct_links:
-            GofileFileDirectLink._load_from_dict(link_data, file=self)
+        if "directLinks" in data:
+            direct_links = data["directLinks"] or []
+            if isinstance(direct_links, dict): #api returns links keyed by their id
+                direct_links = direct_links.values()
+            links = {}
+            for link_data in direct_links:
+                link = GofileFileDirectLink._load_from_dict(link_data, file=self)
+                links[link.direct_link_id] = link
+            self.direct_links = list(links.values())
 
         self.page_link = data.get("downloadPage", self.page_link) 
+        self._guest_token = data.get("guestToken", self._guest_token)
 
         self._raw = data
 
+    def _to_dict(self) -> dict:
+        return {
+            "id": self.content_id, "type": "file", "parentFolder": self.parent_id, "name": self.name,
+            "createTime": self.time_created, "size": self.size, "downloadCount": self.download_cnt,
+            "mimetype": self.mimetype, "md5": self.md5, "serverChoosen": self.server, "downloadPage": self.page_link
+        }
+
     @staticmethod
     def _load_from_dict(data: dict, client: GofileClient = None):
         file = GofileFile(data["id"], data["parentFolder"], client=client)
@@ -555,23 +1160,125 @@ class GofileFile (GofileContent):
         self.direct_links.append(data)
         return data
 
-    def download(self, out_dir: str = "./") -> str:
-        """Downloads file to passed dir (default is working directory). Note: The option directLink
-          \needs to be True (Premium)"""
+    def _usable_direct_link(self) -> GofileFileDirectLink:
+        for link in self.direct_links:
+            if not link.is_expired and not link.username:
+                return link
+        return None
+
+    def get_direct_link(self, create: bool = True, **kwargs) -> GofileFileDirectLink:
+        """First unexpired direct link that doesn't need auth - from self.direct_links, then client.link_registry.
+          If there isn't one and create, one is made with create_direct_link(**kwargs) (Premium)"""
+        link = self._usable_direct_link()
+        if link is None and self._client.link_registry is not None:
+            known = {link.direct_link_id for link in self.direct_links}
+            for data in self._client.link_registry.get(self.content_id):
+                if data["id"] not in known:
+                    self.direct_links.append(GofileFileDirectLink._load_from_dict(data, file=self))
+            link = self._usable_direct_link()
+
+        if link is None and create:
+            link = self.create_direct_link(**kwargs)
+        return link
+
+    def download(self, out_dir: str = "./", segments: int = 1, min_segment_size: int = DEFAULT_MIN_SEGMENT_SIZE,
+                 resume: bool = True, chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE, verify_md5: bool = None,
+                 max_rate: float = None, weight: float = 1, priority: int = 0) -> str:
+        """Downloads file to passed dir (default is working directory) through get_direct_link() - an existing
+          link is reused, otherwise one is created (Premium).  With segments > 1 up to that many byte ranges (each at least
+          min_segment_size bytes) are downloaded concurrently - falls back to a single stream if the
+          server doesn't support Range requests.  Data is written to a '.part' file first - if resume and
+          a previous attempt was interrupted only the missing bytes are downloaded.  Each connection reads
+          into one reusable buffer of chunk_size bytes.  If verify_md5 (defaults to client.verify_md5) the
+          downloaded bytes are checked against self.md5, raising GofileIntegrityError on mismatch.
+          `max_rate`, `weight` and `priority` set the download's share of client.bandwidth"""
+
+        if verify_md5 is None:
+            verify_md5 = self._client.verify_md5
+
+        link = self.get_direct_link()
+        return self._client._download_file_from_direct_link(
+            link.link, out_dir=out_dir, segments=segments, min_segment_size=min_segment_size,
+            resume=resume, chunk_size=chunk_size, expected_md5=self.md5 if verify_md5 else None,
+            max_rate=max_rate, weight=weight, priority=priority, content_id=self.content_id
+        )
+
+
 
-        if self.direct_links:
-            return self._client._download_file_from_direct_link(self.direct_links[0].link, out_dir=out_dir)
 
-        else:
-            raise Exception("Direct link needed - set option directLink=True (only for premium users)") 
 
+class GofileChildren (Sequence):
+    """Read only sequence of a folder's children backed by the folder's api data.  Child objects are built
+      the first time they are accessed (and then kept), so loading a large folder doesn't pay for children
+      that are never used.  Supports len(), indexing, iteration and lookup by content_id"""
 
+    def __init__(self, data: dict, client: GofileClient = None):
+        self._contents = data.get("contents") or {}
+        if self._contents:
+            self._ids = list(self._contents)
+        else:
+            self._ids = list(data.get("childs") or [])
+        self._parent_id = data.get("id")
+        self._client = client
+        self._built = {}
+        self._retain = client is None or client.retain_raw
+
+    def __repr__ (self) -> str:
+        return "<GofileChildren len={} built={}>".format(len(self._ids), len(self._built))
+
+    def __len__ (self) -> int:
+        return len(self._ids)
+
+    def __getitem__ (self, index):
+        if isinstance(index, slice):
+            return [self._build(content_id) for content_id in self._ids[index]]
+        return self._build(self._ids[index])
+
+    def __iter__ (self):
+        for content_id in self._ids:
+            yield self._build(content_id)
+
+    def __contains__ (self, item) -> bool:
+        """Checks for a content_id or a content object"""
+        if isinstance(item, str):
+            return item in self._contents or item in self._ids
+        return any(child is item for child in self._built.values())
+
+    def __eq__ (self, other) -> bool:
+        if isinstance(other, (list, GofileChildren)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def ids(self) -> list:
+        """Content ids of every child, in order - builds nothing"""
+        return list(self._ids)
+
+    def get(self, content_id: str, default=None) -> GofileContent:
+        """Child with content_id, or default if the folder doesn't contain it"""
+        if content_id not in self._contents and content_id not in self._ids:
+            return default
+        return self._build(content_id)
+
+    def _build(self, content_id: str) -> GofileContent:
+        child = self._built.get(content_id)
+        if child is None:
+            content = self._contents.get(content_id)
+            if content:
+                child = GofileContent.__init_from_resp__({"data": content}, client=self._client)
+            else:
+                child = GofileContent(content_id, parent_id=self._parent_id, client=self._client)
+            child = self._built.setdefault(content_id, child) #another thread may have built it first
 
+            if not self._retain and len(self._built) == len(self._ids):
+                self._contents = {} #every child is built, the listing isn't needed anymore
+        return child
 
 
 class GofileFolder (GofileContent):
-    children: list[GofileContent]
-    """Children of folder, either GofileFolder or GofileFile type"""
+    __slots__ = ()
+
+    children: GofileChildren
+    """Children of folder, either GofileFolder or GofileFile type - built when first accessed"""
     children_ids: list[str]
     """List of childrens' content ids"""
     time_created: int
@@ -596,7 +1303,7 @@ class GofileFolder (GofileContent):
     def __init__(self, name: str, content_id: str, parent_id: str, client: GofileClient = None):
         super().__init__(content_id, parent_id, _type="folder", client=client)
         self.name = name
-        self.children = []
+        self.children = GofileChildren({}, client=client)
         self.children_ids = []
         self.total_size = None
         self.total_download_cnt = None
@@ -609,22 +1316,9 @@ class GofileFolder (GofileContent):
         self.has_password = None
         self.code = None
 
-    def __init_children_from_contents__(self, data: dict) -> None:
-        children = []
-
+    def __init_children_from_contents__(self, data: dict) -> GofileChildren:
         self.children_ids = data.get("childs")
-        contents = data.get("contents", {})
-
-        if contents.keys():
-            for content in contents.values():
-                child = GofileContent.__init_from_resp__({"data": content}, client=self._client)
-                children.append(child)
-
-        elif self.children_ids:
-            for child_id in self.children_ids:
-                child = GofileContent(child_id, parent_id=data["id"], client=self._client)
-                children.append(child)
-        return children
+        return GofileChildren(data, client=self._client)
 
 
     def _override_from_dict(self, data: dict) -> None:
@@ -647,10 +1341,19 @@ class GofileFolder (GofileContent):
         if self.tags[0] == "":
             self.tags = []
 
-
+        self._guest_token = data.get("guestToken", self._guest_token)
 
         self._raw = data
 
+    def _to_dict(self) -> dict:
+        return {
+            "id": self.content_id, "type": "folder", "parentFolder": self.parent_id, "name": self.name,
+            "createTime": self.time_created, "public": self.is_public, "isOwner": self.is_owner,
+            "isRoot": self.is_root, "password": self.has_password, "description": self.description,
+            "code": self.code, "totalSize": self.total_size, "totalDownloadCount": self.total_download_cnt,
+            "childs": self.children_ids, "tags": ",".join(self.tags)
+        }
+
 
     @staticmethod
     def _load_from_dict(data: dict, client: GofileClient = None) -> GofileFolder:
@@ -661,6 +1364,84 @@ class GofileFolder (GofileContent):
 
         return folder
 
-    def upload(self, path: str = None, file: BufferedReader = None) -> GofileFile:
-        return self._client.upload(file=file, path=path, parent_id=self.content_id)
+    def walk(self, max_workers: int = 4, max_depth: int = None, predicate: Callable[[GofileFolder], bool] = None,
+             onerror: Callable[[Exception], None] = None) -> Iterator[tuple]:
+        """Walks this folder's tree with GofileClient.walk() - yields (folder, subfolders, files).
+          Each folder (this one included) is loaded with GofileClient.get()"""
+        return self._client.walk(
+            self.content_id, max_workers=max_workers, max_depth=max_depth, predicate=predicate, onerror=onerror
+        )
+
+    def create_direct_links(self, recursive: bool = False, max_workers: int = 4, **kwargs) -> GofileBatch:
+        """GofileClient.create_direct_links() for the files in this folder (with recursive, every file below it)"""
+        if recursive:
+            files = [file for _, _, files in self.walk(max_workers=max_workers) for file in files]
+        else:
+            files = [child for child in self.children if child.is_file_type]
+        return self._client.create_direct_links(files, max_workers=max_workers, **kwargs)
+
+    def reload_children(self, max_workers: int = 4) -> list:
+        """Reloads every child with GofileClient.reload_many() - unknown children become GofileFiles or
+          GofileFolders.  Returns self.children"""
+        return self._client.reload_many(self.children, max_workers=max_workers)
+
+    def upload(self, path: str = None, file: BufferedReader | Iterable[bytes] = None, **kwargs) -> GofileFile:
+        """Uploads file into this folder - extra kwargs are passed to GofileClient.upload()"""
+        return self._client.upload(file=file, path=path, parent_id=self.content_id, **kwargs)
+
+    def sync(self, local_dir: str, dry_run: bool = False, **kwargs):
+        """Makes this folder mirror local_dir, uploading only new or changed files - see gofilepy.sync.FolderSync
+          for kwargs.  Returns the SyncPlan that was (or with dry_run, would be) applied"""
+        return FolderSync(self._client, local_dir, self.content_id, **kwargs).run(dry_run=dry_run)
+
+    def download(self, out_dir: str = "./", max_workers: int = 4, **kwargs) -> DownloadReport:
+        """Downloads this folder and everything below it into out_dir/<folder name>, `max_workers` files at a
+          time - see gofilepy.folder_download.FolderDownload for kwargs.  Files that already match locally are
+          skipped.  Returns a DownloadReport with per path results and the aggregate throughput"""
+        local_dir = os.path.join(out_dir, check_name(self.name))
+        return FolderDownload(self._client, self.content_id, local_dir, max_workers=max_workers, **kwargs).run()
+
+    def upload_dir(self, local_dir: str, max_workers: int = 4, **kwargs) -> GofileBatch:
+        """Recursively uploads local_dir into this folder, creating (or reusing) remote subfolders with the
+          same names.  Files are uploaded concurrently while the folder tree is being created.  Returns a
+          GofileBatch keyed by local path - folders that fail to be created are recorded there and skipped"""
+        batch = GofileBatch()
+        remote_ids = {os.path.abspath(local_dir): self.content_id}
+        listings = {self.content_id: self._client.get(self.content_id)}
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            for dirpath, dirnames, filenames in os.walk(local_dir):
+                dirpath = os.path.abspath(dirpath)
+                parent_id = remote_ids[dirpath]
+
+                for fn in filenames:
+                    path = os.path.join(dirpath, fn)
+                    batch._add_future(
+                        path, executor.submit(self._client.upload, path, parent_id=parent_id, **kwargs)
+                    )
+
+                existing = {
+                    child.name: child for child in listings[parent_id].children if child.is_folder_type
+                }
+                created = []
+                for dn in dirnames:
+                    path = os.path.join(dirpath, dn)
+                    try:
+                        if dn in existing:
+                            folder = self._client.get(existing[dn].content_id)
+                        else:
+                            folder = self._client.create_folder(dn, parent_id)
+                    except Exception as e:
+                        batch._add_failure(path, e)
+                        continue
+
+                    remote_ids[path] = folder.content_id
+                    listings[folder.content_id] = folder
+                    created.append(dn)
+
+                dirnames[:] = created #don't descend into folders that couldn't be created
+        finally:
+            executor.shutdown(wait=False)
+        return batch
 
@@ -0,0 +1,74 @@
+import json
+import os
+import threading
+import time
+
+#on-disk registry of direct links so separate processes/runs reuse links instead of creating new ones
+
+DEFAULT_LINKS_PATH = os.path.join(os.path.expanduser("~"), ".cache", "gofilepy", "direct_links.json")
+DEFAULT_EXPIRY_MARGIN = 60
+
+
+def link_expired(data: dict, margin: float = DEFAULT_EXPIRY_MARGIN) -> bool:
+    """If the api direct link data expires within `margin` seconds (an expireTime of 0 never expires)"""
+    expire = data.get("expireTime")
+    return bool(expire) and expire - margin <= time.time()
+
+
+class DirectLinkRegistry (object):
+    """Direct link api data keyed by content id, kept in memory and saved as json at `path`.  Expired links
+      are dropped when read, the others are reused by GofileFile.get_direct_link() across clients and runs.
+      Read and write errors are ignored - the registry only saves requests"""
+
+    def __init__(self, path: str = DEFAULT_LINKS_PATH):
+        self.path = path
+        self._links = None #content_id -> {link_id: data}, loaded on first use
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if self._links is None:
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            self._links = data if isinstance(data, dict) else {}
+        return self._links
+
+    def get(self, content_id: str) -> list:
+        """Unexpired link data registered for content_id"""
+        with self._lock:
+            links = self._load().get(content_id) or {}
+            return [data for data in links.values() if not link_expired(data)]
+
+    def add(self, content_id: str, data: dict, save: bool = True) -> None:
+        with self._lock:
+            self._load().setdefault(content_id, {})[data["id"]] = data
+        if save:
+            self.save()
+
+    def remove(self, content_id: str, save: bool = True) -> None:
+        with self._lock:
+            self._load().pop(content_id, None)
+        if save:
+            self.save()
+
+    def save(self) -> None:
+        """Writes every unexpired link to path"""
+        with self._lock:
+            links = self._load()
+            for content_id in list(links):
+                links[content_id] = {
+                    link_id: data for link_id, data in links[content_id].items() if not link_expired(data, margin=0)
+                }
+                if not links[content_id]:
+                    del links[content_id]
+
+            tmp_path = "{}.{}.tmp".format(self.path, os.getpid())
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(tmp_path, "w") as f:
+                    json.dump(links, f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                pass
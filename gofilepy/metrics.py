@@ -0,0 +1,236 @@
+import bisect
+import threading
+
+#request level instrumentation - GofileClient builds a RequestEvent for every api and transfer request and
+#hands it to the hooks registered on client.metrics.  MetricsAggregator keeps per endpoint counters and
+#latency histograms in memory, MetricsExporter is the base for forwarding events to other metrics systems
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+"""Upper bounds (seconds) of the latency histogram buckets"""
+
+
+class RequestEvent (object):
+    """One request made by a GofileClient, passed to hooks once it has finished (streamed responses once
+      their body has been read and the response closed)"""
+    __slots__ = (
+        "name", "endpoint", "method", "url", "content_id", "status", "api_status", "latency", "elapsed", "wait",
+        "retries", "bytes_sent", "bytes_received", "error"
+    )
+
+    name: str
+    """Operation, e.g. "contents.get", "upload", "download" (the endpoint class if the caller didn't name it)"""
+    endpoint: str
+    """Endpoint class - scheduler.METADATA or scheduler.STORE"""
+    method: str
+    url: str
+    content_id: str
+    """Content the request is about (the parent folder for uploads), None if not tied to one"""
+    status: int
+    """Http status of the last attempt, None if no response was received"""
+    api_status: str
+    """"status" field of the api response ("ok", "error-notFound", ...), None for non json responses"""
+    latency: float
+    """Seconds from the first attempt until the response was complete - includes rate limit waits, retries,
+      connecting and reading the body"""
+    elapsed: float
+    """Seconds between sending the last attempt and parsing its response headers (network + server time)"""
+    wait: float
+    """Seconds spent waiting on the rate limit"""
+    retries: int
+    bytes_sent: int
+    """Request body bytes (0 if the size wasn't known)"""
+    bytes_received: int
+    """Response body bytes (Content-Length for streamed responses)"""
+    error: str
+    """Name of the exception that ended the request, None if a response was received"""
+
+    def __init__(self, name: str, endpoint: str, method: str, url: str, content_id: str = None):
+        self.name = name
+        self.endpoint = endpoint
+        self.method = method
+        self.url = url
+        self.content_id = content_id
+        self.status = None
+        self.api_status = None
+        self.latency = 0.0
+        self.elapsed = 0.0
+        self.wait = 0.0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.error = None
+
+    @property
+    def ok(self) -> bool:
+        """If a 2xx response was received and the api (if it answered with json) reported "ok" """
+        return (
+            self.error is None and self.status is not None and 200 <= self.status < 300
+            and self.api_status in (None, "ok")
+        )
+
+    def to_dict(self) -> dict:
+        return {attr: getattr(self, attr) for attr in self.__slots__}
+
+    def __repr__ (self) -> str:
+        return "<RequestEvent {} {} status={} api_status={} latency={:.3f}>".format(
+            self.name, self.content_id, self.status, self.api_status, self.latency
+        )
+
+
+class Metrics (object):
+    """Hooks called with every RequestEvent of a client (client.metrics).  A hook is any callable taking the
+      event - exceptions it raises are counted in hook_errors and otherwise ignored.  No events are built
+      while there are no hooks.  A MetricsAggregator registered as a hook keeps per endpoint counters and
+      latency histograms"""
+
+    def __init__(self, hooks: list = None):
+        self.hooks = list(hooks or [])
+        self.hook_errors = 0
+
+    @property
+    def active(self) -> bool:
+        return bool(self.hooks)
+
+    def add_hook(self, hook):
+        """Registers hook and returns it"""
+        self.hooks = self.hooks + [hook] #copied so emit() never sees a list being changed
+        return hook
+
+    def remove_hook(self, hook) -> None:
+        self.hooks = [h for h in self.hooks if h is not hook]
+
+    def emit(self, event: RequestEvent) -> None:
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception:
+                self.hook_errors += 1
+
+
+class MetricsExporter (object):
+    """Base class for hooks that forward events to a metrics system - subclasses implement export().
+      Register an instance with client.metrics.add_hook()"""
+
+    def __call__ (self, event: RequestEvent) -> None:
+        self.export(event)
+
+    def export(self, event: RequestEvent) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flushes anything buffered - called by the owner when it is done with the exporter"""
+        pass
+
+
+class Histogram (object):
+    """Counts of observations per bucket (`buckets` are inclusive upper bounds, plus one overflow bucket)"""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate of the q quantile (0-1), interpolated inside the bucket it falls in"""
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                low = self.buckets[i - 1] if i else min(self.min, self.buckets[0])
+                high = self.buckets[i] if i < len(self.buckets) else self.max
+                low, high = max(low, self.min), min(high, self.max)
+                return low + (high - low) * (rank - seen) / n
+            seen += n
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count, "sum": self.sum, "min": self.min, "max": self.max, "mean": self.mean,
+            "p50": self.quantile(0.5), "p90": self.quantile(0.9), "p99": self.quantile(0.99),
+            "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts))
+        }
+
+
+class EndpointStats (object):
+    """Counters and latency histograms of one endpoint name"""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.wait = 0.0
+        self.statuses = {}
+        """Map of http status (or exception name) to count"""
+        self.api_statuses = {}
+        self.latency = Histogram(buckets)
+        self.elapsed = Histogram(buckets)
+
+    def add(self, event: RequestEvent) -> None:
+        self.requests += 1
+        self.errors += not event.ok
+        self.retries += event.retries
+        self.bytes_sent += event.bytes_sent
+        self.bytes_received += event.bytes_received
+        self.wait += event.wait
+
+        status = event.error if event.status is None else event.status
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if event.api_status is not None:
+            self.api_statuses[event.api_status] = self.api_statuses.get(event.api_status, 0) + 1
+
+        self.latency.observe(event.latency)
+        if event.status is not None:
+            self.elapsed.observe(event.elapsed)
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests, "errors": self.errors, "retries": self.retries,
+            "bytes_sent": self.bytes_sent, "bytes_received": self.bytes_received, "wait": self.wait,
+            "statuses": dict(self.statuses), "api_statuses": dict(self.api_statuses),
+            "latency": self.latency.to_dict(), "elapsed": self.elapsed.to_dict()
+        }
+
+
+class MetricsAggregator (MetricsExporter):
+    """In-memory EndpointStats keyed by event name"""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.endpoints = {}
+        """Map of event name to EndpointStats"""
+        self._lock = threading.Lock()
+
+    def export(self, event: RequestEvent) -> None:
+        with self._lock:
+            stats = self.endpoints.get(event.name)
+            if stats is None:
+                stats = self.endpoints[event.name] = EndpointStats(self.buckets)
+            stats.add(event)
+
+    def snapshot(self) -> dict:
+        """Map of event name to its counters and histograms as plain dicts"""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self.endpoints.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.endpoints = {}
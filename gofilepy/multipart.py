@@ -0,0 +1,153 @@
+import hashlib
+import os
+import stat
+import uuid
+from typing import Callable, Iterator
+
+#streams multipart/form-data bodies so uploads use constant memory regardless of file size
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class MultipartEncoder (object):
+    """Iterable multipart/form-data body passed as `data=` to requests.  Form fields are sent first,
+      then the file is read and sent `chunk_size` bytes at a time.
+
+      `file` can be a path, a binary file object (BufferedReader, etc.), bytes or any iterable of bytes
+      (pipes, generators).  `callback(bytes_sent, total)` is called after every chunk of the file is handed
+      to the connection - total is None when the size of the file can't be known ahead of time.
+
+      With hash_md5 the md5 of the file is computed as it is sent (read `md5` once the body has been sent).
+      `throttle(n)` is called before every chunk of n file bytes is handed over and may block to pace the
+      upload (Transfer.consume)"""
+
+    def __init__(self, fields: dict, file, filename: str = None, field_name: str = "file",
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, callback: Callable[[int, int], None] = None,
+                 file_content_type: str = "application/octet-stream", hash_md5: bool = False,
+                 throttle: Callable[[int], None] = None):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be greater than 0 - got {}".format(chunk_size))
+
+        self.boundary = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.callback = callback
+        self.throttle = throttle
+        self.bytes_sent = 0
+        self._hasher = hashlib.md5() if hash_md5 else None
+
+        self._owns_file = False
+        if isinstance(file, (str, os.PathLike)):
+            filename = filename or os.path.basename(file)
+            file = open(file, "rb")
+            self._owns_file = True
+
+        elif not filename:
+            name = getattr(file, "name", None)
+            filename = os.path.basename(name) if isinstance(name, str) else "file"
+
+        self.file = file
+        self.filename = filename
+        self.file_size = self._get_file_size(file)
+
+        self._preamble = self._encode_fields(fields) + self._encode_file_header(field_name, filename, file_content_type)
+        self._epilogue = "\r\n--{}--\r\n".format(self.boundary).encode()
+
+    @property
+    def content_type(self) -> str:
+        return "multipart/form-data; boundary={}".format(self.boundary)
+
+    @property
+    def md5(self) -> str:
+        """Hex md5 of the file bytes sent so far, None if hash_md5 wasn't set"""
+        if self._hasher:
+            return self._hasher.hexdigest()
+        return None
+
+    @property
+    def len(self) -> int:
+        """Total body length, None if file size is unknown (requests falls back to chunked transfer encoding)"""
+        if self.file_size is None:
+            return None
+        return len(self._preamble) + self.file_size + len(self._epilogue)
+
+    @staticmethod
+    def _get_file_size(file) -> int:
+        if isinstance(file, (bytes, bytearray, memoryview)):
+            return len(file)
+
+        if hasattr(file, "fileno"):
+            try:
+                st = os.fstat(file.fileno())
+            except (OSError, ValueError):
+                return None
+
+            #pipes and sockets report a size of 0
+            if not stat.S_ISREG(st.st_mode):
+                return None
+
+            try:
+                return st.st_size - file.tell()
+            except (OSError, ValueError):
+                return None
+
+        return None
+
+    def _encode_fields(self, fields: dict) -> bytes:
+        parts = []
+        for name, value in fields.items():
+            parts.append(
+                "--{}\r\nContent-Disposition: form-data; name=\"{}\"\r\n\r\n{}\r\n".format(self.boundary, name, value)
+            )
+        return "".join(parts).encode()
+
+    def _encode_file_header(self, field_name: str, filename: str, content_type: str) -> bytes:
+        filename = filename.replace("\\", "\\\\").replace('"', '\\"')
+        return (
+            "--{}\r\nContent-Disposition: form-data; name=\"{}\"; filename=\"{}\"\r\nContent-Type: {}\r\n\r\n"
+            .format(self.boundary, field_name, filename, content_type).encode()
+        )
+
+    def _iter_file(self) -> Iterator[bytes]:
+        file = self.file
+
+        if isinstance(file, (bytes, bytearray, memoryview)):
+            view = memoryview(file)
+            for i in range(0, len(view), self.chunk_size):
+                yield view[i:i+self.chunk_size]
+
+        elif hasattr(file, "read"):
+            read = file.read
+            while True:
+                chunk = read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+        else:
+            for chunk in file:
+                if chunk:
+                    yield chunk
+
+    def __iter__(self) -> Iterator[bytes]:
+        try:
+            yield self._preamble
+
+            for chunk in self._iter_file():
+                if self.throttle:
+                    self.throttle(len(chunk))
+                if self._hasher:
+                    self._hasher.update(chunk)
+                yield chunk
+                self.bytes_sent += len(chunk)
+                if self.callback:
+                    self.callback(self.bytes_sent, self.file_size)
+
+            yield self._epilogue
+
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Closes the file if it was opened by the encoder (passed as a path)"""
+        if self._owns_file:
+            self.file.close()
@@ -0,0 +1,196 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable
+import requests
+
+#every request made by GofileClient goes through a RequestScheduler - per endpoint class rate limits,
+#retries with jittered exponential backoff for idempotent calls and counters for both
+
+METADATA = "metadata"
+"""Endpoint class of api.gofile.io calls"""
+STORE = "store"
+"""Endpoint class of store server calls (uploads, downloads, probes)"""
+
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "PUT", "DELETE", "OPTIONS"])
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 30
+
+
+class TokenBucket (object):
+    """Allows `rate` acquisitions per second with bursts of up to `capacity`.  acquire() blocks until a token
+      is available.  A rate of None (or 0) never blocks"""
+
+    def __init__(self, rate: float = None, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate or 1, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Takes tokens, waiting as long as needed.  Returns the seconds waited"""
+        waited = 0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                delay = self._paused_until - now
+                if delay <= 0:
+                    if not self.rate:
+                        return waited
+
+                    self._refill(now)
+                    if self._tokens >= min(tokens, self.capacity):
+                        self._tokens -= tokens #may go negative for requests larger than capacity
+                        return waited
+                    delay = (min(tokens, self.capacity) - self._tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def set_rate(self, rate: float, capacity: float = None) -> None:
+        """Changes the rate (and capacity) - tokens already saved up are kept, up to the new capacity"""
+        with self._lock:
+            now = time.monotonic()
+            if self.rate:
+                self._refill(now)
+            self._updated = now
+            self.rate = rate
+            self.capacity = capacity or max(rate or 1, 1)
+            self._tokens = min(self._tokens, self.capacity)
+
+    def pause(self, seconds: float) -> None:
+        """Blocks every acquire() for the next `seconds` (e.g. after the server asked to slow down)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class RequestScheduler (object):
+    """Sends requests through per endpoint class TokenBuckets and retries failed idempotent requests.
+
+      `limits` maps an endpoint class (METADATA, STORE) to a requests/sec rate or a (rate, burst) tuple, classes
+      without a limit aren't throttled.  Connection errors and RETRY_STATUSES responses to IDEMPOTENT_METHODS are
+      retried up to `max_retries` times, waiting a random time up to backoff_base * 2 ** attempt (capped at
+      backoff_max) - or the Retry-After the server sent.  A 429 also pauses the whole endpoint class for that
+      long.  Retry-After is capped at `retry_after_max` (default backoff_max) - a response asking for longer is
+      returned to the caller instead of being waited for.  Non idempotent requests (uploads, folder creation) are never retried since their bodies may
+      already have been consumed"""
+
+    def __init__(self, limits: dict = None, max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE, backoff_max: float = DEFAULT_BACKOFF_MAX,
+                 retry_after_max: float = None):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = backoff_max if retry_after_max is None else retry_after_max
+        self.buckets = {}
+        """Map of endpoint class to its TokenBucket"""
+        self._counters = {}
+        self._lock = threading.Lock()
+
+        for endpoint, limit in (limits or {}).items():
+            self.set_limit(endpoint, limit)
+
+    def set_limit(self, endpoint: str, limit) -> None:
+        """Sets endpoint's rate (requests/sec) or (rate, burst) tuple, None removes the limit"""
+        rate, burst = limit if isinstance(limit, tuple) else (limit, None)
+        with self._lock:
+            self.buckets[endpoint] = TokenBucket(rate, burst)
+
+    def _bucket(self, endpoint: str) -> TokenBucket:
+        with self._lock:
+            bucket = self.buckets.get(endpoint)
+            if bucket is None:
+                bucket = self.buckets[endpoint] = TokenBucket()
+            return bucket
+
+    def _count(self, endpoint: str, counter: str, amount: float = 1) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(
+                endpoint, {"requests": 0, "retries": 0, "throttles": 0, "errors": 0, "wait": 0.0}
+            )
+            counters[counter] += amount
+
+    def stats(self) -> dict:
+        """Map of endpoint class to counters - requests sent, retries, throttles (429 responses), errors
+          (requests that failed after every retry) and wait (seconds spent waiting on the rate limit)"""
+        with self._lock:
+            return {endpoint: dict(counters) for endpoint, counters in self._counters.items()}
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter delay before retry number attempt (0 based)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def retry_after(resp: requests.Response) -> float:
+        """Seconds from the response's Retry-After header (delay or http date), None if missing"""
+        value = resp.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def request(self, send: Callable[..., requests.Response], method: str, url: str, endpoint: str = METADATA,
+                event=None, **kwargs) -> requests.Response:
+        """Sends send(method, url, **kwargs) when endpoint's rate limit allows it, retrying as described above.
+          Returns the last response - callers still check its status.  The retries and rate limit wait are
+          recorded on `event` (a metrics.RequestEvent) if passed"""
+        bucket = self._bucket(endpoint)
+        retryable = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+
+        while True:
+            waited = bucket.acquire()
+            if waited:
+                self._count(endpoint, "wait", waited)
+                if event is not None:
+                    event.wait += waited
+            self._count(endpoint, "requests")
+
+            try:
+                resp = send(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not retryable or attempt >= self.max_retries:
+                    self._count(endpoint, "errors")
+                    raise
+                delay = self.backoff(attempt)
+            else:
+                if resp.status_code not in RETRY_STATUSES:
+                    return resp
+
+                delay = self.retry_after(resp)
+                too_long = delay is not None and delay > self.retry_after_max
+                if too_long:
+                    delay = self.retry_after_max
+                if resp.status_code == 429:
+                    self._count(endpoint, "throttles")
+                    bucket.pause(delay if delay is not None else self.backoff(attempt))
+
+                if not retryable or too_long or attempt >= self.max_retries:
+                    self._count(endpoint, "errors")
+                    return resp
+
+                resp.close()
+                if delay is None:
+                    delay = self.backoff(attempt)
+
+            attempt += 1
+            self._count(endpoint, "retries")
+            if event is not None:
+                event.retries = attempt
+            time.sleep(delay)
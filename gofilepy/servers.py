@@ -0,0 +1,176 @@
+import json
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+#store server discovery - on-disk cache of /servers and latency/throughput based ranking
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "gofilepy", "servers.json")
+DEFAULT_SERVER_TTL = 3600
+DEFAULT_PROBE_INTERVAL = 300
+DEFAULT_PROBE_TIMEOUT = 3
+DEFAULT_REFERENCE_SIZE = 64 * 1024 * 1024
+
+
+class ServerCache (object):
+    """Caches the /servers list on disk for `ttl` seconds, keyed by api url.  Read and write errors are
+      ignored so an unwritable cache only costs the request it would have saved"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_SERVER_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, api_url: str) -> list:
+        """Cached servers for api_url, None if missing or older than ttl"""
+        with self._lock:
+            entry = self._read().get(api_url)
+
+        if not isinstance(entry, dict) or time.time() - entry.get("time", 0) > self.ttl:
+            return None
+        return entry.get("servers") or None
+
+    def set(self, api_url: str, servers: list) -> None:
+        """Stores servers for api_url and drops the expired entries of every api url"""
+        with self._lock:
+            now = time.time()
+            data = {
+                url: entry for url, entry in self._read().items()
+                if isinstance(entry, dict) and now - entry.get("time", 0) <= self.ttl
+            }
+            data[api_url] = {"time": now, "servers": servers}
+
+            tmp_path = "{}.{}.tmp".format(self.path, os.getpid())
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(tmp_path, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                pass
+
+
+class ServerSelector (object):
+    """Picks the store server used for uploads.
+
+      Without measurements the first server in `zone` is used (same as GofileClient.get_preferred_server).
+      probe() measures the round trip time to every server, record_upload() keeps a moving average of upload
+      throughput per server.  Servers are ranked by the estimated time to upload `reference_size` bytes -
+      rtt + reference_size / throughput - and unprobed servers rank after probed ones"""
+
+    def __init__(self, servers: list, zone: str = "na", reference_size: int = DEFAULT_REFERENCE_SIZE):
+        self.servers = servers
+        self.zone = zone
+        self.reference_size = reference_size
+        self.rtt = {}
+        """Map of server name to best probed round trip time (seconds)"""
+        self.throughput = {}
+        """Map of server name to moving average of upload throughput (bytes/sec)"""
+        self._lock = threading.Lock()
+        self._stop = None
+
+    def record_upload(self, server: str, size: int, seconds: float, alpha: float = 0.3) -> None:
+        """Adds an upload of size bytes that took seconds to the server's throughput average"""
+        if not server or seconds <= 0 or size <= 0:
+            return
+
+        rate = size / seconds
+        with self._lock:
+            prev = self.throughput.get(server)
+            self.throughput[server] = rate if prev is None else alpha * rate + (1 - alpha) * prev
+
+    def probe(self, request: Callable, url_for: Callable[[str], str], count: int = 2,
+              timeout: float = DEFAULT_PROBE_TIMEOUT) -> dict:
+        """Measures rtt to every server concurrently.  `request(method, url, **kwargs)` sends the probe and
+          `url_for(name)` gives the server's base url.  The fastest of `count` requests is kept (the first one
+          also pays for connecting).  Servers that fail to answer are dropped from self.rtt"""
+        def measure(name):
+            best = None
+            for _ in range(count):
+                start = time.perf_counter()
+                try:
+                    request("HEAD", url_for(name), timeout=timeout).close()
+                except Exception:
+                    return name, None
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            return name, best
+
+        names = [sv["name"] for sv in self.servers]
+        if not names:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(len(names), 16)) as executor:
+            results = dict(executor.map(measure, names))
+
+        with self._lock:
+            self.rtt = {name: rtt for name, rtt in results.items() if rtt is not None}
+        return dict(self.rtt)
+
+    def _zone_order(self) -> list:
+        names = [sv["name"] for sv in self.servers]
+        in_zone = [sv["name"] for sv in self.servers if sv.get("zone") == self.zone]
+        return in_zone + [name for name in names if name not in in_zone]
+
+    def rank(self) -> list:
+        """Server names from best to worst"""
+        order = self._zone_order()
+        with self._lock:
+            rtt = dict(self.rtt)
+            throughput = dict(self.throughput)
+
+        if not rtt and not throughput:
+            return order
+
+        #servers without an upload yet are estimated at the median throughput so they still get picked
+        typical = statistics.median(throughput.values()) if throughput else None
+
+        def score(name):
+            if name not in rtt and name not in throughput:
+                return (1, order.index(name))
+
+            estimate = rtt.get(name, 0)
+            rate = throughput.get(name, typical)
+            if rate:
+                estimate += self.reference_size / rate
+            return (0, estimate)
+
+        return sorted(order, key=score)
+
+    def best(self) -> str:
+        ranked = self.rank()
+        return ranked[0] if ranked else None
+
+    def start_background_refresh(self, refresh: Callable[[], None], interval: float = DEFAULT_PROBE_INTERVAL) -> None:
+        """Calls refresh() right away and then every interval seconds on a daemon thread until
+          stop_background_refresh() (interval <= 0 refreshes once)"""
+        self.stop_background_refresh()
+        stop = self._stop = threading.Event()
+
+        def loop():
+            while True:
+                try:
+                    refresh()
+                except Exception:
+                    pass #keep using the last ranking until the next refresh
+
+                if interval <= 0 or stop.wait(interval):
+                    return
+
+        threading.Thread(target=loop, daemon=True, name="gofilepy-server-refresh").start()
+
+    def stop_background_refresh(self) -> None:
+        if self._stop:
+            self._stop.set()
+            self._stop = None
@@ -0,0 +1,254 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .batch import GofileBatch
+from .download import _md5_file, DEFAULT_CHUNK_SIZE
+
+#one-way sync of a local directory into a gofile folder - only new or changed files are uploaded
+
+DEFAULT_MANIFEST_DIR = os.path.join(os.path.expanduser("~"), ".cache", "gofilepy", "sync")
+
+
+class SyncManifest (object):
+    """md5s of local files keyed by relative path, saved as json.  An entry is reused while the file's size
+      and mtime are unchanged, so unchanged files aren't rehashed on every sync"""
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.entries = {}
+        """Map of relative path to {"size", "mtime_ns", "md5"}"""
+        self._lock = threading.Lock()
+
+        if path:
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                self.entries = data if isinstance(data, dict) else {}
+            except (OSError, ValueError):
+                pass
+
+    def md5(self, relpath: str, path: str, stat: os.stat_result = None) -> str:
+        """md5 of the local file - from the manifest if size and mtime still match, hashed otherwise"""
+        stat = stat or os.stat(path)
+        with self._lock:
+            entry = self.entries.get(relpath)
+        if entry and entry.get("md5") and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return entry["md5"]
+
+        md5 = _md5_file(path, DEFAULT_CHUNK_SIZE)
+        self.set(relpath, stat, md5)
+        return md5
+
+    def set(self, relpath: str, stat: os.stat_result, md5: str) -> None:
+        with self._lock:
+            self.entries[relpath] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "md5": md5}
+
+    def prune(self, relpaths) -> None:
+        """Drops entries for files that no longer exist locally"""
+        relpaths = set(relpaths)
+        with self._lock:
+            for relpath in [r for r in self.entries if r not in relpaths]:
+                del self.entries[relpath]
+
+    def save(self) -> None:
+        if not self.path:
+            return
+
+        with self._lock:
+            data = dict(self.entries)
+
+        tmp_path = "{}.{}.tmp".format(self.path, os.getpid())
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+class SyncPlan (object):
+    """Changes needed to make a remote folder match a local directory.  Paths are relative and '/' separated"""
+    uploads: list
+    """Local files that don't exist remotely"""
+    updates: list
+    """Local files whose remote copy differs in size or md5 - uploaded, then the old copy is deleted"""
+    folders: list
+    """Remote folders to create, parents first"""
+    deletes: list
+    """Remote files and folders missing locally (only deleted with delete_extras)"""
+    unchanged: int
+    """Number of files that already match"""
+    batch: GofileBatch
+    """Results keyed by relative path once the plan has run (None for dry runs)"""
+
+    def __init__(self):
+        self.uploads = []
+        self.updates = []
+        self.folders = []
+        self.deletes = []
+        self.unchanged = 0
+        self.batch = None
+        self._local = {} #relpath -> (path, stat)
+        self._local_folders = set() #relpaths ending with '/'
+        self._remote_files = {} #relpath -> GofileFile
+        self._remote_folders = {} #relpath -> content_id
+
+    def __repr__ (self) -> str:
+        return "<SyncPlan uploads={} updates={} folders={} deletes={} unchanged={}>".format(
+            len(self.uploads), len(self.updates), len(self.folders), len(self.deletes), self.unchanged
+        )
+
+
+class FolderSync (object):
+    """Mirrors local_dir into the remote folder `folder_id`.
+
+      Remote files are matched by path and name: a file is unchanged if its size matches and (with use_md5,
+      when the api reports one) its md5 matches.  Local md5s are cached in a SyncManifest at `manifest_path`
+      (default is under ~/.cache/gofilepy/sync) and only computed for files whose size matches.  With
+      `delete_extras` remote contents that don't exist locally are deleted"""
+
+    def __init__(self, client, local_dir: str, folder_id: str, manifest_path: str = None, max_workers: int = 4,
+                 delete_extras: bool = False, use_md5: bool = True):
+        self.client = client
+        self.local_dir = os.path.abspath(local_dir)
+        self.folder_id = folder_id
+        self.max_workers = max_workers
+        self.delete_extras = delete_extras
+        self.use_md5 = use_md5
+
+        if manifest_path is None:
+            key = hashlib.sha1("{}\0{}".format(self.local_dir, folder_id).encode()).hexdigest()
+            manifest_path = os.path.join(DEFAULT_MANIFEST_DIR, key + ".json")
+        self.manifest = SyncManifest(manifest_path)
+
+    def _scan_local(self, plan: SyncPlan) -> None:
+        manifest_path = os.path.abspath(self.manifest.path) if self.manifest.path else None
+        for dirpath, dirnames, filenames in os.walk(self.local_dir):
+            dirnames.sort()
+            for dn in dirnames:
+                plan._local_folders.add(os.path.relpath(os.path.join(dirpath, dn), self.local_dir).replace(os.sep, "/") + "/")
+
+            for fn in sorted(filenames):
+                path = os.path.join(dirpath, fn)
+                if path == manifest_path:
+                    continue
+                relpath = os.path.relpath(path, self.local_dir).replace(os.sep, "/")
+                plan._local[relpath] = (path, os.stat(path))
+
+    def _scan_remote(self, plan: SyncPlan) -> None:
+        relpaths = {self.folder_id: ""}
+        for folder, subfolders, files in self.client.walk(self.folder_id, max_workers=self.max_workers):
+            base = relpaths[folder.content_id]
+            plan._remote_folders[base] = folder.content_id
+            for subfolder in subfolders:
+                relpaths[subfolder.content_id] = base + subfolder.name + "/"
+            for file in files:
+                plan._remote_files.setdefault(base + file.name, file)
+
+    def plan(self) -> SyncPlan:
+        """Compares the local and remote trees without changing either"""
+        plan = SyncPlan()
+        self._scan_local(plan)
+        self._scan_remote(plan)
+
+        folders = plan._local_folders
+        to_hash = []
+        for relpath, (path, stat) in plan._local.items():
+            remote = plan._remote_files.get(relpath)
+            if remote is None:
+                plan.uploads.append(relpath)
+            elif remote.size != stat.st_size:
+                plan.updates.append(relpath)
+            elif not self.use_md5 or not remote.md5:
+                plan.unchanged += 1
+            else:
+                to_hash.append(relpath)
+
+        #only files with a same sized remote copy are hashed (or looked up in the manifest)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            md5s = executor.map(lambda relpath: self.manifest.md5(relpath, *plan._local[relpath]), to_hash)
+            for relpath, md5 in zip(to_hash, md5s):
+                if md5 == plan._remote_files[relpath].md5:
+                    plan.unchanged += 1
+                else:
+                    plan.updates.append(relpath)
+
+        plan.folders = sorted((f for f in folders if f not in plan._remote_folders), key=lambda f: (f.count("/"), f))
+
+        #extras inside a deleted folder go with it
+        extra_folders = [f for f in plan._remote_folders if f and f not in folders]
+        extra_folders = [f for f in extra_folders if not any(f != o and f.startswith(o) for o in extra_folders)]
+        extra_files = [
+            f for f in plan._remote_files
+            if f not in plan._local and not any(f.startswith(o) for o in extra_folders)
+        ]
+        plan.deletes = sorted(extra_folders + extra_files)
+
+        self.manifest.prune(plan._local)
+        return plan
+
+    def run(self, dry_run: bool = False) -> SyncPlan:
+        """Plans and applies the sync, blocking until it finishes.  Uploads run on `max_workers` threads while
+          missing folders are created.  With dry_run nothing is changed remotely.  Returns the SyncPlan - per
+          path results and failures are in plan.batch"""
+        plan = self.plan()
+        if dry_run:
+            self.manifest.save()
+            return plan
+
+        plan.batch = batch = GofileBatch()
+        folder_ids = dict(plan._remote_folders)
+        pending = {} #parent relpath -> relpaths waiting for the folder to be created
+        for relpath in plan.uploads + plan.updates:
+            parent = relpath.rsplit("/", 1)[0] + "/" if "/" in relpath else ""
+            pending.setdefault(parent, []).append(relpath)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            def submit(parent):
+                for relpath in pending.pop(parent, []):
+                    batch._add_future(relpath, executor.submit(self._upload, plan, relpath, folder_ids[parent]))
+
+            for parent in list(pending):
+                if parent in folder_ids:
+                    submit(parent)
+
+            for folder in plan.folders:
+                parent = folder[:-1].rsplit("/", 1)[0] + "/" if folder.count("/") > 1 else ""
+                if parent not in folder_ids:
+                    continue #parent failed to be created, recorded already
+                try:
+                    created = self.client.create_folder(folder[:-1].rsplit("/", 1)[-1], folder_ids[parent])
+                except Exception as e:
+                    batch._add_failure(folder, e)
+                    continue
+                batch._add_result(folder, created)
+                folder_ids[folder] = created.content_id
+                submit(folder)
+
+            for relpaths in pending.values():
+                for relpath in relpaths:
+                    batch._add_failure(relpath, RuntimeError("Remote folder for {} couldn't be created".format(relpath)))
+
+            if self.delete_extras:
+                for relpath in plan.deletes:
+                    content_id = folder_ids.get(relpath) or plan._remote_files[relpath].content_id
+                    batch._add_future(relpath, executor.submit(self.client.delete, content_id))
+        finally:
+            executor.shutdown(wait=False)
+
+        batch.wait()
+        self.manifest.save()
+        return plan
+
+    def _upload(self, plan: SyncPlan, relpath: str, parent_id: str):
+        path, stat = plan._local[relpath]
+        file = self.client.upload(path, parent_id=parent_id)
+        if file.md5 and self.client.verify_md5: #upload() checked it against the local bytes
+            self.manifest.set(relpath, stat, file.md5)
+
+        old = plan._remote_files.get(relpath)
+        if old is not None:
+            self.client.delete(old.content_id)
+        return file
+
@@ -17,6 +17,10 @@ setuptools.setup(
     install_requires = [
         'requests'
     ],
+    extras_require = {
+        'async': ['aiohttp'],
+        'fast': ['orjson']
+    },
     classifiers = [
         'Programming Language :: Python :: 3',
         'Programming Language :: Python :: 3.10',
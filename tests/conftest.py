@@ -0,0 +1,29 @@
+import pytest
+from gofilepy import GofileClient
+from stand_in_server import StandInGofile, STAND_IN_TOKEN
+
+#every test module except the free/premium integration tests runs against a local stand-in api (stand_in_server.py)
+
+
+def stand_in_client(server, **kwargs) -> GofileClient:
+    """Client of the stand-in, the server cache is off unless server_cache_ttl is passed"""
+    kwargs.setdefault("token", STAND_IN_TOKEN)
+    kwargs.setdefault("server_cache_ttl", 0)
+    return GofileClient(api_url=server.url, store_url=server.url + "/{}", **kwargs)
+
+@pytest.fixture(scope="module")
+def server():
+    with StandInGofile() as server:
+        yield server
+
+@pytest.fixture(scope="module")
+def client(server):
+    return stand_in_client(server)
+
+@pytest.fixture
+def make_client(server, tmp_path):
+    """Factory of stand-in clients taking GofileClient kwargs, server caches are kept in tmp_path"""
+    def make(**kwargs):
+        kwargs.setdefault("server_cache_path", str(tmp_path / "servers.json"))
+        return stand_in_client(server, **kwargs)
+    return make
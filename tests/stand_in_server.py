@@ -0,0 +1,530 @@
+import argparse
+import hashlib
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+#local stand-in for the Gofile REST API used by tests and benchmarks - run this file to serve it on its own
+
+STAND_IN_TOKEN = "stand-in-token"
+
+
+class StandInHandler (BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" #keep-alive so pooled sessions can reuse connections
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.state.lock:
+            self.server.state.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload: dict, code: int = 200) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_ok(self, data: dict) -> None:
+        self._send_json({"status": "ok", "data": data})
+
+    def _send_error(self, status: str, code: int) -> None:
+        self._send_json({"status": status, "data": {}}, code=code)
+
+    def _route(self) -> list:
+        """Logs the request, applies the configured and per store server latency and returns the path split into
+          parts.  Returns None if an injected failure was sent instead"""
+        state = self.server.state
+        path = urlparse(self.path).path.rstrip("/").split("/")[1:]
+        state.request_log.append((self.command, "/" + "/".join(path)))
+
+        if state.latency:
+            time.sleep(state.latency)
+
+        if path and path[0] in state.server_latency:
+            time.sleep(state.server_latency[path[0]])
+
+        failure = state.take_failure(self.command, "/" + "/".join(path))
+        if failure:
+            code, retry_after = failure
+            body = json.dumps({"status": "error-rateLimit" if code == 429 else "error-server", "data": {}}).encode()
+            self._read_body()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if retry_after is not None:
+                self.send_header("Retry-After", str(retry_after))
+            self.end_headers()
+            self.wfile.write(body)
+            return None
+        return path
+
+    def do_HEAD(self):
+        path = self._route()
+        if path is None:
+            return
+        known = len(path) == 1 and path[0] in [sv["name"] for sv in self.server.state.servers]
+
+        self.send_response(200 if known else 404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _token(self) -> str:
+        auth = self.headers.get("Authorization", "")
+        return auth[len("Bearer "):] if auth.startswith("Bearer ") else ""
+
+    def _pace(self, transferred: int, start: float) -> None:
+        """Sleeps until `transferred` bytes since start fit the configured per connection bandwidth"""
+        bandwidth = self.server.state.bandwidth
+        if bandwidth:
+            delay = start + transferred / bandwidth - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    def _read(self, size: int) -> bytes:
+        if not self.server.state.bandwidth:
+            return self.rfile.read(size)
+
+        data = bytearray()
+        start = time.perf_counter()
+        while len(data) < size:
+            chunk = self.rfile.read(min(64 * 1024, size - len(data)))
+            if not chunk:
+                break
+            data += chunk
+            self._pace(len(data), start)
+        return bytes(data)
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            body = bytearray()
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return bytes(body)
+                body += self._read(size)
+                self.rfile.readline()
+
+        return self._read(int(self.headers.get("Content-Length", 0)))
+
+    def _read_form(self, multi: bool = False) -> dict:
+        form = parse_qs(self._read_body().decode())
+        if multi:
+            return form
+        return {k: v[0] for k, v in form.items()}
+
+    def _read_multipart(self) -> tuple:
+        """Returns (fields, filename, file bytes) of a multipart/form-data request"""
+        boundary = self.headers["Content-Type"].split("boundary=", 1)[1].encode()
+        fields, filename, payload = {}, None, b""
+
+        for part in self._read_body().split(b"--" + boundary)[1:-1]:
+            head, _, value = part[2:-2].partition(b"\r\n\r\n")
+            disposition = next(
+                line for line in head.decode().split("\r\n") if line.lower().startswith("content-disposition")
+            )
+            name = disposition.split('name="', 1)[1].split('"', 1)[0]
+
+            if 'filename="' in disposition:
+                filename = disposition.split('filename="', 1)[1].rsplit('"', 1)[0]
+                payload = value
+            else:
+                fields[name] = value.decode()
+
+        return fields, filename, payload
+
+    def do_POST(self):
+        state = self.server.state
+        path = self._route()
+        if path is None:
+            return
+
+        match path:
+            case [server, "uploadFile"]:
+                fields, filename, payload = self._read_multipart()
+                self._send_ok(state.add_file(fields.get("folderId"), filename, payload, token=self._token()))
+
+            case ["contents", "createFolder"]:
+                form = self._read_form()
+                if form.get("parentFolderId") not in state.contents:
+                    return self._send_error("error-notFound", 404)
+                self._send_ok(state.add_folder(form["parentFolderId"], form["folderName"]))
+
+            case ["contents", "copy"]:
+                form = self._read_form()
+                ids = form["contentsId"].split(",")
+                if form.get("folderId") not in state.contents or not all(i in state.contents for i in ids):
+                    return self._send_error("error-notFound", 404)
+                for content_id in ids:
+                    state.copy_content(content_id, form["folderId"])
+                self._send_ok({})
+
+            case ["contents", content_id, "directlinks"]:
+                form = self._read_form(multi=True)
+                if content_id not in state.contents:
+                    return self._send_error("error-notFound", 404)
+                self._send_ok(state.add_direct_link(
+                    content_id, self.server.url, expire=int(form.get("expireTime", [0])[0]),
+                    ips_allowed=form.get("sourceIpsAllowed", []), domains_allowed=form.get("domainsAllowed", []),
+                    auth=form.get("auth", [])
+                ))
+
+            case _:
+                self._read_body()
+                self._send_error("error-notFound", 404)
+
+    def do_PUT(self):
+        state = self.server.state
+        path = self._route()
+        if path is None:
+            return
+
+        match path:
+            case ["contents", content_id, "update"]:
+                form = self._read_form()
+                if content_id not in state.contents:
+                    return self._send_error("error-notFound", 404)
+                state.update_content(content_id, form["attribute"], form["attributeValue"])
+                self._send_ok({})
+
+            case _:
+                self._read_body()
+                self._send_error("error-notFound", 404)
+
+    def do_DELETE(self):
+        state = self.server.state
+        path = self._route()
+        if path is None:
+            return
+
+        match path:
+            case ["contents"]:
+                ids = self._read_form()["contentsId"].split(",")
+                if any(i in state.protected for i in ids):
+                    return self._send_error("error-owner", 403)
+                missing = [i for i in ids if i not in state.contents]
+                if missing and state.check_before_delete:
+                    return self._send_error("error-notFound", 404)
+                for content_id in ids:
+                    state.delete_content(content_id)
+                if missing:
+                    return self._send_ok({
+                        i: {"status": "error-notFound" if i in missing else "ok", "data": {}} for i in ids
+                    })
+                self._send_ok({})
+
+            case _:
+                self._read_body()
+                self._send_error("error-notFound", 404)
+
+    def _send_payload(self, payload: bytes) -> None:
+        start, end = 0, len(payload) - 1
+        code = 200
+
+        range_header = self.headers.get("Range")
+        if range_header and self.server.state.honor_range:
+            first, _, last = range_header.split("=", 1)[1].partition("-")
+            start, end = int(first), min(int(last) if last else end, end)
+            code = 206
+            if start >= len(payload):
+                self.send_response(416)
+                self.send_header("Content-Range", "bytes */{}".format(len(payload)))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        self.send_response(code)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        if code == 206 and self.server.state.range_total is not False:
+            total = "*" if self.server.state.range_total is None else len(payload)
+            self.send_header("Content-Range", "bytes {}-{}/{}".format(start, end, total))
+        self.end_headers()
+
+        view = memoryview(payload)[start:end+1]
+        fail_after = self.server.state.fail_after
+        if fail_after is not None:
+            #simulates a dropped connection part way through the body
+            self.wfile.write(view[:fail_after])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+
+        start = time.perf_counter()
+        for i in range(0, len(view), 64 * 1024):
+            self.wfile.write(view[i:i + 64 * 1024])
+            self._pace(min(i + 64 * 1024, len(view)), start)
+
+    def do_GET(self):
+        state = self.server.state
+        path = self._route()
+        if path is None:
+            return
+
+        match path:
+            case ["download", "direct", link_id, name]:
+                content_id = state.direct_links.get(link_id)
+                if content_id not in state.payloads:
+                    return self._send_error("error-notFound", 404)
+                state.download_requests.append((link_id, self.headers.get("Range")))
+                self._send_payload(state.payloads[content_id])
+
+            case ["servers"]:
+                self._send_ok({"servers": state.servers})
+
+            case ["accounts", "getid"]:
+                account = state.accounts.get(self._token())
+                if not account:
+                    return self._send_error("error-auth", 401)
+                self._send_ok({"id": account["id"]})
+
+            case ["accounts", account_id]:
+                account = state.accounts.get(self._token())
+                if not account or account["id"] != account_id:
+                    return self._send_error("error-auth", 401)
+                self._send_ok(account)
+
+            case ["contents", content_id]:
+                listing = state.get_listing(content_id)
+                if not listing:
+                    return self._send_error("error-notFound", 404)
+                self._send_ok(listing)
+
+            case _:
+                self._send_error("error-notFound", 404)
+
+
+class StandInState (object):
+    def __init__(self):
+        self.servers = [
+            {"name": "store1", "zone": "eu"},
+            {"name": "store2", "zone": "na"}
+        ]
+        self.accounts = {}
+        self.contents = {}
+        self.payloads = {}
+        self.direct_links = {}
+        self.download_requests = []
+        self.honor_range = True
+        self.range_total = True
+        """Content-Range of partial responses - True gives the size, None sends '*', False leaves the header out"""
+        self.fail_after = None
+        self.md5_override = None
+        self.protected = set()
+        """Content ids delete refuses with error-owner"""
+        self.check_before_delete = True
+        """False deletes the ids that exist and answers with per id results instead of rejecting the batch"""
+        self.server_latency = {}
+        self.latency = 0.0
+        """Seconds every request waits before it is answered"""
+        self.bandwidth = None
+        """Bytes/sec of each connection's upload and download bodies, None for unlimited"""
+        self.failures = [] #[method, path prefix, status, retry after] answered instead of matching requests
+        self.request_log = []
+        self.connections = 0
+        """Number of connections accepted"""
+        self.lock = threading.Lock()
+
+        self.add_account(STAND_IN_TOKEN)
+
+    def fail(self, method: str, path_prefix: str, status: int, count: int = 1, retry_after=None) -> None:
+        """Answers the next `count` requests matching method and path_prefix with status"""
+        with self.lock:
+            for _ in range(count):
+                self.failures.append((method, path_prefix, status, retry_after))
+
+    def take_failure(self, method: str, path: str) -> tuple:
+        with self.lock:
+            for i, (fail_method, prefix, status, retry_after) in enumerate(self.failures):
+                if fail_method == method and path.startswith(prefix):
+                    del self.failures[i]
+                    return status, retry_after
+        return None
+
+    def add_file(self, parent_id: str, name: str, payload: bytes, token: str = None) -> dict:
+        with self.lock:
+            guest_token = None
+            if not parent_id:
+                #guest upload - a new account and root folder are created for it
+                guest_token = token or uuid.uuid4().hex
+                account = self.accounts.get(guest_token) or self.add_account(guest_token, tier="guest")
+                parent_id = account["rootFolder"]
+
+            content_id = str(uuid.uuid4())
+            data = {
+                "id": content_id, "type": "file", "name": name, "parentFolder": parent_id,
+                "createTime": int(time.time()), "size": len(payload), "downloadCount": 0,
+                "md5": self.md5_override or hashlib.md5(payload).hexdigest(), "mimetype": "application/octet-stream",
+                "serverChoosen": self.servers[0]["name"], "downloadPage": "https://gofile.io/d/" + content_id
+            }
+            self.contents[content_id] = data
+            self.payloads[content_id] = payload
+            self.contents[parent_id]["childs"].append(content_id)
+
+            if guest_token:
+                return dict(data, guestToken=guest_token)
+            return data
+
+    def add_folder(self, parent_id: str, name: str) -> dict:
+        with self.lock:
+            content_id = str(uuid.uuid4())
+            data = {
+                "id": content_id, "type": "folder", "name": name, "parentFolder": parent_id,
+                "createTime": int(time.time()), "childs": [], "public": False, "isOwner": True,
+                "code": content_id[:6]
+            }
+            self.contents[content_id] = data
+            self.contents[parent_id]["childs"].append(content_id)
+            return dict(data)
+
+    def update_content(self, content_id: str, attribute: str, value: str) -> None:
+        with self.lock:
+            data = self.contents[content_id]
+            match attribute:
+                case "public":
+                    data["public"] = value == "true"
+                case "password":
+                    data["password"] = True
+                case "expiry":
+                    data["expire"] = int(value)
+                case _:
+                    data[attribute] = value
+
+    def delete_content(self, content_id: str) -> None:
+        with self.lock:
+            self._delete(content_id)
+
+    def _delete(self, content_id: str) -> None:
+        data = self.contents.pop(content_id, None)
+        if not data:
+            return
+        self.payloads.pop(content_id, None)
+        for child_id in data.get("childs", []):
+            self._delete(child_id)
+
+        parent = self.contents.get(data.get("parentFolder"))
+        if parent:
+            parent["childs"].remove(content_id)
+
+    def copy_content(self, content_id: str, parent_id: str) -> str:
+        with self.lock:
+            return self._copy(content_id, parent_id)
+
+    def _copy(self, content_id: str, parent_id: str) -> str:
+        data = self.contents[content_id]
+        copy_id = str(uuid.uuid4())
+        self.contents[copy_id] = dict(data, id=copy_id, parentFolder=parent_id, childs=[])
+        if content_id in self.payloads:
+            self.payloads[copy_id] = self.payloads[content_id]
+        self.contents[parent_id]["childs"].append(copy_id)
+
+        for child_id in data.get("childs", []):
+            self._copy(child_id, copy_id)
+        if data["type"] == "file":
+            self.contents[copy_id].pop("childs")
+        return copy_id
+
+    def add_direct_link(self, content_id: str, base_url: str, expire: int = 0, ips_allowed: list = [],
+                        domains_allowed: list = [], auth: list = []) -> dict:
+        with self.lock:
+            data = self.contents[content_id]
+            link_id = uuid.uuid4().hex
+            link = {
+                "id": link_id, "expireTime": expire or int(time.time()) + 86400,
+                "directLink": "{}/download/direct/{}/{}".format(base_url, link_id, data["name"]),
+                "sourceIpsAllowed": ips_allowed, "domainsAllowed": domains_allowed, "auth": auth,
+                "isReqLink": False
+            }
+            data.setdefault("directLinks", {})[link_id] = link
+            self.direct_links[link_id] = content_id
+            return link
+
+    def get_listing(self, content_id: str) -> dict:
+        """Folder data with its direct children under "contents" (children's own children are only ids)"""
+        with self.lock:
+            data = self.contents.get(content_id)
+            if not data or data["type"] != "folder":
+                return None
+
+            listing = dict(data, childs=list(data["childs"]))
+            listing["contents"] = {child_id: dict(self.contents[child_id]) for child_id in data["childs"]}
+            listing["totalSize"] = sum(c.get("size", 0) for c in listing["contents"].values())
+            return listing
+
+    def add_account(self, token: str, tier: str = "premium") -> dict:
+        root_id = str(uuid.uuid4())
+        self.contents[root_id] = {
+            "id": root_id, "type": "folder", "name": "root", "isRoot": True,
+            "createTime": 0, "childs": [], "public": False, "isOwner": True
+        }
+        account = {
+            "id": str(uuid.uuid4()), "token": token, "email": "stand-in@gofile.io",
+            "tier": tier, "rootFolder": root_id,
+            "statsCurrent": {"foldersCount": 0, "filesCount": 0, "storage": 0, "trafficWebDownloaded": 0}
+        }
+        self.accounts[token] = account
+        return account
+
+
+class StandInGofile (ThreadingHTTPServer):
+    """Serves the stand-in API on a background thread - use as a context manager"""
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), StandInHandler)
+        self.state = StandInState()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves the stand-in Gofile API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--bandwidth", type=float, default=None, help="bytes/sec per connection for bodies")
+    args = parser.parse_args()
+
+    server = StandInGofile(args.host, args.port)
+    server.state.latency = args.latency
+    server.state.bandwidth = args.bandwidth
+    print("serving {} - token {}".format(server.url, STAND_IN_TOKEN))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
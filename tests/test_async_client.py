@@ -0,0 +1,78 @@
+import asyncio
+import hashlib
+import os
+import pytest
+from gofilepy import GofileFile, GofileFolder
+
+pytest.importorskip("aiohttp")
+from gofilepy.aio import AsyncGofileClient
+from gofilepy.exceptions import GofileAPIAuthenticationError, GofileAPIContentNotFoundError
+from gofilepy.options import FolderOption
+from stand_in_server import STAND_IN_TOKEN
+
+#asyncio client
+
+
+def run(server, coro_func, token=STAND_IN_TOKEN, **kwargs):
+    async def main():
+        async with AsyncGofileClient(token=token, api_url=server.url, store_url=server.url + "/{}", **kwargs) as client:
+            return await coro_func(client)
+    return asyncio.run(main())
+
+def test_connect_and_account(server):
+    async def check(client):
+        assert client.server == "store2" #zone "na"
+        assert client.account.root_id in server.state.contents
+        return await client.get_account()
+
+    account = run(server, check)
+    assert account.token == STAND_IN_TOKEN
+    assert account.tier == "premium"
+
+def test_bad_token(server):
+    with pytest.raises(GofileAPIAuthenticationError):
+        run(server, lambda client: client.get_account(), token="bad-token")
+
+def test_folder_and_upload(server, tmp_path):
+    payload = os.urandom(200_000)
+    path = tmp_path / "async.bin"
+    path.write_bytes(payload)
+
+    async def check(client):
+        folder = await client.create_folder("async_folder", client.account.root_id)
+        assert isinstance(folder, GofileFolder)
+
+        f1 = await client.upload(str(path), parent_id=folder.content_id)
+        f2 = await client.upload(file=payload, filename="bytes.bin", parent_id=folder.content_id)
+
+        async def chunks():
+            for i in range(0, len(payload), 50_000):
+                yield payload[i:i+50_000]
+        f3 = await client.upload(file=chunks(), filename="gen.bin", parent_id=folder.content_id)
+
+        for f in (f1, f2, f3):
+            assert isinstance(f, GofileFile)
+            assert f.md5 == hashlib.md5(payload).hexdigest()
+
+        await client.set_content_option(folder.content_id, FolderOption.DESCRIPTION, "async")
+        await client.copy_content(f1.content_id, parent_id=folder.content_id)
+        link = await client.create_file_direct_link(f1.content_id, expire=2_000_000_000)
+        assert link.link.endswith("/async.bin")
+
+        folder = await client.get(folder.content_id)
+        assert folder.description == "async"
+        assert sorted(c.name for c in folder.children) == ["async.bin", "async.bin", "bytes.bin", "gen.bin"]
+
+        await client.delete(folder.content_id)
+        with pytest.raises(GofileAPIContentNotFoundError):
+            await client.get(folder.content_id)
+
+    run(server, check)
+
+def test_many_concurrent_metadata_requests(server):
+    async def check(client):
+        root_id = client.account.root_id
+        folders = await asyncio.gather(*(client.get(root_id) for _ in range(2000)))
+        assert all(f.content_id == root_id for f in folders)
+
+    run(server, check, limit=50)
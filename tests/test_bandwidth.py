@@ -0,0 +1,86 @@
+import threading
+import pytest
+import time
+from gofilepy.bandwidth import BandwidthScheduler
+
+#bandwidth sharing and throttled transfers
+
+
+def test_fair_share_allocation():
+    scheduler = BandwidthScheduler(1000)
+    a = scheduler.transfer()
+    assert a.rate == 1000
+
+    b = scheduler.transfer(weight=3)
+    assert (a.rate, b.rate) == (250, 750)
+
+    #a capped transfer gives what it can't use to the others
+    c = scheduler.transfer(max_rate=100)
+    assert c.rate == 100 and a.rate == 225 and b.rate == 675
+
+    b.close()
+    c.close()
+    assert a.rate == 1000 and scheduler.active == 1
+
+def test_priority_allocation():
+    scheduler = BandwidthScheduler(1000)
+    low = scheduler.transfer()
+    high = scheduler.transfer(priority=1, max_rate=600)
+    assert high.rate == 600 and low.rate == 400
+
+    higher = scheduler.transfer(priority=2)
+    assert higher.rate == 1000
+    assert low.rate == 10 and high.rate == 10 #never stalled completely
+
+def test_per_transfer_cap_without_global_rate():
+    scheduler = BandwidthScheduler()
+    assert scheduler.transfer().rate is None
+    assert scheduler.transfer(max_rate=500).rate == 500
+
+def test_upload_and_download_paced(server, tmp_path, make_client):
+    client = make_client()
+    folder_id = server.state.add_folder(client.account.root_id, "paced")["id"]
+    payload = b"p" * 200_000
+
+    start = time.perf_counter()
+    f = client.upload(file=payload, filename="paced.bin", parent_id=folder_id, chunk_size=16_384, max_rate=400_000)
+    assert time.perf_counter() - start >= 0.3
+
+    start = time.perf_counter()
+    f.download(str(tmp_path), max_rate=400_000, chunk_size=16_384)
+    assert time.perf_counter() - start >= 0.3
+    assert client.bandwidth.stats()["bytes"] == 400_000 and client.bandwidth.active == 0
+
+def test_global_cap_shared(server, tmp_path, make_client):
+    client = make_client(max_bandwidth=800_000)
+    folder_id = server.state.add_folder(client.account.root_id, "shared")["id"]
+    files = [
+        client.upload(file=bytes([i]) * 200_000, filename="{}.bin".format(i), parent_id=folder_id, chunk_size=16_384)
+        for i in range(3)
+    ]
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=f.download, args=(str(tmp_path),), kwargs={"chunk_size": 16_384}) for f in files]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    #600KB through an 800KB/s cap, less the initial bursts
+    assert time.perf_counter() - start >= 0.4
+    assert all((tmp_path / "{}.bin".format(i)).stat().st_size == 200_000 for i in range(3))
+
+def test_failed_upload_releases_transfer(make_client):
+    client = make_client(max_bandwidth=1_000_000)
+    for _ in range(3):
+        with pytest.raises(FileNotFoundError):
+            client.upload("/does/not/exist.bin")
+    assert client.bandwidth.active == 0
+
+def test_throttling_not_counted_as_server_throughput(server, make_client):
+    client = make_client()
+    folder_id = server.state.add_folder(client.account.root_id, "ranked")["id"]
+
+    client.upload(file=b"r" * 200_000, filename="r.bin", parent_id=folder_id, chunk_size=16_384, max_rate=400_000)
+    #the cap paced the upload to ~400KB/s, the loopback server itself is much faster
+    assert client.server_selector.throughput[client.server] > 2_000_000
@@ -0,0 +1,97 @@
+import pytest
+from gofilepy.exceptions import GofileAPIContentNotFoundError, GofileAPINotOwnerError
+
+#batched delete and copy
+
+
+def make_files(server, client, name: str, count: int) -> tuple:
+    folder_id = server.state.add_folder(client.account.root_id, name)["id"]
+    ids = [server.state.add_file(folder_id, "{}.bin".format(i), b"x")["id"] for i in range(count)]
+    return folder_id, ids
+
+def test_delete_in_batches(server, client):
+    folder_id, ids = make_files(server, client, "bulk-delete", 250)
+
+    server.state.request_log.clear()
+    batch = client.delete(*ids, batch_size=50, max_workers=4)
+
+    assert server.state.request_log.count(("DELETE", "/contents")) == 5
+    assert batch.ok and sorted(batch.succeeded) == sorted(ids)
+    assert server.state.contents[folder_id]["childs"] == []
+
+def test_delete_isolates_failing_ids(server, client):
+    folder_id, ids = make_files(server, client, "bulk-delete-partial", 40)
+    protected = [server.state.add_file(folder_id, "protected-{}.bin".format(i), b"x")["id"] for i in range(2)]
+    server.state.protected.update(protected)
+
+    try:
+        batch = client.delete(*(ids[:10] + protected[:1] + ids[10:] + protected[1:]), batch_size=16, raise_errors=False)
+    finally:
+        server.state.protected.clear()
+
+    assert sorted(batch.succeeded) == sorted(ids)
+    assert sorted(batch.failed) == sorted(protected)
+    assert all(isinstance(e, GofileAPINotOwnerError) for e in batch.failed.values())
+    assert server.state.contents[folder_id]["childs"] == protected
+
+def test_delete_missing_id_fails_in_any_batch(server, client):
+    folder_id, ids = make_files(server, client, "bulk-delete-missing", 8)
+
+    batch = client.delete(ids[0], "missing", raise_errors=False)
+    assert list(batch.succeeded) == [ids[0]]
+    assert list(batch.failed) == ["missing"]
+    assert isinstance(batch.failed["missing"], GofileAPIContentNotFoundError)
+
+    batch = client.delete(*(ids[1:5] + ["missing"] + ids[5:]), batch_size=16, raise_errors=False)
+    assert sorted(batch.succeeded) == sorted(ids[1:])
+    assert list(batch.failed) == ["missing"]
+    assert server.state.contents[folder_id]["childs"] == []
+
+def test_delete_partly_accepted_batch(server, client):
+    folder_id, ids = make_files(server, client, "bulk-delete-applied", 8)
+
+    #the api deletes the ids it has and reports the others per id
+    server.state.check_before_delete = False
+    server.state.request_log.clear()
+    try:
+        batch = client.delete(*(ids[:4] + ["missing"] + ids[4:]), batch_size=16, raise_errors=False)
+    finally:
+        server.state.check_before_delete = True
+
+    assert server.state.request_log.count(("DELETE", "/contents")) == 1
+    assert sorted(batch.succeeded) == sorted(ids)
+    assert list(batch.failed) == ["missing"]
+    assert isinstance(batch.failed["missing"], GofileAPIContentNotFoundError)
+    assert server.state.contents[folder_id]["childs"] == []
+
+def test_delete_raises_by_default(server, client):
+    folder_id, ids = make_files(server, client, "bulk-delete-raise", 3)
+    protected = server.state.add_file(folder_id, "protected.bin", b"x")["id"]
+    server.state.protected.add(protected)
+
+    try:
+        with pytest.raises(GofileAPINotOwnerError):
+            client.delete(*ids, protected)
+    finally:
+        server.state.protected.clear()
+
+    #the valid ids were still deleted
+    assert server.state.contents[folder_id]["childs"] == [protected]
+
+def test_delete_single_missing_id_fails(server, client):
+    with pytest.raises(GofileAPIContentNotFoundError):
+        client.delete("missing")
+
+def test_copy_reports_whole_failed_batch(server, client):
+    folder_id, ids = make_files(server, client, "bulk-copy", 30)
+    dest_id = server.state.add_folder(client.account.root_id, "bulk-copy-dest")["id"]
+
+    server.state.request_log.clear()
+    batch = client.copy_content(*(ids[:15] + ["missing"] + ids[15:]), parent_id=dest_id, batch_size=10, raise_errors=False)
+
+    #the failed batch isn't split and resent
+    assert server.state.request_log.count(("POST", "/contents/copy")) == 4
+    assert sorted(batch.succeeded) == sorted(ids[:10] + ids[19:])
+    assert sorted(batch.failed) == sorted(ids[10:15] + ["missing"] + ids[15:19])
+    assert all(isinstance(e, GofileAPIContentNotFoundError) for e in batch.failed.values())
+    assert len(server.state.contents[dest_id]["childs"]) == 21
@@ -0,0 +1,46 @@
+import pytest
+
+#bulk option updates
+
+
+def test_set_options_many(server, client):
+    folders = [server.state.add_folder(client.account.root_id, "opt-{}".format(i))["id"] for i in range(20)]
+    options = {
+        folder_id: {"public": True, "expiry": 1893456000.0, "tags": ["a", "b"]} for folder_id in folders
+    }
+
+    server.state.request_log.clear()
+    batch = client.set_options_many(options, max_workers=8).wait()
+
+    assert batch.ok and len(batch.succeeded) == 60
+    assert batch.succeeded[(folders[0], "tags")] == "a,b"
+    assert batch.succeeded[(folders[0], "expiry")] == 1893456000
+
+    for folder_id in folders:
+        data = server.state.contents[folder_id]
+        assert data["public"] is True and data["expire"] == 1893456000 and data["tags"] == "a,b"
+
+    #no reloads
+    assert all(method == "PUT" for method, _ in server.state.request_log)
+
+def test_set_options_many_validates_first(server, client):
+    folder_id = server.state.add_folder(client.account.root_id, "invalid")["id"]
+
+    server.state.request_log.clear()
+    with pytest.raises(ValueError) as e:
+        client.set_options_many({
+            folder_id: {"public": "yes", "description": "fine"},
+            "other": {"not-an-option": 1}
+        })
+
+    assert "public" in str(e.value) and "not-an-option" in str(e.value)
+    assert server.state.request_log == []
+
+def test_set_options_many_partial_failure(server, client):
+    folder_id = server.state.add_folder(client.account.root_id, "partial")["id"]
+
+    batch = client.set_options_many({folder_id: {"description": "ok"}, "missing": {"description": "nope"}}).wait()
+
+    assert list(batch.succeeded) == [(folder_id, "description")]
+    assert list(batch.failed) == [("missing", "description")]
+    assert server.state.contents[folder_id]["description"] == "ok"
@@ -0,0 +1,69 @@
+import os
+from gofilepy import GofileFile
+from gofilepy.exceptions import GofileAPIContentNotFoundError
+
+#concurrent bulk uploads
+
+
+def make_tree(root, files_per_dir=5):
+    paths = []
+    for rel in ("", "a", os.path.join("a", "b"), "c"):
+        os.makedirs(os.path.join(root, rel), exist_ok=True)
+        for i in range(files_per_dir):
+            path = os.path.join(root, rel, "file{}.txt".format(i))
+            with open(path, "wb") as f:
+                f.write(os.urandom(1000 + i))
+            paths.append(path)
+    return paths
+
+def test_upload_many(client, tmp_path):
+    paths = make_tree(str(tmp_path))
+    missing = str(tmp_path / "missing.txt")
+
+    batch = client.upload_many(paths + [missing], parent_id=client.account.root_id, max_workers=8)
+    files = list(batch)
+
+    assert len(files) == len(paths)
+    assert all(isinstance(f, GofileFile) for f in files)
+    assert set(batch.succeeded) == set(paths)
+    assert isinstance(batch.failed[missing], FileNotFoundError)
+    assert not batch.ok
+
+def test_upload_dir(client, tmp_path):
+    paths = make_tree(str(tmp_path))
+    folder = client.create_folder("upload_dir", client.account.root_id)
+
+    batch = folder.upload_dir(str(tmp_path), max_workers=4).wait()
+    assert batch.ok
+    assert set(batch.succeeded) == set(paths)
+
+    folder.reload()
+    assert sorted(c.name for c in folder.children if c.is_folder_type) == ["a", "c"]
+
+    a = client.get(next(c.content_id for c in folder.children if c.name == "a"))
+    b = client.get(next(c.content_id for c in a.children if c.name == "b"))
+    assert len([c for c in b.children if c.is_file_type]) == 5
+
+    #existing remote folders are reused on a second run
+    folder.upload_dir(str(tmp_path)).wait()
+    folder.reload()
+    assert sorted(c.name for c in folder.children if c.is_folder_type) == ["a", "c"]
+
+def test_upload_dir_failed_folder(client, tmp_path):
+    make_tree(str(tmp_path), files_per_dir=1)
+    folder = client.create_folder("upload_dir_fail", client.account.root_id)
+
+    create_folder = client.create_folder
+    def failing_create_folder(name, parent_id, **kwargs):
+        if name == "a":
+            raise GofileAPIContentNotFoundError("error-notFound")
+        return create_folder(name, parent_id, **kwargs)
+
+    client.create_folder = failing_create_folder
+    try:
+        batch = folder.upload_dir(str(tmp_path)).wait()
+    finally:
+        del client.create_folder
+
+    assert isinstance(batch.failed[os.path.join(str(tmp_path), "a")], GofileAPIContentNotFoundError)
+    assert len(batch.succeeded) == 2 #root file and c/file0.txt
@@ -0,0 +1,89 @@
+import time
+from gofilepy.cache import ContentCache
+
+#content metadata cache
+
+
+def content_gets(server, content_id):
+    return server.state.request_log.count(("GET", "/contents/" + content_id))
+
+def test_cache_disabled_by_default(server, make_client):
+    client = make_client()
+    assert client.cache is None
+
+    root_id = client.account.root_id
+    server.state.request_log.clear()
+    client.get(root_id)
+    client.get(root_id)
+    assert content_gets(server, root_id) == 2
+
+def test_get_hits_cache(server, make_client):
+    client = make_client(cache_size=16)
+    folder = server.state.add_folder(client.account.root_id, "hot")
+
+    server.state.request_log.clear()
+    for _ in range(5):
+        assert client.get(folder["id"]).name == "hot"
+
+    assert content_gets(server, folder["id"]) == 1
+    assert client.cache.stats()["hits"] == 4
+    assert client.cache.stats()["misses"] == 1
+
+    client.get(folder["id"], use_cache=False)
+    assert content_gets(server, folder["id"]) == 2
+
+def test_writes_invalidate_content_and_parent(make_client):
+    client = make_client(cache_size=16)
+    folder = client.create_folder("parent", client.account.root_id)
+    child = client.create_folder("child", folder.content_id)
+
+    assert client.get(folder.content_id).children_ids == [child.content_id]
+    client.get(child.content_id)
+
+    client.set_content_option(child.content_id, "description", "changed")
+    assert client.get(child.content_id).description == "changed"
+    assert client.get(folder.content_id).children[0].description == "changed"
+
+    uploaded = client.upload(file=b"data", filename="a.txt", parent_id=folder.content_id)
+    assert uploaded.content_id in client.get(folder.content_id).children_ids
+
+    client.delete(uploaded.content_id)
+    assert uploaded.content_id not in client.get(folder.content_id).children_ids
+
+    dest = client.create_folder("dest", client.account.root_id)
+    assert client.get(dest.content_id).children_ids == []
+    client.copy_content(child.content_id, parent_id=dest.content_id)
+    assert len(client.get(dest.content_id).children_ids) == 1
+
+    assert client.cache.stats()["invalidations"] >= 4
+
+def test_entries_expire():
+    cache = ContentCache(max_entries=4, ttl=0.05)
+    cache.set("a", {"id": "a"}, "token")
+    assert cache.get("a", "token") == {"id": "a"}
+
+    time.sleep(0.1)
+    assert cache.get("a", "token") is None
+    assert len(cache) == 0
+
+def test_lru_eviction_and_token_isolation():
+    cache = ContentCache(max_entries=2, ttl=60)
+    cache.set("a", {"id": "a"}, "token")
+    cache.set("b", {"id": "b"}, "token")
+    cache.get("a", "token")
+    cache.set("c", {"id": "c"}, "token")
+
+    assert cache.get("b", "token") is None
+    assert cache.get("a", "token") is not None
+    assert cache.stats()["evictions"] == 1
+
+    #entries are only served to the token that loaded them
+    assert cache.get("a", "other") is None
+
+def test_invalidate_finds_parent_through_listing():
+    cache = ContentCache(max_entries=8, ttl=60)
+    cache.set("folder", {"id": "folder", "childs": ["file"]})
+
+    assert cache.parent_of("file") == "folder"
+    cache.invalidate("file")
+    assert cache.get("folder") is None
@@ -0,0 +1,52 @@
+from gofilepy import GofileFolder, GofileFile, GofileContent
+
+#lazy folder children - no network needed
+
+
+def folder_data(entries: int, with_contents: bool = True) -> dict:
+    contents = {
+        "file-{}".format(i): {
+            "id": "file-{}".format(i), "type": "file", "name": "{}.bin".format(i), "parentFolder": "folder", "size": i
+        }
+        for i in range(entries)
+    }
+    data = {"id": "folder", "type": "folder", "name": "big", "childs": list(contents), "totalSize": 123}
+    if with_contents:
+        data["contents"] = contents
+    return data
+
+def test_children_built_on_access():
+    folder = GofileFolder._load_from_dict(folder_data(1000))
+
+    assert folder.total_size == 123
+    assert len(folder.children) == 1000
+    assert len(folder.children._built) == 0
+
+    child = folder.children[10]
+    assert type(child) == GofileFile and child.size == 10
+    assert folder.children[-1].name == "999.bin"
+    assert len(folder.children._built) == 2
+
+    #children are built once and kept
+    assert folder.children.get("file-10") is child
+    assert "file-10" in folder.children and child in folder.children
+    assert folder.children.get("missing") is None and "missing" not in folder.children
+
+def test_children_iteration_and_slicing():
+    folder = GofileFolder._load_from_dict(folder_data(50))
+
+    names = [child.name for child in folder.children]
+    assert names == ["{}.bin".format(i) for i in range(50)]
+    assert [c.size for c in folder.children[5:8]] == [5, 6, 7]
+    assert folder.children.ids() == folder.children_ids
+    assert list(folder.children) == folder.children[:]
+
+def test_children_without_contents_are_unknown():
+    folder = GofileFolder._load_from_dict(folder_data(3, with_contents=False))
+
+    assert len(folder.children) == 3
+    assert all(type(c) == GofileContent and c.is_unknown_type and c.parent_id == "folder" for c in folder.children)
+
+def test_empty_folder():
+    folder = GofileFolder._load_from_dict({"id": "empty", "type": "folder", "name": "empty"})
+    assert len(folder.children) == 0 and folder.children == []
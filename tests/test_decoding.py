@@ -0,0 +1,53 @@
+import json
+import pytest
+import requests
+from gofilepy import decoding
+from gofilepy.exceptions import GofileAPIContentNotFoundError
+
+#responses are decoded exactly once, with the selected backend
+
+
+@pytest.fixture
+def decodes():
+    calls = []
+    def counting(body):
+        calls.append(body)
+        return json.loads(body)
+
+    decoding.BACKENDS["counting"] = counting
+    decoding.set_backend("counting")
+    yield calls
+    decoding.set_backend()
+    del decoding.BACKENDS["counting"]
+
+def test_each_response_decoded_once(server, client, decodes):
+    folder_id = server.state.add_folder(client.account.root_id, "decoded")["id"]
+    server.state.add_file(folder_id, "a.bin", b"x")
+
+    folder = client.get(folder_id)
+    assert folder.name == "decoded" and len(folder.children) == 1
+    assert len(decodes) == 1
+
+    assert client.create_folder("child", folder_id).name == "child"
+    assert len(decodes) == 2
+
+    with pytest.raises(GofileAPIContentNotFoundError):
+        client.get("missing")
+    assert len(decodes) == 3
+
+def test_invalid_body_raises_like_requests():
+    resp = requests.Response()
+    resp.status_code = 502
+    resp._content = b"<html>bad gateway</html>"
+
+    with pytest.raises(requests.JSONDecodeError):
+        decoding.decode_response(resp)
+
+def test_backends():
+    assert decoding.backend in decoding.BACKENDS and "json" in decoding.BACKENDS
+    assert decoding.set_backend("json") == "json"
+    assert decoding.loads(b'{"status": "ok"}') == {"status": "ok"}
+    decoding.set_backend()
+
+    with pytest.raises(ValueError):
+        decoding.set_backend("missing")
@@ -0,0 +1,86 @@
+import json
+import time
+from gofilepy.links import DirectLinkRegistry, link_expired
+
+#direct link reuse
+
+
+def get_file(client, folder_id: str):
+    return client.get(folder_id, use_cache=False).children[0]
+
+def link_posts(server) -> int:
+    return sum(1 for method, path in server.state.request_log if method == "POST" and path.endswith("/directlinks"))
+
+def test_existing_links_parsed_and_reused(server, client, tmp_path):
+    folder_id = server.state.add_folder(client.account.root_id, "links-existing")["id"]
+    file_id = server.state.add_file(folder_id, "a.bin", b"payload")["id"]
+    server.state.add_direct_link(file_id, server.url)
+
+    f = get_file(client, folder_id)
+    assert len(f.direct_links) == 1 and not f.direct_links[0].is_expired
+
+    server.state.request_log.clear()
+    path = f.download(str(tmp_path))
+    assert open(path, "rb").read() == b"payload"
+    assert link_posts(server) == 0
+
+def test_expired_and_authenticated_links_skipped(server, client):
+    folder_id = server.state.add_folder(client.account.root_id, "links-skipped")["id"]
+    file_id = server.state.add_file(folder_id, "a.bin", b"x")["id"]
+    server.state.add_direct_link(file_id, server.url, expire=int(time.time()) - 10)
+    server.state.add_direct_link(file_id, server.url, auth=["user", "pass"])
+
+    f = get_file(client, folder_id)
+    assert f.get_direct_link(create=False) is None
+
+    link = f.get_direct_link()
+    assert link.username is None and not link.is_expired
+    assert f.get_direct_link() is link
+
+def test_registry_shared_between_clients(server, tmp_path, make_client):
+    registry_path = str(tmp_path / "links.json")
+    first = make_client(link_registry_path=registry_path)
+    folder_id = server.state.add_folder(first.account.root_id, "links-registry")["id"]
+    file_id = server.state.add_file(folder_id, "a.bin", b"x")["id"]
+
+    link = first.create_file_direct_link(file_id)
+    assert list(json.load(open(registry_path))[file_id]) == [link.direct_link_id]
+
+    #a file built from stale data (no directLinks) still finds the registered link
+    second = make_client(link_registry_path=registry_path)
+    f = get_file(second, folder_id)
+    f.direct_links = []
+    server.state.request_log.clear()
+    assert f.get_direct_link().direct_link_id == link.direct_link_id
+    assert link_posts(server) == 0
+
+def test_create_direct_links_bulk(server, tmp_path, make_client):
+    client = make_client(link_registry_path=str(tmp_path / "links.json"))
+    folder_id = server.state.add_folder(client.account.root_id, "links-bulk")["id"]
+    sub_id = server.state.add_folder(folder_id, "sub")["id"]
+    top = [server.state.add_file(folder_id, "{}.bin".format(i), b"x")["id"] for i in range(5)]
+    nested = [server.state.add_file(sub_id, "{}.bin".format(i), b"x")["id"] for i in range(3)]
+    server.state.add_direct_link(top[0], server.url)
+
+    folder = client.get(folder_id)
+    server.state.request_log.clear()
+    batch = folder.create_direct_links(max_workers=4)
+    assert batch.ok and sorted(batch.succeeded) == sorted(top)
+    assert link_posts(server) == 4
+
+    server.state.request_log.clear()
+    batch = client.get(folder_id).create_direct_links(recursive=True)
+    assert sorted(batch.succeeded) == sorted(top + nested)
+    assert link_posts(server) == 3
+
+    registry = DirectLinkRegistry(str(tmp_path / "links.json"))
+    assert all(registry.get(content_id) for content_id in top[1:] + nested)
+
+def test_registry_prunes_expired(tmp_path):
+    path = str(tmp_path / "links.json")
+    registry = DirectLinkRegistry(path)
+    registry.add("a", {"id": "old", "expireTime": int(time.time()) - 5})
+    registry.add("a", {"id": "new", "expireTime": 0})
+
+    assert [data["id"] for data in DirectLinkRegistry(path).get("a")] == ["new"]
+    assert link_expired({"expireTime": time.time() + 30}) and not link_expired({"expireTime": 0})
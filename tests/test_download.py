@@ -0,0 +1,143 @@
+import hashlib
+import os
+import pytest
+from gofilepy.download import split_segments, DownloadCheckpoint
+from gofilepy.exceptions import GofileAPIException, GofileIntegrityError
+
+#direct link downloads
+
+PAYLOAD = os.urandom(5 * 1024 * 1024 + 7)
+
+
+@pytest.fixture
+def linked_file(server, client, tmp_path):
+    f = client.upload(file=PAYLOAD, filename="download.bin", parent_id=client.account.root_id)
+    f.create_direct_link()
+    server.state.download_requests.clear()
+    yield f
+    server.state.honor_range = True
+    server.state.range_total = True
+    server.state.fail_after = None
+
+def test_split_segments():
+    assert split_segments(10, 4, 1) == [(0, 2), (3, 5), (6, 8), (9, 9)]
+    assert split_segments(10, 4, 5) == [(0, 4), (5, 9)]
+    assert split_segments(3, 8, 1024) == [(0, 2)]
+
+def test_single_stream(server, linked_file, tmp_path):
+    path = linked_file.download(str(tmp_path))
+
+    assert path == os.path.join(str(tmp_path), "download.bin")
+    assert open(path, "rb").read() == PAYLOAD
+    assert [r for _, r in server.state.download_requests] == [None]
+
+def test_segmented(server, linked_file, tmp_path):
+    path = linked_file.download(str(tmp_path), segments=4, min_segment_size=1024 * 1024)
+
+    assert hashlib.md5(open(path, "rb").read()).hexdigest() == linked_file.md5
+    ranges = [r for _, r in server.state.download_requests]
+    assert ranges[0] == "bytes=0-0"
+    assert len(ranges) == 5
+
+def test_segmented_min_segment_size(server, linked_file, tmp_path):
+    linked_file.download(str(tmp_path), segments=8, min_segment_size=2 * 1024 * 1024)
+    assert len(server.state.download_requests) == 1 + 2
+
+def test_segmented_fallback(server, linked_file, tmp_path):
+    server.state.honor_range = False
+    path = linked_file.download(str(tmp_path), segments=4, min_segment_size=1024)
+
+    assert open(path, "rb").read() == PAYLOAD
+    assert len(server.state.download_requests) == 1
+
+def test_resume_single_stream(server, linked_file, tmp_path):
+    out_path = os.path.join(str(tmp_path), "download.bin")
+    server.state.fail_after = 3_000_000
+
+    with pytest.raises(GofileAPIException):
+        linked_file.download(str(tmp_path))
+
+    assert not os.path.exists(out_path)
+    checkpoint = DownloadCheckpoint.load(out_path + ".part.json")
+    (start, end), = checkpoint.ranges
+    assert (start, end) == (0, 2_999_999)
+
+    server.state.fail_after = None
+    server.state.download_requests.clear()
+    path = linked_file.download(str(tmp_path))
+
+    assert open(path, "rb").read() == PAYLOAD
+    assert [r for _, r in server.state.download_requests] == ["bytes={}-{}".format(end + 1, len(PAYLOAD) - 1)]
+    assert not os.path.exists(out_path + ".part")
+    assert not os.path.exists(out_path + ".part.json")
+
+def test_resume_segmented(server, linked_file, tmp_path):
+    out_path = os.path.join(str(tmp_path), "download.bin")
+    server.state.fail_after = 100_000
+
+    with pytest.raises(GofileAPIException):
+        linked_file.download(str(tmp_path), segments=4, min_segment_size=1024 * 1024)
+
+    missing = DownloadCheckpoint.load(out_path + ".part.json").missing()
+    assert len(missing) == 4
+
+    server.state.fail_after = None
+    server.state.download_requests.clear()
+    path = linked_file.download(str(tmp_path), segments=4, min_segment_size=1024 * 1024)
+
+    assert open(path, "rb").read() == PAYLOAD
+    assert sorted(r for _, r in server.state.download_requests) == sorted(
+        "bytes={}-{}".format(start, end) for start, end in missing
+    )
+
+def test_resume_disabled(server, linked_file, tmp_path):
+    server.state.fail_after = 3_000_000
+    with pytest.raises(GofileAPIException):
+        linked_file.download(str(tmp_path))
+
+    server.state.fail_after = None
+    server.state.download_requests.clear()
+    path = linked_file.download(str(tmp_path), resume=False)
+
+    assert open(path, "rb").read() == PAYLOAD
+    assert [r for _, r in server.state.download_requests] == [None]
+
+@pytest.mark.parametrize("segments", [1, 4])
+def test_md5_mismatch(server, linked_file, tmp_path, segments):
+    out_path = os.path.join(str(tmp_path), "download.bin")
+    linked_file.md5 = "0" * 32
+
+    with pytest.raises(GofileIntegrityError) as e:
+        linked_file.download(str(tmp_path), segments=segments, min_segment_size=1024 * 1024)
+
+    assert e.value.actual_md5 == hashlib.md5(PAYLOAD).hexdigest()
+    assert not os.path.exists(out_path)
+    assert not os.path.exists(out_path + ".part")
+    assert not os.path.exists(out_path + ".part.json")
+
+    path = linked_file.download(str(tmp_path), segments=segments, min_segment_size=1024 * 1024, verify_md5=False)
+    assert open(path, "rb").read() == PAYLOAD
+
+@pytest.mark.parametrize("range_total", [None, False])
+def test_partial_probe_without_size(server, linked_file, tmp_path, range_total):
+    server.state.range_total = range_total
+    path = linked_file.download(str(tmp_path), segments=4, min_segment_size=1024)
+
+    assert open(path, "rb").read() == PAYLOAD
+    assert [r for _, r in server.state.download_requests] == ["bytes=0-0", None]
+
+@pytest.mark.parametrize("new_size", [4 * 1024 * 1024, 6 * 1024 * 1024])
+def test_resume_after_remote_change(server, linked_file, tmp_path, new_size):
+    out_path = os.path.join(str(tmp_path), "download.bin")
+    server.state.fail_after = 4_500_000
+    with pytest.raises(GofileAPIException):
+        linked_file.download(str(tmp_path), verify_md5=False)
+    server.state.fail_after = None
+
+    #the file is replaced by one of a different size before the download is retried
+    changed = os.urandom(new_size)
+    server.state.payloads[linked_file.content_id] = changed
+
+    path = linked_file.download(str(tmp_path), verify_md5=False)
+    assert open(path, "rb").read() == changed
+    assert not os.path.exists(out_path + ".part.json")
@@ -0,0 +1,121 @@
+import os
+import pytest
+import threading
+import time
+from gofilepy.download import ConnectionLimiter
+
+#recursive folder downloads
+
+
+def make_tree(server, client, name: str) -> tuple:
+    folder_id = server.state.add_folder(client.account.root_id, name)["id"]
+    sub_id = server.state.add_folder(folder_id, "sub")["id"]
+    files = {"a.bin": b"a" * 1000, "b.bin": b"b" * 2000, "sub/c.bin": b"c" * 3000}
+    for relpath, payload in files.items():
+        parent_id = sub_id if relpath.startswith("sub/") else folder_id
+        server.state.add_file(parent_id, relpath.rsplit("/", 1)[-1], payload)
+    return folder_id, files
+
+def test_folder_download(server, client, tmp_path):
+    folder_id, files = make_tree(server, client, "dl-tree")
+    server.state.add_folder(folder_id, "empty")
+
+    report = client.get(folder_id).download(str(tmp_path), max_workers=4)
+
+    assert report.batch.ok and sorted(report.downloaded) == sorted(files) and report.skipped == []
+    assert report.bytes == 6000 and report.throughput > 0
+    for relpath, payload in files.items():
+        assert open(os.path.join(tmp_path, "dl-tree", *relpath.split("/")), "rb").read() == payload
+    assert os.path.isdir(os.path.join(tmp_path, "dl-tree", "empty"))
+
+def test_resumed_bytes_counted_once(server, client, tmp_path):
+    folder_id = server.state.add_folder(client.account.root_id, "dl-resume")["id"]
+    server.state.add_file(folder_id, "big.bin", b"r" * 4000)
+
+    server.state.fail_after = 1500
+    try:
+        report = client.get(folder_id).download(str(tmp_path))
+    finally:
+        server.state.fail_after = None
+    assert list(report.batch.failed) == ["big.bin"] and report.bytes == 1500
+
+    report = client.get(folder_id).download(str(tmp_path))
+    assert report.downloaded == ["big.bin"] and report.bytes == 2500
+    assert open(os.path.join(tmp_path, "dl-resume", "big.bin"), "rb").read() == b"r" * 4000
+
+def test_folder_download_skips_matching(server, client, tmp_path):
+    folder_id, files = make_tree(server, client, "dl-skip")
+    client.get(folder_id).download(str(tmp_path))
+
+    #one file changed locally with the same size, one removed
+    with open(os.path.join(tmp_path, "dl-skip", "a.bin"), "wb") as f:
+        f.write(b"z" * 1000)
+    os.remove(os.path.join(tmp_path, "dl-skip", "sub", "c.bin"))
+
+    server.state.download_requests.clear()
+    report = client.get(folder_id).download(str(tmp_path))
+
+    assert sorted(report.downloaded) == ["a.bin", "sub/c.bin"] and report.skipped == ["b.bin"]
+    assert len(server.state.download_requests) == 2
+    assert open(os.path.join(tmp_path, "dl-skip", "a.bin"), "rb").read() == files["a.bin"]
+
+def test_folder_download_reuses_links(server, client, tmp_path):
+    folder_id, files = make_tree(server, client, "dl-links")
+    client.get(folder_id).create_direct_links(recursive=True)
+
+    server.state.request_log.clear()
+    report = client.get(folder_id).download(str(tmp_path), segments=2, min_segment_size=500)
+
+    assert report.batch.ok and len(report.downloaded) == 3
+    assert not any(path.endswith("/directlinks") for _, path in server.state.request_log)
+
+def test_connection_limiter():
+    class Resp (object):
+        def close(self):
+            pass
+
+    active = []
+    peak = []
+    lock = threading.Lock()
+    def request(method, url, **kwargs):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        return Resp()
+
+    limiter = ConnectionLimiter(request, 2)
+    def fetch():
+        resp = limiter("GET", "http://x")
+        time.sleep(0.05)
+        with lock:
+            active.pop()
+        resp.close()
+        resp.close() #closing twice only gives the slot back once
+
+    threads = [threading.Thread(target=fetch) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(peak) == 2
+
+def test_folder_download_rejects_unsafe_names(server, client, tmp_path):
+    folder_id = server.state.add_folder(client.account.root_id, "dl-unsafe")["id"]
+    escape_id = server.state.add_folder(folder_id, "..")["id"]
+    server.state.add_file(escape_id, "escaped.txt", b"x")
+    nested_id = server.state.add_folder(folder_id, "a/b")["id"]
+    server.state.add_file(nested_id, "nested.txt", b"x")
+    server.state.add_file(folder_id, "ok.txt", b"ok")
+
+    out_dir = tmp_path / "out"
+    report = client.get(folder_id).download(str(out_dir))
+
+    assert report.downloaded == ["ok.txt"]
+    assert sorted(report.batch.failed) == ["../", "a/b/"]
+    assert all(isinstance(e, ValueError) for e in report.batch.failed.values())
+    assert sorted(p.name for p in tmp_path.rglob("*.txt")) == ["ok.txt"]
+
+def test_unsafe_folder_name_rejected(server, client, tmp_path):
+    folder_id = server.state.add_folder(client.account.root_id, "..")["id"]
+    with pytest.raises(ValueError):
+        client.get(folder_id).download(str(tmp_path))
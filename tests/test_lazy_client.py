@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+from stand_in_server import STAND_IN_TOKEN
+
+#network-free client construction
+
+
+def test_lazy_construction_makes_no_requests(server, make_client):
+    server.state.request_log.clear()
+    client = make_client(lazy=True)
+    assert server.state.request_log == []
+
+    assert client.account.root_id == server.state.accounts[STAND_IN_TOKEN]["rootFolder"]
+    assert [path for _, path in server.state.request_log] == [
+        "/accounts/getid", "/accounts/" + client.account._raw["id"]
+    ]
+
+    #cached after the first access
+    client.account
+    assert len(server.state.request_log) == 2
+
+def test_lazy_server_resolved_on_upload(server, make_client):
+    client = make_client(lazy=True)
+    server.state.request_log.clear()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        files = list(executor.map(
+            lambda i: client.upload(file=b"lazy", filename="{}.txt".format(i)), range(8)
+        ))
+
+    assert len(files) == 8
+    assert client.server == "store2"
+    assert server.state.request_log.count(("GET", "/servers")) == 1
+
+def test_upload_with_server_set_by_hand(server, make_client):
+    client = make_client(lazy=True)
+    client.server = "store1"
+    server.state.request_log.clear()
+
+    f = client.upload(file=b"by hand", filename="by-hand.bin", parent_id=client.account.root_id)
+    assert f.size == 7
+    assert client.server == "store1" and client.server_selector is None
+    assert ("GET", "/servers") not in server.state.request_log
+
+def test_eager_construction(server, make_client):
+    server.state.request_log.clear()
+    client = make_client()
+
+    assert client._server == "store2"
+    assert client._account is not None
+    assert [path for _, path in server.state.request_log][0] == "/servers"
+
+def test_account_loaded_on_access_without_get_account(make_client):
+    client = make_client(get_account=False)
+    assert client._account is None
+    assert client.account.tier == "premium"
+
+def test_guest_client_has_no_account(make_client):
+    client = make_client(token=None, lazy=True)
+    assert client.account is None
@@ -0,0 +1,85 @@
+import pytest
+from gofilepy import GofileClient
+from gofilepy.exceptions import GofileAPIContentNotFoundError
+from gofilepy.metrics import Histogram, MetricsAggregator, MetricsExporter
+from gofilepy.scheduler import RequestScheduler
+from stand_in_server import STAND_IN_TOKEN
+
+#request events and aggregation
+
+
+class Collector (MetricsExporter):
+    def __init__(self):
+        self.events = []
+
+    def export(self, event):
+        self.events.append(event)
+
+def test_api_events(server, make_client):
+    collector = Collector()
+    aggregator = MetricsAggregator()
+    client = make_client(hooks=[collector, aggregator], scheduler=RequestScheduler(backoff_base=0.01))
+    folder_id = server.state.add_folder(client.account.root_id, "measured")["id"]
+
+    server.state.fail("GET", "/contents/" + folder_id, 503)
+    client.get(folder_id)
+    with pytest.raises(GofileAPIContentNotFoundError):
+        client.get("missing")
+
+    events = [e for e in collector.events if e.name == "contents.get"]
+    ok, missing = events
+    assert ok.content_id == folder_id and ok.status == 200 and ok.api_status == "ok" and ok.retries == 1
+    assert ok.ok and ok.latency >= ok.elapsed > 0 and ok.bytes_received > 0
+    assert missing.status == 404 and missing.api_status == "error-notFound" and not missing.ok
+
+    stats = aggregator.snapshot()["contents.get"]
+    assert stats["requests"] == 2 and stats["errors"] == 1 and stats["retries"] == 1
+    assert stats["statuses"] == {200: 1, 404: 1} and stats["latency"]["count"] == 2
+    assert {"accounts.getid", "accounts.get"} <= set(aggregator.snapshot())
+
+def test_transfer_events(server, tmp_path, make_client):
+    aggregator = MetricsAggregator()
+    client = make_client()
+    client.metrics.add_hook(aggregator)
+    folder_id = server.state.add_folder(client.account.root_id, "measured-transfers")["id"]
+
+    f = client.upload(file=b"m" * 50_000, filename="m.bin", parent_id=folder_id)
+    f.download(str(tmp_path), segments=2, min_segment_size=10_000)
+
+    stats = aggregator.snapshot()
+    assert stats["upload"]["requests"] == 1 and stats["upload"]["bytes_sent"] > 50_000
+    #the probe for the size and both ranges
+    assert stats["download"]["requests"] == 3 and stats["download"]["bytes_received"] == 50_001
+    assert stats["contents.directlinks"]["requests"] == 1
+
+def test_failing_hooks_ignored(make_client):
+    def broken(event):
+        raise RuntimeError("exporter down")
+
+    client = make_client(hooks=[broken])
+    assert client.account.root_id
+    assert client.metrics.hook_errors >= 1
+
+    client.metrics.remove_hook(broken)
+    assert not client.metrics.active
+
+def test_connection_errors_reported():
+    collector = Collector()
+    client = GofileClient(
+        token=STAND_IN_TOKEN, api_url="http://127.0.0.1:9", get_account=False, lazy=True, hooks=[collector],
+        server_cache_ttl=0, scheduler=RequestScheduler(max_retries=0)
+    )
+    with pytest.raises(Exception):
+        client.get("anything")
+    assert collector.events[-1].error == "ConnectionError" and collector.events[-1].status is None
+
+def test_histogram():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 0.5, 3.0):
+        histogram.observe(value)
+
+    data = histogram.to_dict()
+    assert data["buckets"] == {"0.1": 1, "1.0": 3, "+Inf": 1}
+    assert data["count"] == 5 and data["max"] == 3.0
+    assert 0.1 <= histogram.quantile(0.5) <= 1.0
+    assert histogram.quantile(1.0) == 3.0
@@ -0,0 +1,69 @@
+import pytest
+from gofilepy import GofileClient, GofileContent, GofileFile, GofileFolder, GofileAccount
+from gofilepy.gofile import GofileFileDirectLink
+
+#slotted content models and raw payload retention
+
+
+def file_data(i: int, parent_id: str = "folder") -> dict:
+    return {
+        "id": "file-{}".format(i), "type": "file", "name": "{}.bin".format(i), "parentFolder": parent_id,
+        "size": i, "md5": "0" * 32, "createTime": 1700000000
+    }
+
+def offline_client(**kwargs) -> GofileClient:
+    return GofileClient(lazy=True, server_cache_ttl=0, **kwargs)
+
+def test_models_have_no_instance_dict():
+    file = GofileFile._load_from_dict(file_data(1))
+    folder = GofileFolder._load_from_dict({"id": "folder", "name": "f", "childs": []})
+    link = GofileFileDirectLink("link", "https://example/link", 0)
+
+    for obj in (file, folder, link, GofileAccount("token"), GofileContent("id", "parent")):
+        assert not hasattr(obj, "__dict__")
+
+    with pytest.raises(AttributeError):
+        file.not_an_attribute = 1
+
+def test_unknown_content_upgrades_in_place():
+    content = GofileContent("file-3", "folder")
+    content._hydrate(file_data(3))
+    assert type(content) == GofileFile and content.size == 3
+
+    content = GofileContent("sub", "folder")
+    content._hydrate({"id": "sub", "type": "folder", "name": "sub", "parentFolder": "folder", "childs": ["x"]})
+    assert type(content) == GofileFolder and content.children_ids == ["x"]
+
+def test_raw_retained_by_default():
+    data = file_data(5)
+    file = GofileFile._load_from_dict(data, client=offline_client())
+    assert file._raw is data
+
+def test_raw_dropped_and_rebuilt():
+    client = offline_client(retain_raw=False)
+    data = file_data(5)
+    file = GofileFile._load_from_dict(data, client=client)
+
+    assert file._raw_data is None
+    assert file._raw == data
+
+    contents = {c["id"]: c for c in (file_data(i) for i in range(3))}
+    folder = GofileFolder._load_from_dict(
+        {"id": "folder", "type": "folder", "name": "f", "childs": list(contents), "contents": contents}, client=client
+    )
+    assert folder._raw["childs"] == list(contents) and "contents" not in folder._raw
+
+    folder.children[0]
+    assert folder.children._contents #still needed for the other children
+    list(folder.children)
+    assert folder.children._contents == {}
+    assert [child.size for child in folder.children] == [0, 1, 2]
+    assert "file-1" in folder.children
+
+def test_guest_delete_without_raw(server, make_client):
+    client = make_client(token=None, retain_raw=False)
+    file = client.upload(file=b"guest", filename="guest.bin")
+
+    assert "guestToken" not in file._raw
+    file.delete()
+    assert file.is_deleted and file.content_id not in server.state.contents
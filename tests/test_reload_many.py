@@ -0,0 +1,55 @@
+from gofilepy import GofileContent, GofileFile, GofileFolder
+
+#batched reloads
+
+
+def content_gets(server):
+    return [path for method, path in server.state.request_log if method == "GET" and path.startswith("/contents/")]
+
+def test_reload_many_fetches_each_parent_once(server, make_client):
+    client = make_client()
+    parent = server.state.add_folder(client.account.root_id, "many")
+    other = server.state.add_folder(client.account.root_id, "other")
+
+    file_ids = [server.state.add_file(parent["id"], "{}.bin".format(i), b"x" * i)["id"] for i in range(40)]
+    folder_id = server.state.add_folder(parent["id"], "sub")["id"]
+    other_ids = [server.state.add_file(other["id"], "o{}.bin".format(i), b"o")["id"] for i in range(5)]
+
+    contents = [GofileContent(_id, parent["id"], client=client) for _id in file_ids + [folder_id]]
+    contents += [GofileContent(_id, other["id"], client=client) for _id in other_ids]
+
+    server.state.request_log.clear()
+    reloaded = client.reload_many(contents)
+
+    assert sorted(content_gets(server)) == sorted(["/contents/" + parent["id"], "/contents/" + other["id"]])
+    assert reloaded == contents
+    assert all(type(c) == GofileFile for c in contents[:40] + contents[41:])
+    assert type(contents[40]) == GofileFolder and contents[40].name == "sub"
+    assert [c.size for c in contents[:40]] == list(range(40))
+
+def test_reload_many_folders_use_own_listing(server, make_client):
+    client = make_client()
+    folder = client.create_folder("own", client.account.root_id)
+    server.state.add_file(folder.content_id, "new.bin", b"new")
+
+    server.state.request_log.clear()
+    client.reload_many([folder, folder])
+
+    assert content_gets(server) == ["/contents/" + folder.content_id]
+    assert [child.name for child in folder.children] == ["new.bin"]
+
+def test_reload_children_upgrades_unknown_children(server, make_client):
+    client = make_client()
+    parent = server.state.add_folder(client.account.root_id, "unknown")
+    for i in range(10):
+        server.state.add_file(parent["id"], "{}.bin".format(i), b"data")
+
+    #listing without "contents" leaves children as unknown GofileContents
+    folder = GofileFolder._load_from_dict(server.state.contents[parent["id"]], client=client)
+    assert all(child.is_unknown_type for child in folder.children)
+
+    server.state.request_log.clear()
+    folder.reload_children()
+
+    assert content_gets(server) == ["/contents/" + parent["id"]]
+    assert all(type(child) == GofileFile and child.size == 4 for child in folder.children)
@@ -0,0 +1,129 @@
+import time
+from email.utils import formatdate
+import pytest
+import requests
+from gofilepy.exceptions import GofileAPIException
+from gofilepy.scheduler import RequestScheduler, TokenBucket
+
+#rate limiting and retries
+
+
+@pytest.fixture
+def folder_id(server, client):
+    return server.state.add_folder(client.account.root_id, "scheduled")["id"]
+
+def test_idempotent_calls_retried(server, folder_id, make_client):
+    client = make_client(scheduler=RequestScheduler(backoff_base=0.01))
+    server.state.fail("GET", "/contents/" + folder_id, 503, count=2)
+
+    assert client.get(folder_id).name == "scheduled"
+    assert client.scheduler.stats()["metadata"]["retries"] == 2
+
+def test_retries_exhausted(server, folder_id, make_client):
+    client = make_client(scheduler=RequestScheduler(max_retries=1, backoff_base=0.01))
+    server.state.fail("GET", "/contents/" + folder_id, 502, count=2)
+
+    with pytest.raises(GofileAPIException) as e:
+        client.get(folder_id)
+    assert e.value.code == 502
+    assert client.scheduler.stats()["metadata"]["errors"] == 1
+
+def test_non_idempotent_calls_not_retried(server, folder_id, make_client):
+    client = make_client(scheduler=RequestScheduler(backoff_base=0.01))
+    server.state.fail("POST", "/contents/createFolder", 503)
+
+    with pytest.raises(GofileAPIException):
+        client.create_folder("once", folder_id)
+    assert client.scheduler.stats()["metadata"]["retries"] == 0
+    assert server.state.request_log.count(("POST", "/contents/createFolder")) >= 1
+
+    #the failure was consumed, a new call goes through
+    assert client.create_folder("twice", folder_id).name == "twice"
+
+def test_retry_after_honored(server, folder_id, make_client):
+    client = make_client(scheduler=RequestScheduler(backoff_base=0.01))
+    server.state.fail("GET", "/contents/" + folder_id, 429, retry_after=0.3)
+
+    start = time.perf_counter()
+    client.get(folder_id)
+    assert time.perf_counter() - start >= 0.3
+
+    stats = client.scheduler.stats()["metadata"]
+    assert stats["throttles"] == 1 and stats["retries"] == 1
+
+def test_long_retry_after_returned(server, folder_id, make_client):
+    client = make_client(scheduler=RequestScheduler(backoff_base=0.01, retry_after_max=0.2))
+    server.state.fail("GET", "/contents/" + folder_id, 429, retry_after=86400)
+
+    start = time.perf_counter()
+    with pytest.raises(GofileAPIException) as e:
+        client.get(folder_id)
+    assert e.value.code == 429
+    stats = client.scheduler.stats()["metadata"]
+    assert stats["retries"] == 0 and stats["errors"] == 1
+
+    #the endpoint class is only paused for retry_after_max
+    assert client.get(folder_id).name == "scheduled"
+    assert time.perf_counter() - start < 1
+
+def test_store_requests_use_their_own_class(server, folder_id, make_client):
+    client = make_client(scheduler=RequestScheduler(backoff_base=0.01))
+    server.state.fail("POST", "/store", 429)
+
+    with pytest.raises(GofileAPIException): #uploads aren't retried
+        client.upload(file=b"data", filename="throttled.bin", parent_id=folder_id)
+    assert client.scheduler.stats()["store"]["throttles"] == 1
+    assert client.upload(file=b"data", filename="ok.bin", parent_id=folder_id).size == 4
+
+def test_rate_limit(make_client, folder_id):
+    client = make_client(rate_limits={"metadata": (20, 1)})
+
+    start = time.perf_counter()
+    for _ in range(6):
+        client.get(folder_id)
+    assert time.perf_counter() - start >= 0.2
+    assert client.scheduler.stats()["metadata"]["wait"] > 0
+
+def test_connection_errors_retried():
+    calls = []
+    response = requests.Response()
+    response.status_code = 200
+
+    def send(method, url, **kwargs):
+        calls.append(method)
+        if len(calls) < 3:
+            raise requests.ConnectionError("reset")
+        return response
+
+    scheduler = RequestScheduler(backoff_base=0.01)
+    assert scheduler.request(send, "GET", "http://x") is response
+    assert scheduler.stats()["metadata"]["retries"] == 2
+
+    def refuse(method, url, **kwargs):
+        raise requests.ConnectionError("refused")
+
+    with pytest.raises(requests.ConnectionError): #not idempotent, raised straight away
+        scheduler.request(refuse, "POST", "http://x")
+    assert scheduler.stats()["metadata"]["retries"] == 2
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=100, capacity=5)
+    start = time.perf_counter()
+    for _ in range(15):
+        bucket.acquire()
+    assert 0.08 <= time.perf_counter() - start < 0.5
+
+    bucket.pause(0.1)
+    assert bucket.acquire() >= 0.09
+
+    assert TokenBucket().acquire() == 0
+
+def test_retry_after_parsing():
+    class Resp (object):
+        def __init__(self, value):
+            self.headers = {"Retry-After": value} if value is not None else {}
+
+    assert RequestScheduler.retry_after(Resp("3")) == 3
+    assert RequestScheduler.retry_after(Resp(None)) is None
+    assert RequestScheduler.retry_after(Resp("not a date")) is None
+    assert 8 <= RequestScheduler.retry_after(Resp(formatdate(time.time() + 10, usegmt=True))) <= 10
@@ -0,0 +1,111 @@
+import json
+import time
+import pytest
+from gofilepy.metrics import MetricsAggregator
+from gofilepy.servers import ServerCache, ServerSelector
+
+#store server caching and selection
+
+SERVERS = [{"name": "store1", "zone": "eu"}, {"name": "store2", "zone": "na"}, {"name": "store3", "zone": "na"}]
+
+
+@pytest.fixture
+def latency(server):
+    yield server.state.server_latency
+    server.state.server_latency.clear()
+
+def server_requests(server):
+    return [r for r in server.state.request_log if r == ("GET", "/servers")]
+
+def test_server_cache(server, make_client):
+    server.state.request_log.clear()
+
+    make_client(server_cache_ttl=60)
+    client = make_client(server_cache_ttl=60)
+    assert len(server_requests(server)) == 1
+    assert client._servers == server.state.servers
+
+    make_client()
+    assert len(server_requests(server)) == 2
+
+def test_server_cache_expired(tmp_path):
+    cache = ServerCache(str(tmp_path / "servers.json"), ttl=60)
+    cache.set("api", SERVERS)
+    assert cache.get("api") == SERVERS
+    assert cache.get("other") is None
+
+    cache.ttl = 0
+    time.sleep(0.01)
+    assert cache.get("api") is None
+
+def test_server_cache_prunes_expired(tmp_path):
+    path = str(tmp_path / "servers.json")
+    ServerCache(path).set("old", SERVERS)
+    time.sleep(0.01)
+
+    cache = ServerCache(path, ttl=0.005)
+    cache.set("api", SERVERS)
+    with open(path, "r") as f:
+        assert list(json.load(f)) == ["api"]
+
+def test_server_cache_unwritable():
+    cache = ServerCache("/proc/gofilepy/servers.json")
+    cache.set("api", SERVERS)
+    assert cache.get("api") is None
+
+def test_selector_zone_fallback():
+    selector = ServerSelector(SERVERS, zone="na")
+    assert selector.rank() == ["store2", "store3", "store1"]
+    assert ServerSelector(SERVERS, zone="ap").best() == "store1"
+
+def test_selector_ranking():
+    selector = ServerSelector(SERVERS, zone="na", reference_size=100)
+    selector.rtt = {"store1": 0.01, "store2": 0.2, "store3": 0.05}
+    assert selector.rank() == ["store1", "store3", "store2"]
+
+    #store1 is close but slow to upload to
+    selector.record_upload("store1", 100, 10)
+    selector.record_upload("store3", 100, 0.1)
+    assert selector.best() == "store3"
+
+def test_probe(latency, make_client):
+    latency["store2"] = 0.05
+    client = make_client(zone="na")
+    assert client.server == "store2"
+
+    assert client.refresh_servers() == "store1"
+    assert set(client.server_selector.rtt) == {"store1", "store2"}
+    assert client.server_selector.rtt["store2"] >= 0.05
+
+def test_probe_bypasses_scheduler(server, make_client):
+    #a drained store bucket would make every probe wait ~1s
+    client = make_client(rate_limits={"store": (1, 1)})
+    client.scheduler._bucket("store").acquire()
+
+    server.state.fail("HEAD", "/", 503, count=1)
+    client.refresh_servers()
+    assert client.server_selector.rtt and max(client.server_selector.rtt.values()) < 0.5
+
+def test_probe_events(make_client):
+    aggregator = MetricsAggregator()
+    client = make_client(hooks=[aggregator])
+    client.refresh_servers()
+
+    #two probes per server, the first also pays for connecting
+    assert aggregator.endpoints["probe"].requests == 4
+    assert aggregator.endpoints["probe"].errors == 0
+
+def test_background_probe(server, latency, make_client):
+    latency["store2"] = 0.05
+    client = make_client(zone="na", probe_servers=True)
+
+    for _ in range(100):
+        if client.server == "store1":
+            break
+        time.sleep(0.02)
+
+    client.server_selector.stop_background_refresh()
+    assert client.server == "store1"
+
+    f = client.upload(file=b"x" * 10000, filename="probe.bin", parent_id=client.get_account().root_id)
+    assert "store1" in client.server_selector.throughput
@@ -0,0 +1,38 @@
+from requests.adapters import HTTPAdapter
+from gofilepy import GofileAccount, GofileClient
+
+#every call goes through client.session and reuses its pooled connections
+
+
+class CountingAdapter (HTTPAdapter):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        self.sent += 1
+        return super().send(request, **kwargs)
+
+def test_calls_reuse_session_connections(server, make_client):
+    client = make_client(lazy=True)
+    adapter = CountingAdapter()
+    client.session.mount("http://", adapter)
+
+    server.state.request_log.clear()
+    with server.state.lock:
+        server.state.connections = 0
+
+    account = client.get_account()
+    GofileAccount._load_from_account_id(account._raw["id"], client.token, client=client)
+    GofileClient.get_best_server(session=client.session, api_url=client.api_url)
+    folder = client.create_folder("pooled", account.root_id)
+    f = client.upload(file=b"pooled", filename="pooled.bin", parent_id=folder.content_id)
+    client.get(folder.content_id, use_cache=False)
+    client.set_content_option(folder.content_id, "description", "pooled")
+    client.copy_content(f.content_id, parent_id=account.root_id)
+    client.delete(folder.content_id)
+    client.refresh_servers(probe=False)
+
+    #every request the stand-in saw was sent by the client's session, over a single kept-alive connection
+    assert adapter.sent == len(server.state.request_log) >= 10
+    assert server.state.connections == 1
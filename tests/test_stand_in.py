@@ -0,0 +1,31 @@
+import time
+import pytest
+
+#the stand-in's own latency and bandwidth settings
+
+
+@pytest.fixture
+def shaped(server):
+    yield server.state
+    server.state.latency = 0.0
+    server.state.bandwidth = None
+
+def test_latency(server, client, shaped):
+    folder_id = server.state.add_folder(client.account.root_id, "slow")["id"]
+    shaped.latency = 0.1
+
+    start = time.perf_counter()
+    client.get(folder_id)
+    assert time.perf_counter() - start >= 0.1
+
+def test_bandwidth(server, client, shaped, tmp_path):
+    folder_id = server.state.add_folder(client.account.root_id, "narrow")["id"]
+    shaped.bandwidth = 1_000_000
+
+    start = time.perf_counter()
+    f = client.upload(file=b"u" * 300_000, filename="narrow.bin", parent_id=folder_id)
+    assert time.perf_counter() - start >= 0.25
+
+    start = time.perf_counter()
+    f.download(str(tmp_path))
+    assert time.perf_counter() - start >= 0.25
@@ -0,0 +1,75 @@
+import hashlib
+import os
+import pytest
+from gofilepy.exceptions import GofileIntegrityError
+from gofilepy.multipart import MultipartEncoder
+
+#streaming multipart uploads
+
+PAYLOAD = os.urandom(3 * 1024 * 1024 + 123)
+
+
+def assert_uploaded(server, f, name):
+    assert f.name == name
+    assert f.size == len(PAYLOAD)
+    assert f.md5 == hashlib.md5(PAYLOAD).hexdigest()
+    assert server.state.payloads[f.content_id] == PAYLOAD
+
+def test_upload_path(server, client, tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(PAYLOAD)
+    progress = []
+
+    f = client.upload(str(path), parent_id=client.account.root_id, chunk_size=64 * 1024,
+                      callback=lambda sent, total: progress.append((sent, total)))
+
+    assert_uploaded(server, f, "data.bin")
+    assert progress[-1] == (len(PAYLOAD), len(PAYLOAD))
+    assert all(b[0] - a[0] == 64 * 1024 for a, b in zip(progress, progress[1:-1]))
+
+def test_upload_buffered_reader(server, client, tmp_path):
+    path = tmp_path / "reader.bin"
+    path.write_bytes(PAYLOAD)
+
+    with open(path, "rb") as reader:
+        f = client.upload(file=reader, parent_id=client.account.root_id)
+        assert not reader.closed
+
+    assert_uploaded(server, f, "reader.bin")
+
+def test_upload_generator(server, client):
+    def gen():
+        for i in range(0, len(PAYLOAD), 100_000):
+            yield PAYLOAD[i:i+100_000]
+
+    progress = []
+    f = client.upload(file=gen(), filename="gen.bin", parent_id=client.account.root_id,
+                      callback=lambda sent, total: progress.append((sent, total)))
+
+    assert_uploaded(server, f, "gen.bin")
+    assert progress[-1] == (len(PAYLOAD), None)
+
+def test_upload_guest(server, make_client):
+    guest = make_client(token=None)
+    f = guest.upload(file=PAYLOAD, filename="guest.bin")
+    assert_uploaded(server, f, "guest.bin")
+
+def test_encoder_length_matches_body():
+    body = MultipartEncoder({"folderId": "abc"}, PAYLOAD, filename="x.bin", chunk_size=4096)
+    encoded = b"".join(bytes(chunk) for chunk in body)
+
+    assert body.len == len(encoded)
+    assert max(len(chunk) for chunk in MultipartEncoder({}, PAYLOAD, chunk_size=4096)) <= 4096 + 200
+
+def test_upload_md5_mismatch(server, client):
+    server.state.md5_override = "0" * 32
+    try:
+        with pytest.raises(GofileIntegrityError) as e:
+            client.upload(file=PAYLOAD, filename="corrupt.bin", parent_id=client.account.root_id)
+        assert e.value.actual_md5 == hashlib.md5(PAYLOAD).hexdigest()
+        assert e.value.content_id in server.state.contents
+
+        f = client.upload(file=PAYLOAD, filename="unchecked.bin", parent_id=client.account.root_id, verify_md5=False)
+        assert f.md5 == "0" * 32
+    finally:
+        server.state.md5_override = None
@@ -0,0 +1,98 @@
+import os
+import gofilepy.sync
+from gofilepy.sync import FolderSync
+
+#local to remote folder sync
+
+
+def write(path, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+def remote_tree(server, folder_id, base=""):
+    """relpath -> payload of every file under folder_id in the stand-in"""
+    tree = {}
+    for child_id in server.state.contents[folder_id]["childs"]:
+        child = server.state.contents[child_id]
+        if child["type"] == "folder":
+            tree[base + child["name"] + "/"] = None
+            tree.update(remote_tree(server, child_id, base + child["name"] + "/"))
+        else:
+            tree[base + child["name"]] = server.state.payloads[child_id]
+    return tree
+
+def make_local(tmp_path):
+    local = tmp_path / "local"
+    write(str(local / "a.txt"), b"a" * 10)
+    write(str(local / "sub" / "b.txt"), b"b" * 20)
+    write(str(local / "sub" / "deep" / "c.txt"), b"c" * 30)
+    os.makedirs(str(local / "empty"))
+    return str(local)
+
+def test_sync_uploads_then_skips_unchanged(server, client, tmp_path, monkeypatch):
+    local = make_local(tmp_path)
+    remote = client.create_folder("sync", client.account.root_id)
+    manifest = str(tmp_path / "manifest.json")
+
+    plan = remote.sync(local, manifest_path=manifest)
+    assert plan.batch.ok
+    assert sorted(plan.uploads) == ["a.txt", "sub/b.txt", "sub/deep/c.txt"]
+    assert plan.folders == ["empty/", "sub/", "sub/deep/"]
+    assert remote_tree(server, remote.content_id) == {
+        "a.txt": b"a" * 10, "empty/": None, "sub/": None, "sub/b.txt": b"b" * 20,
+        "sub/deep/": None, "sub/deep/c.txt": b"c" * 30
+    }
+
+    hashed = []
+    real_md5_file = gofilepy.sync._md5_file
+    monkeypatch.setattr(gofilepy.sync, "_md5_file", lambda path, size: hashed.append(path) or real_md5_file(path, size))
+
+    #md5s recorded from the uploads, nothing is rehashed or uploaded again
+    plan = FolderSync(client, local, remote.content_id, manifest_path=manifest).run()
+    assert (plan.uploads, plan.updates, plan.folders, plan.unchanged) == ([], [], [], 3)
+    assert hashed == []
+
+def test_sync_updates_changed_files(server, client, tmp_path):
+    local = make_local(tmp_path)
+    remote = client.create_folder("sync-update", client.account.root_id)
+    manifest = str(tmp_path / "manifest.json")
+    remote.sync(local, manifest_path=manifest)
+
+    write(os.path.join(local, "a.txt"), b"A" * 10) #same size, different md5
+    write(os.path.join(local, "sub", "b.txt"), b"b" * 21)
+    write(os.path.join(local, "new.txt"), b"new")
+
+    plan = remote.sync(local, manifest_path=manifest)
+    assert plan.batch.ok
+    assert sorted(plan.updates) == ["a.txt", "sub/b.txt"]
+    assert plan.uploads == ["new.txt"]
+
+    tree = remote_tree(server, remote.content_id)
+    assert tree["a.txt"] == b"A" * 10 and tree["sub/b.txt"] == b"b" * 21 and tree["new.txt"] == b"new"
+    assert len([k for k in tree if not k.endswith("/")]) == 4 #replaced copies are deleted
+
+def test_sync_dry_run_and_delete_extras(server, client, tmp_path):
+    local = make_local(tmp_path)
+    remote = client.create_folder("sync-extras", client.account.root_id)
+    manifest = str(tmp_path / "manifest.json")
+    remote.sync(local, manifest_path=manifest)
+
+    os.remove(os.path.join(local, "a.txt"))
+    os.remove(os.path.join(local, "sub", "deep", "c.txt"))
+    os.rmdir(os.path.join(local, "sub", "deep"))
+    server.state.add_file(remote.content_id, "remote-only.txt", b"r")
+
+    before = remote_tree(server, remote.content_id)
+    plan = remote.sync(local, dry_run=True, manifest_path=manifest, delete_extras=True)
+    assert plan.batch is None
+    assert plan.deletes == ["a.txt", "remote-only.txt", "sub/deep/"]
+    assert remote_tree(server, remote.content_id) == before
+
+    #without delete_extras nothing is removed
+    remote.sync(local, manifest_path=manifest)
+    assert remote_tree(server, remote.content_id) == before
+
+    plan = remote.sync(local, manifest_path=manifest, delete_extras=True)
+    assert plan.batch.ok
+    assert remote_tree(server, remote.content_id) == {"empty/": None, "sub/": None, "sub/b.txt": b"b" * 20}
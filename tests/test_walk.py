@@ -0,0 +1,70 @@
+import time
+import pytest
+from gofilepy.exceptions import GofileAPIException
+
+#recursive folder walks
+
+
+@pytest.fixture(scope="module")
+def tree(server, client):
+    """root/{a/{a1/{a1x}, a2}, b/{b1}} with two files per folder, returns name -> content_id"""
+    top = server.state.add_folder(client.account.root_id, "walk")
+    ids = {"walk": top["id"]}
+    layout = [("walk", "a"), ("a", "a1"), ("a1", "a1x"), ("a", "a2"), ("walk", "b"), ("b", "b1")]
+    for parent, name in layout:
+        ids[name] = server.state.add_folder(ids[parent], name)["id"]
+
+    for name, content_id in list(ids.items()):
+        for i in range(2):
+            server.state.add_file(content_id, "{}-{}.bin".format(name, i), b"f")
+    return ids
+
+def test_walk_visits_every_folder(client, tree):
+    seen = {}
+    for folder, subfolders, files in client.get(tree["walk"]).walk():
+        seen[folder.name] = (sorted(sub.name for sub in subfolders), sorted(f.name for f in files))
+
+    assert set(seen) == {"walk", "a", "a1", "a1x", "a2", "b", "b1"}
+    assert seen["a"] == (["a1", "a2"], ["a-0.bin", "a-1.bin"])
+    assert seen["a1x"] == ([], ["a1x-0.bin", "a1x-1.bin"])
+
+def test_walk_max_depth_and_predicate(client, tree):
+    names = [folder.name for folder, _, _ in client.walk(tree["walk"], max_depth=1)]
+    assert sorted(names) == ["a", "b", "walk"]
+
+    names = [folder.name for folder, _, _ in client.walk(tree["walk"], predicate=lambda f: f.name != "a")]
+    assert sorted(names) == ["b", "b1", "walk"]
+
+def test_walk_in_place_pruning(client, tree):
+    names = []
+    for folder, subfolders, files in client.walk(tree["walk"]):
+        names.append(folder.name)
+        subfolders[:] = [sub for sub in subfolders if sub.name != "a1"]
+
+    assert sorted(names) == ["a", "a2", "b", "b1", "walk"]
+
+def test_walk_fetches_siblings_concurrently(server, client, tree):
+    server.state.server_latency["contents"] = 0.2
+    try:
+        start = time.perf_counter()
+        count = sum(1 for _ in client.walk(tree["walk"], max_workers=8))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.state.server_latency.pop("contents")
+
+    #4 levels deep, sequential fetching would take 7 * 0.2s
+    assert count == 7
+    assert elapsed < 1.2
+
+def test_walk_onerror(server, client, tree):
+    errors = []
+    gone = server.state.add_folder(tree["b1"], "gone")
+
+    def predicate(folder):
+        if folder.content_id == gone["id"]:
+            server.state.delete_content(gone["id"]) #deleted between listing and fetch
+        return True
+
+    names = [folder.name for folder, _, _ in client.walk(tree["b"], predicate=predicate, onerror=errors.append)]
+    assert sorted(names) == ["b", "b1"]
+    assert len(errors) == 1 and isinstance(errors[0], GofileAPIException)